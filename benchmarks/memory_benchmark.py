@@ -0,0 +1,171 @@
+"""
+Benchmark de memória dos resultados: bytes por resultado mantido em memória em três
+representações, para varreduras com centenas de milhares de linhas.
+
+- `dataclass`: o `SearchResult` anterior (dataclass comum, com `__dict__` por instância
+  e uma string nova por campo em cada linha);
+- `slots`: o `SearchResult` atual (slots, imutável, campos de baixa cardinalidade internados);
+- `batch`: o lote colunar `ResultBatch` (campos de baixa cardinalidade codificados por dicionário).
+
+As linhas são lidas de JSON, como no diário da execução, para que cada valor chegue como
+um objeto novo. A memória é medida com `tracemalloc` e inclui os textos únicos de cada
+linha (título, autor, resumo e link), iguais nas três representações; o relatório mostra
+também o custo da representação sem eles.
+
+Uso:
+    python benchmarks/memory_benchmark.py
+    python benchmarks/memory_benchmark.py --results 500000 --json memoria.json
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import os
+import tracemalloc
+from dataclasses import make_dataclass
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from softscrape.models import FIELD_NAMES, ResultBatch, SearchResult  # noqa: E402
+
+# Representação anterior, para comparação
+LegacySearchResult = make_dataclass("LegacySearchResult", [(name, str) for name in FIELD_NAMES])
+
+DOC_TYPES = ["HTML"] * 12 + ["PDF"] * 5 + ["TIMEOUT", "HTTP_ERROR_404", "HTTP_ERROR_403", "REQUEST_ERROR"]
+# Campos com um valor próprio em cada linha, sem o que compartilhar entre resultados
+UNIQUE_FIELDS = ("title", "author", "abstract", "link")
+WORDS = ("learning model language productivity software developer study analysis large generative "
+         "effect survey empirical team code review quality").split()
+
+
+def generate_lines(results: int, seed: int = 42, domains: int = 300) -> List[str]:
+    """
+    Linhas JSON com a distribuição típica de uma varredura: links e textos únicos, poucos
+    domínios, tipos e anos.
+    """
+    rng = random.Random(seed)
+    hosts = [f"{rng.choice(WORDS)}{index}.{rng.choice(['org', 'com', 'edu'])}" for index in range(domains)]
+    lines = []
+    for index in range(results):
+        host = rng.choice(hosts)
+        lines.append(json.dumps({
+            "title": " ".join(rng.choice(WORDS) for _ in range(10)).capitalize(),
+            "author": ", ".join(f"{rng.choice('ABCDEFGHJKLMNP')}. {rng.choice(WORDS).capitalize()}" for _ in range(3)),
+            "abstract": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "source": f"https://{host} › {rng.choice(['article', 'abs', 'paper'])}",
+            "year": str(rng.randint(1995, 2024)),
+            "doc_type": rng.choice(DOC_TYPES),
+            "base": host,
+            "link": f"https://{host}/article/{index}",
+        }, ensure_ascii=False))
+    return lines
+
+
+def _measure(build: Callable[[List[str]], object], lines: List[str]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build(lines)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return used
+
+
+def _build_legacy(lines: List[str]) -> List[object]:
+    return [LegacySearchResult(**json.loads(line)) for line in lines]
+
+
+def _build_slots(lines: List[str]) -> List[SearchResult]:
+    return [SearchResult(**json.loads(line)) for line in lines]
+
+
+def _build_batch(lines: List[str]) -> ResultBatch:
+    batch = ResultBatch()
+    for line in lines:
+        entry = json.loads(line)
+        batch.append_row(tuple(entry[name] for name in FIELD_NAMES))
+    return batch
+
+
+def unique_text_bytes(lines: List[str]) -> float:
+    """
+    Média, por linha, dos bytes das strings dos campos únicos.
+    """
+    total = 0
+    for line in lines:
+        entry = json.loads(line)
+        total += sum(sys.getsizeof(entry[name]) for name in UNIQUE_FIELDS)
+    return total / len(lines)
+
+
+REPRESENTATIONS = {"dataclass": _build_legacy, "slots": _build_slots, "batch": _build_batch}
+
+
+def run(results: int = 100_000, seed: int = 42) -> Dict[str, object]:
+    """
+    Mede as três representações sobre as mesmas linhas. Devolve os bytes por resultado
+    de cada uma e a redução em relação à `dataclass`.
+    """
+    lines = generate_lines(results, seed=seed)
+    bytes_per_result = {
+        name: round(_measure(build, lines) / results, 1) for name, build in REPRESENTATIONS.items()
+    }
+    text = unique_text_bytes(lines)
+    overhead = {name: round(value - text, 1) for name, value in bytes_per_result.items()}
+    return {
+        "results": results,
+        "unique_text_bytes": round(text, 1),
+        "bytes_per_result": bytes_per_result,
+        "overhead_per_result": overhead,
+        "reduction": {
+            name: round(1 - value / bytes_per_result["dataclass"], 3) for name, value in bytes_per_result.items() if name != "dataclass"
+        },
+        "overhead_reduction": {
+            name: round(1 - value / overhead["dataclass"], 3) for name, value in overhead.items() if name != "dataclass"
+        },
+    }
+
+
+def format_report(report: Dict[str, object]) -> str:
+    lines = [
+        f"Resultados mantidos em memória: {report['results']} "
+        f"(textos únicos: {report['unique_text_bytes']:.1f} bytes/resultado em todas as representações)",
+        f"  {'':<10} {'total':>10} {'sem textos':>12}",
+    ]
+    for name, value in report["bytes_per_result"].items():
+        overhead = report["overhead_per_result"][name]
+        line = f"  {name:<10} {value:>10.1f} {overhead:>12.1f}"
+        if name in report["reduction"]:
+            line += f"   ({report['reduction'][name]:.1%} a menos no total, {report['overhead_reduction'][name]:.1%} sem os textos)"
+        lines.append(line)
+    lines.append("  (bytes por resultado)")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bytes por resultado em cada representação.")
+    parser.add_argument("--results", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava o relatório em JSON")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run(args.results, seed=args.seed)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,361 @@
+"""
+Benchmark de ponta a ponta: sobe `server.py` (SerpAPI e páginas locais), executa
+`main.run` contra ele e mede resultados/s, latência por link (p50/p95), pico de RSS
+e o tempo acumulado de cada estágio (busca, download, parse, extração, exportação).
+
+O cenário roda várias vezes e vale a mediana. Como o tempo de relógio varia muito
+entre máquinas e execuções, a vazão é também medida em relação a uma calibração
+(um trabalho fixo, só da biblioteca padrão, cronometrado no mesmo processo antes de
+cada execução). Só a vazão relativa e o pico de RSS são comparados com
+`baseline.json`: uma piora além da tolerância encerra com código 1, para que
+regressões sejam detectadas sem acesso à rede. As latências são informativas.
+
+Uso:
+    python benchmarks/run_benchmark.py                    # executa e compara
+    python benchmarks/run_benchmark.py --runs 9           # mediana de mais execuções
+    python benchmarks/run_benchmark.py --update-baseline  # grava a nova referência
+    python benchmarks/run_benchmark.py --results 300 --latency-ms 80 --error-rate 0.1
+"""
+import argparse
+import csv
+import functools
+import glob
+import json
+import logging
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+# A chave padrão do cliente é lida na importação; o servidor local não a valida
+os.environ["SERPAPI_API_KEY"] = "benchmark"
+
+from softscrape import exporters, journal, main, pipeline, runner, store  # noqa: E402
+from softscrape.clients.serpapi_client import SerpApiClient  # noqa: E402
+from softscrape.config import settings  # noqa: E402
+from softscrape.dedupe import is_error_doc_type  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+SERVER_SCRIPT = os.path.join(BENCH_DIR, "server.py")
+CALIBRATION_PAGE = os.path.join(BENCH_DIR, "fixtures", "pages", "body_meta.html")
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_RUNS = 5
+
+# Métricas comparadas com a referência e o sentido em que cada uma melhora
+HIGHER_IS_BETTER = ("relative_throughput",)
+LOWER_IS_BETTER = ("peak_rss_mb",)
+# Métricas resumidas pela mediana das execuções (as de latência só são informadas)
+MEDIAN_METRICS = ("elapsed_sec", "results_per_sec", "calibration_per_sec", "relative_throughput",
+                  "latency_p50_ms", "latency_p95_ms", "peak_rss_mb")
+
+
+@dataclass
+class Scenario:
+    results: int = 100
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.05
+    page_kb: int = 48
+    pdf_ratio: float = 0.1
+    head_meta_ratio: float = 0.5
+    seed: int = 42
+
+    def server_args(self) -> List[str]:
+        args = []
+        for name, value in asdict(self).items():
+            option = "total-results" if name == "results" else name.replace("_", "-")
+            args += [f"--{option}", str(value)]
+        return args
+
+
+class StageTimer:
+    """
+    Acumula, por estágio, a duração de cada chamada das funções instrumentadas.
+    Os estágios rodam em várias threads: a soma pode passar do tempo de relógio.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            return {stage: round(sum(values), 4) for stage, values in self.durations.items()}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Percentil por interpolação linear entre as amostras ordenadas.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * fraction
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def calibrate(page_kb: int = 48, rounds: int = 3, round_sec: float = 0.2) -> float:
+    """
+    Páginas/s de um trabalho fixo que não depende do código medido: o parse, com o
+    `HTMLParser` da biblioteca padrão, de uma página das fixtures repetida até
+    `page_kb`. O melhor de `rounds` rodadas reflete a velocidade da máquina no momento.
+    """
+    with open(CALIBRATION_PAGE, "r", encoding="utf-8") as f:
+        fragment = f.read()
+    page = fragment * max(1, page_kb * 1024 // len(fragment))
+    best = 0.0
+    for _ in range(rounds):
+        pages, started = 0, time.perf_counter()
+        while True:
+            parser = HTMLParser()
+            parser.feed(page)
+            parser.close()
+            pages += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= round_sec:
+                break
+        best = max(best, pages / elapsed)
+    return best
+
+
+def start_server(scenario: Scenario) -> Tuple[subprocess.Popen, str]:
+    process = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--port", "0", *scenario.server_args()],
+        stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline().strip()
+    if not line.startswith("PORT "):
+        process.kill()
+        raise RuntimeError(f"Servidor de benchmark não iniciou (saída: {line!r}).")
+    return process, f"http://127.0.0.1:{line.split()[1]}"
+
+
+def _bench_settings(base_url: str, scenario: Scenario) -> Dict[str, object]:
+    return {
+        "SERPAPI_BASE_URL": f"{base_url}/search",
+        "SERPAPI_OFFLINE": False,
+        "SERPAPI_CACHE_ENABLED": False,
+        "PAGE_CACHE_ENABLED": False,
+        "PAUSE_SEC": 0,
+        "PAGES": math.ceil(scenario.results / 10),
+        "RESULTS_PER_PAGE": 10,
+        "EXPORT_FORMAT": "csv",
+        "EXPORT_COMPRESSION": "",
+        # Todas as páginas vêm do mesmo host local: os limites de cortesia por host
+        # serializariam o benchmark e mediriam só a espera do escalonador
+        "HOST_MAX_CONCURRENCY": settings.FETCH_WORKERS,
+        "HOST_RATE_PER_SEC": 10000.0,
+        "HOST_BURST": 10000.0,
+        "RETRY_BASE_DELAY_SEC": 0.05,
+        "RETRY_MAX_DELAY_SEC": 0.5,
+    }
+
+
+def run_scenario(scenario: Scenario, verbose: bool = False) -> Dict[str, object]:
+    """
+    Executa `main.run` contra o servidor local e devolve o relatório do cenário.
+    """
+    process, base_url = start_server(scenario)
+    timer = StageTimer()
+    link_latencies: List[float] = []
+    latency_lock = threading.Lock()
+
+    def timed_process_result(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return process_result(*args, **kwargs)
+        finally:
+            with latency_lock:
+                link_latencies.append(time.perf_counter() - started)
+
+    process_result = pipeline.process_result
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir, ExitStack() as stack:
+            for name, value in _bench_settings(base_url, scenario).items():
+                stack.enter_context(patch.object(settings, name, value))
+            stack.enter_context(patch.object(exporters, "OUTPUT_DIR", tmpdir))
+            stack.enter_context(patch.object(journal, "RUNS_DIR", os.path.join(tmpdir, "runs")))
+            stack.enter_context(patch.object(store, "STORE_PATH", os.path.join(tmpdir, "results.sqlite3")))
+            stack.enter_context(patch.object(SerpApiClient, "search", timer.wrap("search", SerpApiClient.search)))
+            stack.enter_context(patch.object(pipeline, "fetch_page", timer.wrap("fetch", pipeline.fetch_page)))
+            stack.enter_context(patch.object(pipeline, "parse_html", timer.wrap("parse", pipeline.parse_html)))
+            for name in ("extract_author", "extract_abstract", "extract_year", "extract_base"):
+                stack.enter_context(patch.object(pipeline, name, timer.wrap("extract", getattr(pipeline, name))))
+            stack.enter_context(patch.object(runner, "export_journals", timer.wrap("export", runner.export_journals)))
+            stack.enter_context(patch.object(pipeline, "process_result", timed_process_result))
+            if not verbose:
+                stack.callback(logging.disable, logging.NOTSET)
+                logging.disable(logging.CRITICAL)
+
+            started = time.perf_counter()
+            main.run(engine="google", query="benchmark")
+            elapsed = time.perf_counter() - started
+
+            rows, errors = 0, 0
+            for path in glob.glob(os.path.join(tmpdir, "*.csv")):
+                with open(path, newline="", encoding="utf-8") as f:
+                    for row in csv.DictReader(f):
+                        rows += 1
+                        errors += is_error_doc_type(row.get("doc_type") or "")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    return {
+        "scenario": asdict(scenario),
+        "rows": rows,
+        "error_rows": errors,
+        "elapsed_sec": round(elapsed, 3),
+        "results_per_sec": round(rows / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(link_latencies, 0.50) * 1000, 1),
+        "latency_p95_ms": round(percentile(link_latencies, 0.95) * 1000, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages_sec": timer.totals(),
+    }
+
+
+def run_benchmark(scenario: Scenario, runs: int = DEFAULT_RUNS, verbose: bool = False) -> Dict[str, object]:
+    """
+    Executa o cenário `runs` vezes, cada uma precedida da calibração, e resume as
+    métricas pela mediana. `relative_throughput` é a vazão por mil páginas/s da
+    calibração: a velocidade da máquina se cancela e sobra a do código.
+    """
+    reports = []
+    for _ in range(max(1, runs)):
+        calibration = calibrate(scenario.page_kb)
+        report = run_scenario(scenario, verbose=verbose)
+        report["calibration_per_sec"] = round(calibration, 1)
+        report["relative_throughput"] = round(report["results_per_sec"] / calibration * 1000, 2) if calibration else 0.0
+        reports.append(report)
+    return summarize(reports)
+
+
+def summarize(reports: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Mediana de cada métrica de `MEDIAN_METRICS`; cenário, linhas e estágios vêm da última execução.
+    """
+    summary = dict(reports[-1])
+    for name in MEDIAN_METRICS:
+        values = [report[name] for report in reports if report.get(name) is not None]
+        summary[name] = round(statistics.median(values), 2) if values else None
+    summary["runs"] = len(reports)
+    return summary
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Lista as métricas comparáveis (`HIGHER_IS_BETTER` e `LOWER_IS_BETTER`) que pioraram
+    mais que `tolerance` (fração) em relação à referência.
+    """
+    regressions = []
+    for name in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+        current, reference = report.get(name), baseline.get(name)
+        if current is None or not reference:
+            continue
+        if name in HIGHER_IS_BETTER:
+            worse = current < reference * (1 - tolerance)
+        else:
+            worse = current > reference * (1 + tolerance)
+        if worse:
+            regressions.append(f"{name}: {current} (referência {reference}, tolerância {tolerance:.0%})")
+    return regressions
+
+
+def format_report(report: Dict[str, object]) -> str:
+    lines = [
+        f"Execuções: {report.get('runs', 1)} (medianas)",
+        f"Resultados: {report['rows']} ({report['error_rows']} com erro) em {report['elapsed_sec']}s",
+        f"Vazão: {report['results_per_sec']} resultados/s "
+        f"({report.get('relative_throughput')} por mil páginas/s da calibração, {report.get('calibration_per_sec')} páginas/s)",
+        f"Latência por link (informativa): p50 {report['latency_p50_ms']} ms, p95 {report['latency_p95_ms']} ms",
+        f"Pico de RSS: {report['peak_rss_mb']} MB",
+        "Tempo acumulado por estágio (soma entre threads):",
+    ]
+    lines += [f"  {stage:<8} {seconds:.3f}s" for stage, seconds in sorted(report["stages_sec"].items())]
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = Scenario()
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta contra um servidor local.")
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"execuções do cenário (mediana; padrão: {DEFAULT_RUNS})")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="arquivo de referência (padrão: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="piora relativa aceita (padrão: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="grava este resultado como nova referência")
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava o relatório completo em JSON")
+    parser.add_argument("--verbose", action="store_true", help="mantém os logs da execução")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    scenario = Scenario(**{name: getattr(args, name) for name in asdict(Scenario())})
+    report = run_benchmark(scenario, runs=args.runs, verbose=args.verbose)
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Referência atualizada em {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("Sem referência para comparar (use --update-baseline).")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("scenario") != report["scenario"]:
+        print("Cenário diferente do da referência: comparação ignorada.")
+        return 0
+    regressions = compare(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}")
+    if not regressions:
+        print("Sem regressões em relação à referência.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,238 @@
+"""
+Servidor HTTP local que substitui a SerpAPI e as páginas das editoras nos benchmarks.
+
+- `GET /search?start=&num=`: reproduz a resposta gravada em `fixtures/serpapi_google.json`,
+  com os links reescritos para as páginas deste servidor e a paginação ajustada ao
+  total de resultados configurado.
+- `GET /pages/<n>.html|.pdf`: corpo montado a partir de `fixtures/pages/`, com o
+  tamanho, a latência e a taxa de erros configurados. Os PDFs atendem `Range` (206).
+
+Uso: `python benchmarks/server.py --port 0 --latency-ms 50` (imprime `PORT <n>` ao iniciar).
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PAGE_PATH = re.compile(r"^/pages/(\d+)\.(html|pdf)$")
+PDF_OBJECT = re.compile(rb"(\d+) 0 obj\n.*?\nendobj\n", re.DOTALL)
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass
+class ServerConfig:
+    total_results: int = 100
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Fração das páginas que respondem 503 na primeira requisição (falha transitória)
+    error_rate: float = 0.0
+    page_kb: int = 48
+    pdf_ratio: float = 0.1
+    # Fração das páginas HTML com autor e resumo já no <head>
+    head_meta_ratio: float = 0.5
+    seed: int = 42
+
+
+def _load_fixtures() -> Tuple[dict, Dict[str, str], bytes]:
+    with open(os.path.join(FIXTURES_DIR, "serpapi_google.json"), "r", encoding="utf-8") as f:
+        recorded = json.load(f)
+    templates = {}
+    for name in ("head_meta", "body_meta"):
+        with open(os.path.join(FIXTURES_DIR, "pages", f"{name}.html"), "r", encoding="utf-8") as f:
+            templates[name] = f.read()
+    with open(os.path.join(FIXTURES_DIR, "pages", "paper.pdf"), "rb") as f:
+        pdf = f.read()
+    return recorded, templates, pdf
+
+
+def _layout_pdf(source: bytes, size: int) -> bytes:
+    """
+    Monta um PDF com tabela xref a partir dos objetos da fixture. O preenchimento (o lugar
+    de fontes e imagens) fica antes do último objeto, deixando o Info perto do fim do arquivo.
+    """
+    objects = [(int(match.group(1)), match.group(0)) for match in PDF_OBJECT.finditer(source)]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for position, (num, body) in enumerate(objects):
+        if position == len(objects) - 1:
+            out += b"%" + b"0" * max(0, size - len(source)) + b"\n"
+        offsets[num] = len(out)
+        out += body
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (max(offsets) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offsets[num] for num in range(1, max(offsets) + 1))
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\n" % (max(offsets) + 1, objects[-1][0])
+    out += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return bytes(out)
+
+
+class BenchmarkCorpus:
+    """
+    Respostas determinísticas (pela `seed`) para a API e para cada página do corpus.
+    """
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.recorded, self.templates, pdf_objects = _load_fixtures()
+        self.pdf = _layout_pdf(pdf_objects, config.page_kb * 1024)
+        rng = random.Random(config.seed)
+        self._kinds = []
+        self._failing = set()
+        for index in range(config.total_results):
+            if rng.random() < config.pdf_ratio:
+                self._kinds.append("pdf")
+            else:
+                self._kinds.append("head_meta" if rng.random() < config.head_meta_ratio else "body_meta")
+            if rng.random() < config.error_rate:
+                self._failing.add(index)
+        self._failed_once = set()
+        self._lock = threading.Lock()
+
+    def search(self, base_url: str, start: int, num: int) -> dict:
+        organic = self.recorded["organic_results"]
+        data = copy.deepcopy({key: value for key, value in self.recorded.items() if key != "organic_results"})
+        results = []
+        for index in range(start, min(start + num, self.config.total_results)):
+            item = copy.deepcopy(organic[index % len(organic)])
+            extension = "pdf" if self._kinds[index] == "pdf" else "html"
+            item["position"] = index + 1
+            item["link"] = f"{base_url}/pages/{index}.{extension}"
+            results.append(item)
+        data["organic_results"] = results
+        data["search_information"]["total_results"] = self.config.total_results
+        data["serpapi_pagination"] = {"current": start // max(1, num) + 1}
+        if start + num < self.config.total_results:
+            data["serpapi_pagination"]["next"] = f"{base_url}/search?start={start + num}&num={num}"
+        return data
+
+    def should_fail(self, index: int) -> bool:
+        with self._lock:
+            if index in self._failing and index not in self._failed_once:
+                self._failed_once.add(index)
+                return True
+        return False
+
+    def page(self, index: int) -> Tuple[str, bytes]:
+        if self._kinds[index] == "pdf":
+            return "application/pdf", self.pdf
+        item = self.recorded["organic_results"][index % len(self.recorded["organic_results"])]
+        author = item["publication_info"]["summary"].split(" - ")[0]
+        abstract = item["snippet"] * 3
+        paragraph = f"<p>{item['snippet']} </p>\n"
+        template = self.templates[self._kinds[index]]
+        skeleton = len(template) + len(item["title"]) * 2 + len(author) + len(abstract) * 3
+        repeats = max(0, (self.config.page_kb * 1024 - skeleton) // len(paragraph))
+        body = template.format(title=item["title"], author=author, abstract=abstract, padding=paragraph * repeats)
+        return "text/html; charset=utf-8", body.encode("utf-8")
+
+
+def make_handler(corpus: BenchmarkCorpus):
+    config = corpus.config
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # noqa: A002 - assinatura da classe base
+            pass
+
+        def _delay(self) -> None:
+            with rng_lock:
+                jitter = rng.uniform(0, config.jitter_ms) if config.jitter_ms else 0.0
+            if config.latency_ms or jitter:
+                time.sleep((config.latency_ms + jitter) / 1000.0)
+
+        def _send(self, status: int, content_type: str, body: bytes, content_range: str = "") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if content_range:
+                self.send_header("Content-Range", content_range)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            self._delay()
+            if parts.path == "/search":
+                params = parse_qs(parts.query)
+                start = int(params.get("start", ["0"])[0])
+                num = int(params.get("num", ["10"])[0])
+                base_url = f"http://{self.headers.get('Host')}"
+                body = json.dumps(corpus.search(base_url, start, num)).encode("utf-8")
+                self._send(200, "application/json", body)
+                return
+            match = PAGE_PATH.match(parts.path)
+            if not match or int(match.group(1)) >= config.total_results:
+                self._send(404, "text/plain", b"not found")
+                return
+            index = int(match.group(1))
+            if corpus.should_fail(index):
+                self._send(503, "text/plain", b"unavailable")
+                return
+            content_type, body = corpus.page(index)
+            match = RANGE.match(self.headers.get("Range", ""))
+            if content_type == "application/pdf" and match and any(match.groups()):
+                first, last = match.groups()
+                size = len(body)
+                start = size - int(last) if not first else int(first)
+                end = size - 1 if not first or not last else min(int(last), size - 1)
+                start = max(start, 0)
+                if start >= size:
+                    self._send(416, "text/plain", b"", content_range=f"bytes */{size}")
+                    return
+                self._send(206, content_type, body[start:end + 1], content_range=f"bytes {start}-{end}/{size}")
+                return
+            self._send(200, content_type, body)
+
+    return Handler
+
+
+class BenchmarkServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # O cliente encerra a conexão ao parar no </head> ou no limite de bytes: não é erro
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def serve(config: ServerConfig, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = BenchmarkServer((host, port), make_handler(BenchmarkCorpus(config)))
+    return server
+
+
+def parse_args(argv: Optional[list] = None) -> Tuple[ServerConfig, int]:
+    defaults = ServerConfig()
+    parser = argparse.ArgumentParser(description="Servidor local de SerpAPI e páginas para benchmarks.")
+    parser.add_argument("--port", type=int, default=0)
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args(argv)
+    config = ServerConfig(**{name: getattr(args, name) for name in asdict(defaults)})
+    return config, args.port
+
+
+if __name__ == "__main__":
+    config, port = parse_args()
+    server = serve(config, port)
+    print(f"PORT {server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sys.exit(0)
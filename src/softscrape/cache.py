@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .config import settings
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "outputs", "cache")
+
+# Parâmetros da SerpAPI que identificam uma resposta (a api_key fica de fora de propósito)
+RESPONSE_KEY_FIELDS = ("engine", "q", "start", "num", "hl", "gl")
+
+
+class CacheMissError(LookupError):
+    """
+    Levantada no modo offline quando a resposta pedida não está no cache.
+    """
+
+
+class ResponseCache:
+    """
+    Cache persistente (SQLite) de respostas JSON da SerpAPI, endereçado pelo
+    hash dos parâmetros da busca, com TTL e limite de entradas com despejo LRU.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_sec: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.path = path or os.path.join(CACHE_DIR, "serpapi.sqlite3")
+        self.ttl_sec = settings.SERPAPI_CACHE_TTL_SEC if ttl_sec is None else ttl_sec
+        self.max_entries = settings.SERPAPI_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " params TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        Gera a chave de conteúdo (sha256) a partir dos parâmetros relevantes da busca.
+        """
+        relevant = {field: params.get(field) for field in RESPONSE_KEY_FIELDS}
+        raw = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Devolve a resposta em cache, ou None se ausente ou expirada.
+        """
+        key = self.make_key(params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            body, created_at = row
+            if self.ttl_sec and now - created_at > self.ttl_sec:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(body)
+
+    def put(self, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Armazena a resposta e despeja as entradas menos usadas além do limite.
+        """
+        key = self.make_key(params)
+        relevant = {field: params.get(field) for field in RESPONSE_KEY_FIELDS}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, params, body, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(relevant, ensure_ascii=False), json.dumps(response, ensure_ascii=False), now, now)
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class CachedPage:
+    url: str
+    content_type: str
+    encoding: Optional[str]
+    content: bytes
+    etag: str
+    last_modified: str
+    truncated: bool = False
+
+
+@dataclass
+class PageCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    bytes_saved: int = 0
+
+
+class PageCache:
+    """
+    Cache em disco (SQLite) das páginas de resultado, guardando corpo, Content-Type
+    e validadores (ETag/Last-Modified) para revalidação com GET condicional.
+    O total de bytes armazenados é limitado por `max_bytes` com despejo LRU.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.path.join(CACHE_DIR, "pages.sqlite3")
+        self.max_bytes = settings.PAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.stats = PageCacheStats()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT NOT NULL,"
+            " last_modified TEXT NOT NULL,"
+            " content_type TEXT NOT NULL,"
+            " encoding TEXT,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " truncated INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if "truncated" not in columns:
+            # Caches criados antes do download em streaming não têm a coluna
+            self._conn.execute("ALTER TABLE pages ADD COLUMN truncated INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Devolve a página armazenada (ainda não revalidada), ou None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_type, encoding, body, truncated FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_type, encoding, body, truncated = row
+        return CachedPage(url=url, content_type=content_type, encoding=encoding, content=bytes(body),
+                          etag=etag, last_modified=last_modified, truncated=bool(truncated))
+
+    def validators(self, cached: CachedPage) -> Dict[str, str]:
+        """
+        Cabeçalhos condicionais (If-None-Match / If-Modified-Since) para a página armazenada.
+        """
+        headers = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def record_hit(self, cached: CachedPage) -> None:
+        """
+        Registra uma revalidação bem-sucedida (304) e renova o acesso da entrada.
+        """
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.bytes_saved += len(cached.content)
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), cached.url))
+            self._conn.commit()
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.stats.misses += 1
+
+    def put(self, url: str, content_type: str, encoding: Optional[str], content: bytes,
+            etag: str = "", last_modified: str = "", truncated: bool = False) -> None:
+        """
+        Armazena uma página com validadores. Páginas sem ETag/Last-Modified ou maiores que
+        o orçamento total não são guardadas, pois não poderiam ser revalidadas/mantidas.
+        `truncated` marca corpos lidos só em parte (ex.: apenas o <head>).
+        """
+        if not (etag or last_modified) or len(content) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_type, encoding, body, size, last_access, truncated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_type, encoding, sqlite3.Binary(content), len(content), time.time(), int(truncated))
+            )
+            self.stats.stored += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY last_access ASC").fetchall():
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self.stats.evicted += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,18 +1,66 @@
 import requests
-from typing import Any, Dict
-from config import settings
-from logger import get_logger
+from typing import Any, Dict, Optional
+from ..cache import CacheMissError, ResponseCache
+from ..config import settings
+from ..logger import get_logger
+from ..metrics import get_metrics, timed
+from ..retry import RetryPolicy
+from ..scheduler import TokenBucket
+from ..session import get_session
 
 _log = get_logger("SerpApiClient")
 
+# Maior `num` (resultados por chamada) aceito por cada buscador da SerpAPI
+MAX_RESULTS_PER_CALL = {"google": 100, "google_scholar": 20}
+
+
+def has_more_results(data: Dict[str, Any], start: int, num: int) -> bool:
+    """
+    Indica se vale buscar a página seguinte: há resultados orgânicos nesta, a SerpAPI
+    ainda oferece `serpapi_pagination.next` e o total estimado (`search_information`)
+    não foi alcançado.
+    """
+    if not data.get("organic_results"):
+        return False
+    pagination = data.get("serpapi_pagination")
+    if isinstance(pagination, dict) and not pagination.get("next"):
+        return False
+    total = (data.get("search_information") or {}).get("total_results")
+    if isinstance(total, int) and start + num >= total:
+        return False
+    return True
+
 class SerpApiClient:
     BASE_URL = "https://serpapi.com/search"
 
-    def __init__(self, api_key: str = settings.SERPAPI_API_KEY):
-        if not api_key:
+    def __init__(
+        self,
+        api_key: str = settings.SERPAPI_API_KEY,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        offline: bool = False,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        base_url: Optional[str] = None
+    ):
+        # No modo offline as respostas vêm apenas do cache, então a chave não é obrigatória
+        if not api_key and not offline:
             raise ValueError("SERPAPI_API_KEY não definido.")
+        if offline and cache is None:
+            raise ValueError("O modo offline exige um cache de respostas.")
         self.api_key = api_key
+        self.base_url = base_url or settings.SERPAPI_BASE_URL or self.BASE_URL
+        self.session = session or get_session()
+        self.cache = cache
+        self.offline = offline
+        # Limita a taxa de chamadas reais à API; respostas em cache não consomem tokens
+        self.rate_limiter = rate_limiter
+        # Repete chamadas que falham por timeout, conexão ou status transitório (5xx/429)
+        self.retry_policy = retry_policy
+        # Indica se a última chamada a `search` foi servida pelo cache (sem custo de API)
+        self.last_from_cache = False
 
+    @timed("serpapi_search")
     def search(
         self,
         query: str,
@@ -31,7 +79,30 @@ class SerpApiClient:
             "hl": hl,
             "gl": gl
         }
-        _log.info(f"Buscando com engine: {engine}, query: '{query[:50]}...', start: {start}")
-        resp = requests.get(self.BASE_URL, params=params, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
\ No newline at end of file
+        if self.cache is not None:
+            cached = self.cache.get(params)
+            get_metrics().inc("cache_requests", cache="serpapi", result="hit" if cached is not None else "miss")
+            if cached is not None:
+                _log.info("Resposta em cache para engine: %s, query: '%.50s...', start: %d", engine, query, start)
+                self.last_from_cache = True
+                return cached
+            if self.offline:
+                raise CacheMissError(f"Resposta não encontrada no cache (offline) para engine: {engine}, start: {start}")
+
+        def request() -> Dict[str, Any]:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            resp = self.session.get(self.base_url, params=params, timeout=10)
+            get_metrics().inc("serpapi_requests", status=str(resp.status_code))
+            resp.raise_for_status()
+            return resp.json()
+
+        _log.info("Buscando com engine: %s, query: '%.50s...', start: %d", engine, query, start)
+        self.last_from_cache = False
+        if self.retry_policy is not None:
+            data = self.retry_policy.call(request, description=f"SerpAPI {engine} start={start}")
+        else:
+            data = request()
+        if self.cache is not None:
+            self.cache.put(params, data)
+        return data
@@ -5,6 +5,8 @@ load_dotenv()
 
 class Settings:
     SERPAPI_API_KEY: str = os.getenv("SERPAPI_API_KEY", "")
+    # Endpoint da SerpAPI (sobrescrito pelo benchmark para apontar ao servidor local)
+    SERPAPI_BASE_URL: str = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com/search")
     # COLOQUE AQUI A QUERY QUE DESEJA PESQUISAR
     # Exemplo: "Generative AI" AND "productivity" AND "software development"
     QUERY: str = (
@@ -15,6 +17,103 @@ class Settings:
     # COLOQUE AQUI O NUMERO DE PÁGINAS QUE DESEJA PESQUISAR
     # Exemplo: 10
     PAGES: int = 10
+    # Intervalo mínimo entre chamadas à SerpAPI (balde de tokens; não pausa o download dos links)
     PAUSE_SEC: float = 1.0
+    RESULTS_PER_PAGE: int = 10
+    # Busca os PAGES × RESULTS_PER_PAGE resultados com o maior `num` aceito pelo buscador
+    # (Google: 100, Scholar: 20), reduzindo o número de chamadas à API
+    MAXIMIZE_PAGE_SIZE: bool = True
+    # Número de threads que baixam e extraem os links de uma página em paralelo
+    FETCH_WORKERS: int = 8
+    # Modo lote (--batch): consultas executadas ao mesmo tempo, compartilhando pools e caches
+    BATCH_CONCURRENCY: int = 2
+    # Links concluídos guardados no memo do processo (os mais antigos saem primeiro), para a
+    # memória não crescer com o número de consultas
+    LINK_MEMO_MAX_ENTRIES: int = 5000
+    # Une resultados repetidos (DOI, espelhos, variantes http/https ou com parâmetros de rastreamento)
+    # numa única linha com os campos mais completos; o arquivo é gravado ao fim, a partir do diário
+    DEDUPE_RESULTS: bool = True
+    # Cortesia por domínio: requisições simultâneas, taxa (req/s) e rajada por host
+    HOST_MAX_CONCURRENCY: int = 2
+    HOST_RATE_PER_SEC: float = 2.0
+    HOST_BURST: float = 2.0
+    # Teto para o Retry-After honrado em respostas 429/503
+    RETRY_AFTER_MAX_SEC: float = 120.0
+    # Novas tentativas: status HTTP transitórios, tentativas por chamada à API e backoff exponencial com jitter
+    RETRY_STATUSES: tuple = (429, 500, 502, 503, 504)
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY_SEC: float = 1.0
+    RETRY_MAX_DELAY_SEC: float = 30.0
+    # Máximo de novas tentativas por execução (API + links), somadas
+    RETRY_BUDGET: int = 200
+    # Rodadas da fila de links que falharam, reprocessados ao fim de cada consulta (0 desliga)
+    RETRY_DEFERRED_ROUNDS: int = 2
+    # Disjuntor por host: falhas seguidas até bloquear o host e tempo bloqueado
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SEC: float = 60.0
+    # User-Agent comum para parecer um navegador e evitar bloqueios simples
+    USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    # Pools de conexão da sessão HTTP compartilhada: hosts em cache e conexões por host
+    HTTP_POOL_CONNECTIONS: int = 32
+    HTTP_POOL_MAXSIZE: int = 8
+    # Download em streaming: para em </head> quando o cabeçalho já traz autor e resumo
+    STREAM_HEAD_ONLY: bool = True
+    STREAM_CHUNK_SIZE: int = 16 * 1024
+    # Limite rígido de bytes lidos por resposta
+    MAX_PAGE_BYTES: int = 5 * 1024 * 1024
+    # Backend de parse das páginas: "html.parser", "lxml" ou "selectolax" (opcional, pip install selectolax)
+    HTML_PARSER: str = "html.parser"
+    # Parse dos documentos completos em processos separados (usa todos os núcleos; desligado por padrão)
+    PARSE_IN_PROCESSES: bool = False
+    # Processos de parse (0 = núcleos - 1) e documentos em espera antes de segurar os downloads (0 = 2 × processos)
+    PARSE_WORKERS: int = 0
+    PARSE_QUEUE_SIZE: int = 0
+    # A partir deste tamanho o documento vai ao processo por memória compartilhada, sem pickle
+    PARSE_SHM_THRESHOLD: int = 256 * 1024
+    # Ano de publicação lido da página já analisada; o htmldate (sobre a mesma árvore) é o
+    # último recurso, só roda em documentos de até HTMLDATE_MAX_TAGS tags e só vê os
+    # primeiros HTMLDATE_MAX_CHARS caracteres de texto
+    HTMLDATE_FALLBACK: bool = True
+    HTMLDATE_MAX_TAGS: int = 5000
+    HTMLDATE_MAX_CHARS: int = 10_000
+    # PDFs: metadados (Info/XMP e início da primeira página) lidos por requisições Range
+    PDF_METADATA_ENABLED: bool = True
+    # Bytes baixados no máximo por PDF; a cauda lida primeiro e o bloco das demais leituras
+    PDF_BYTE_BUDGET: int = 256 * 1024
+    PDF_TAIL_BYTES: int = 16 * 1024
+    PDF_RANGE_BLOCK: int = 16 * 1024
+    PDF_ABSTRACT_MAX_CHARS: int = 2000
+    # Log estruturado (um JSON por linha) além do console, ex.: SOFTSCRAPE_LOG_JSONL=outputs/log.jsonl
+    LOG_JSONL_PATH: str = os.getenv("SOFTSCRAPE_LOG_JSONL", "")
+    # Avisos de um mesmo domínio aceitos por janela; os demais são contados e resumidos
+    LOG_DOMAIN_WARNING_LIMIT: int = 5
+    LOG_DOMAIN_WARNING_WINDOW_SEC: float = 60.0
+    # Resumo das métricas da execução (<saída>.metrics.json) e, opcionalmente, arquivo
+    # texto do Prometheus para o textfile collector do node_exporter
+    METRICS_ENABLED: bool = True
+    METRICS_PROMETHEUS_FILE: str = os.getenv("SOFTSCRAPE_PROMETHEUS_FILE", "")
+    # Exportação em streaming: "csv", "jsonl" ou "parquet" (opcional, pip install pyarrow);
+    # compressão "", "gzip" ou "zstd" (opcional, pip install zstandard)
+    EXPORT_FORMAT: str = "csv"
+    EXPORT_COMPRESSION: str = ""
+    PARQUET_ROW_GROUP_SIZE: int = 1000
+    # Cache em disco das respostas da SerpAPI (outputs/cache/serpapi.sqlite3)
+    SERPAPI_CACHE_ENABLED: bool = True
+    SERPAPI_CACHE_TTL_SEC: float = 7 * 24 * 3600
+    SERPAPI_CACHE_MAX_ENTRIES: int = 5000
+    # Cache em disco das páginas de resultado com revalidação ETag/Last-Modified (outputs/cache/pages.sqlite3)
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    # Base local com os resultados de todas as execuções (outputs/results.sqlite3), consultável
+    # entre execuções e exportável com --export-store; inserções em lotes de RESULT_STORE_BATCH_SIZE
+    RESULT_STORE_ENABLED: bool = True
+    RESULT_STORE_PATH: str = os.getenv("SOFTSCRAPE_RESULT_STORE", "")
+    RESULT_STORE_BATCH_SIZE: int = 500
+    # Modo incremental (--incremental): só baixa links novos, com erro na última passagem ou
+    # baixados há mais de RECRAWL_MAX_AGE_SEC; os demais reaproveitam os campos da base local
+    INCREMENTAL_RECRAWL: bool = False
+    RECRAWL_MAX_AGE_SEC: float = 30 * 24 * 3600
+    # Modo offline: usa apenas o cache, sem nenhuma chamada à SerpAPI (SERPAPI_OFFLINE=1)
+    SERPAPI_OFFLINE: bool = os.getenv("SERPAPI_OFFLINE", "").lower() in ("1", "true", "yes")
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,83 @@
+from dataclasses import fields, replace
+from typing import Callable, Dict, Iterable, Iterator, Set
+
+from .models import SearchResult
+from .urls import dedupe_key
+
+# Marcadores gravados em `doc_type` quando o download/extração falha
+ERROR_MARKERS = ("TIMEOUT", "HTTP_ERROR_", "REQUEST_ERROR", "PROCESSING_ERROR", "NO_LINK")
+# Campos em que, havendo dois valores, o mais longo é o mais informativo
+_LONGEST_WINS = ("author", "abstract", "title")
+
+
+def is_error_doc_type(doc_type: str) -> bool:
+    return doc_type.startswith(ERROR_MARKERS)
+
+
+def result_key(result: SearchResult) -> str:
+    """
+    Chave de deduplicação de um resultado (DOI, arXiv ou link canônico). Resultados
+    sem link nunca são considerados duplicados entre si.
+    """
+    return dedupe_key(result.link) if result.link else ""
+
+
+def merge_results(kept: SearchResult, other: SearchResult) -> SearchResult:
+    """
+    Combina duas ocorrências do mesmo documento num único resultado: mantém o link
+    da primeira e, campo a campo, o valor mais rico (preenchido, mais longo, ou um
+    tipo de documento real no lugar de um marcador de erro).
+    """
+    changes = {}
+    for field in fields(SearchResult):
+        name = field.name
+        if name == "link":
+            continue
+        current, candidate = getattr(kept, name), getattr(other, name)
+        if not candidate or candidate == current:
+            continue
+        if name == "doc_type":
+            better = not current or (is_error_doc_type(current) and not is_error_doc_type(candidate))
+        elif name in _LONGEST_WINS:
+            better = len(candidate) > len(current)
+        else:
+            better = not current
+        if better:
+            changes[name] = candidate
+    return replace(kept, **changes) if changes else kept
+
+
+def deduplicate(source: Callable[[], Iterable[SearchResult]]) -> Iterator[SearchResult]:
+    """
+    Remove duplicados preservando a ordem da primeira ocorrência, já com os campos
+    mesclados de todas as ocorrências. `source` deve poder ser percorrido mais de uma
+    vez (ex.: `journal.iter_results`): só as chaves e os registros mesclados dos
+    documentos repetidos ficam em memória, nunca a lista completa de resultados.
+    """
+    seen: Set[str] = set()
+    repeated: Set[str] = set()
+    for result in source():
+        key = result_key(result)
+        if key in seen:
+            repeated.add(key)
+        elif key:
+            seen.add(key)
+    del seen
+    if not repeated:
+        yield from source()
+        return
+
+    merged: Dict[str, SearchResult] = {}
+    for result in source():
+        key = result_key(result)
+        if key in repeated:
+            merged[key] = merge_results(merged[key], result) if key in merged else result
+
+    for result in source():
+        key = result_key(result)
+        if key not in merged:
+            yield result
+        elif key in repeated:
+            # Só a primeira ocorrência é emitida, com os campos de todas as cópias
+            repeated.discard(key)
+            yield merged[key]
@@ -1,25 +1,212 @@
+import csv
+import gzip
+import json
 import os
+from abc import ABC, abstractmethod
 from datetime import datetime
-import pandas as pd
-from typing import List
-from .models import SearchResult
+from typing import Dict, Iterable, List, Optional, TextIO
+from .models import FIELD_NAMES, ResultBatch, Row, SearchResult
+from .config import settings
 from .logger import get_logger
+from .metrics import get_metrics
 
 _log = get_logger("Exporter")
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "outputs")
 
-def to_csv(results: List[SearchResult], prefix: str = "resultados_pesquisa", engine_name: str = "google") -> str:
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+COMPRESSIONS = ("", "gzip", "zstd")
+COLUMNS = list(FIELD_NAMES)
+_COMPRESSION_SUFFIXES = {"": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def build_output_path(prefix: str, engine_name: str, fmt: str, compression: str = "") -> str:
+    """
+    Caminho de saída no padrão `{prefix}_{engine_name}_{timestamp}.{formato}[.gz|.zst]`.
+    """
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{prefix}_{engine_name}_{ts}.csv"
-    path = os.path.join(OUTPUT_DIR, filename)
-    
-    if not results:
-        # Create DataFrame with columns from SearchResult model if results is empty
-        df = pd.DataFrame(columns=list(SearchResult.__annotations__.keys()))
-    else:
-        df = pd.DataFrame([r.__dict__ for r in results])
-        
-    df.to_csv(path, index=False)
-    _log.info(f"CSV salvo em '{path}'")
-    return path
\ No newline at end of file
+    suffix = "" if fmt == "parquet" else _COMPRESSION_SUFFIXES[compression]
+    return os.path.join(OUTPUT_DIR, f"{prefix}_{engine_name}_{ts}.{fmt}{suffix}")
+
+
+def _open_text(path: str, compression: str) -> TextIO:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("A compressão 'zstd' requer o pacote opcional zstandard (pip install zstandard).") from e
+        return zstandard.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+class ResultSink(ABC):
+    """
+    Destino de exportação em streaming: cada `write` grava a linha imediatamente,
+    sem acumular os resultados em memória. `close` devolve o caminho do arquivo.
+    As linhas chegam aos formatos como tuplas na ordem de `COLUMNS` (`SearchResult.to_row`).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+    def write(self, result: SearchResult) -> None:
+        with get_metrics().timer("export"):
+            self._write_row(result.to_row())
+        self.rows += 1
+
+    def write_many(self, results: Iterable[SearchResult]) -> None:
+        for result in results:
+            self.write(result)
+
+    def write_batch(self, batch: ResultBatch) -> None:
+        """
+        Grava um lote colunar inteiro, sem criar um `SearchResult` por linha.
+        """
+        with get_metrics().timer("export"):
+            self._write_batch(batch)
+        self.rows += len(batch)
+
+    @abstractmethod
+    def _write_row(self, row: Row) -> None:
+        ...
+
+    def _write_batch(self, batch: ResultBatch) -> None:
+        for row in batch.rows():
+            self._write_row(row)
+
+    @abstractmethod
+    def close(self) -> str:
+        ...
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CsvSink(ResultSink):
+    def __init__(self, path: str, compression: str = ""):
+        super().__init__(path)
+        self._file = _open_text(path, compression)
+        # Mesmo dialeto que o pandas usava: aspas mínimas e fim de linha do sistema
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+        self._writer.writerow(COLUMNS)
+
+    def _write_row(self, row: Row) -> None:
+        self._writer.writerow(row)
+
+    def _write_batch(self, batch: ResultBatch) -> None:
+        self._writer.writerows(batch.rows())
+
+    def close(self) -> str:
+        if not self._file.closed:
+            self._file.close()
+        return self.path
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path: str, compression: str = ""):
+        super().__init__(path)
+        self._file = _open_text(path, compression)
+
+    def _write_row(self, row: Row) -> None:
+        self._file.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n")
+
+    def close(self) -> str:
+        if not self._file.closed:
+            self._file.close()
+        return self.path
+
+
+class ParquetSink(ResultSink):
+    """
+    Parquet colunar via pyarrow (opcional), gravado em row groups de
+    `settings.PARQUET_ROW_GROUP_SIZE` linhas para manter a memória constante.
+    """
+
+    def __init__(self, path: str, compression: str = ""):
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("O formato 'parquet' requer o pacote opcional pyarrow (pip install pyarrow).") from e
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression or "snappy")
+        self._buffer: Dict[str, List[str]] = {column: [] for column in COLUMNS}
+        self._buffered = 0
+
+    def _write_row(self, row: Row) -> None:
+        for column, value in zip(COLUMNS, row):
+            self._buffer[column].append(value)
+        self._buffered += 1
+        if self._buffered >= settings.PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _write_batch(self, batch: ResultBatch) -> None:
+        # O lote vira uma tabela Arrow direto das colunas; as linhas avulsas pendentes vão antes
+        self._flush()
+        if len(batch):
+            self._writer.write_table(batch.to_arrow(self._schema), row_group_size=settings.PARQUET_ROW_GROUP_SIZE)
+
+    def _flush(self) -> None:
+        if self._buffered:
+            self._writer.write_table(self._pa.Table.from_pydict(self._buffer, schema=self._schema))
+            self._buffer = {column: [] for column in COLUMNS}
+            self._buffered = 0
+
+    def close(self) -> str:
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+        return self.path
+
+
+_SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+def open_sink(
+    fmt: Optional[str] = None,
+    prefix: str = "resultados_pesquisa",
+    engine_name: str = "google",
+    compression: Optional[str] = None,
+    path: Optional[str] = None
+) -> ResultSink:
+    """
+    Abre um destino de exportação em streaming no formato e compressão pedidos
+    (`settings.EXPORT_FORMAT` / `settings.EXPORT_COMPRESSION` por padrão).
+    """
+    fmt = fmt or settings.EXPORT_FORMAT
+    compression = settings.EXPORT_COMPRESSION if compression is None else compression
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportação desconhecido: '{fmt}'. Opções: {', '.join(EXPORT_FORMATS)}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compressão desconhecida: '{compression}'. Opções: gzip, zstd")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = path or build_output_path(prefix, engine_name, fmt, compression)
+    return _SINKS[fmt](path, compression)
+
+
+def export(
+    results: Iterable[SearchResult],
+    fmt: Optional[str] = None,
+    prefix: str = "resultados_pesquisa",
+    engine_name: str = "google",
+    compression: Optional[str] = None
+) -> str:
+    with open_sink(fmt, prefix=prefix, engine_name=engine_name, compression=compression) as sink:
+        sink.write_many(results)
+    _log.info("Arquivo salvo em '%s' (%d linhas)", sink.path, sink.rows)
+    return sink.path
+
+
+def to_csv(results: Iterable[SearchResult], prefix: str = "resultados_pesquisa", engine_name: str = "google") -> str:
+    with open_sink("csv", prefix=prefix, engine_name=engine_name, compression="") as sink:
+        sink.write_many(results)
+    _log.info("CSV salvo em '%s'", sink.path)
+    return sink.path
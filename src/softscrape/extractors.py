@@ -1,43 +1,261 @@
-from bs4 import BeautifulSoup
-from htmldate import find_date
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
+import json
+import re
 import requests
 
-def extract_author(soup: BeautifulSoup) -> str:
+from .config import settings
+from .metrics import timed
+from .session import get_session
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+META_TAGS_AUTHOR = [
+    {'name': 'author'},
+    {'property': 'article:author'},
+    {'name': 'citation_author'},
+    {'name': 'dc.creator'},
+    {'name': 'DC.creator'},
+    {'name': 'DC.Creator'},
+    {'name': 'byline'},
+    {'name': 'sailthru.author'}
+]
+
+AUTHOR_CSS_SELECTORS = [
+    '.author-name',
+    '.author',
+    '[itemprop="author"] .name',
+    '[itemprop="author"] span[itemprop="name"]',
+    'a[rel="author"]',
+    '.byline .author',
+    '.byline',
+    '.post-author .fn',
+    '.entry-author .author-name',
+    'meta[property="article:author_name"]'
+]
+
+META_TAGS_ABSTRACT = [
+    {"name": "description"},
+    {"property": "og:description"},
+    {"name": "twitter:description"},
+    {"name": "DC.Description"},
+    {"name": "DC.description"},
+    {"name": "citation_abstract"}
+]
+
+ABSTRACT_CSS_SELECTORS = [
+    'div.abstract > p',
+    'section.abstract > p',
+    'div[class*="abstract"] p',
+    'p[class*="abstract"]',
+    'div#abstract p',
+    'article .entry-content p',
+    'div.article-content p',
+    'section[property="schema:abstract"] p',
+    'div[property="schema:abstract"]'
+]
+
+# Datas de publicação, em ordem de preferência
+META_TAGS_DATE = [
+    {'name': 'citation_publication_date'},
+    {'name': 'citation_date'},
+    {'property': 'article:published_time'},
+    {'name': 'citation_online_date'},
+    {'name': 'DC.date.issued'},
+    {'name': 'dc.date'},
+    {'name': 'DC.date'},
+    {'name': 'DC.Date'},
+    {'name': 'prism.publicationDate'}
+]
+
+# Atributos de <meta> indexados (os únicos usados pelas listas acima)
+META_INDEX_ATTRS = ('name', 'property')
+
+# Blocos JSON-LD guardados por documento e tamanho máximo de cada um (o resto é ignorado)
+JSON_LD_MAX_SCRIPTS = 8
+JSON_LD_MAX_CHARS = 100_000
+YEAR_PATTERN = re.compile(r'\b(19\d{2}|20\d{2})\b')
+
+_compiled_selectors: Optional[Dict[str, Dict[str, List[Tuple[str, Any]]]]] = None
+
+
+def _selector_key(selector: str) -> Tuple[str, str]:
     """
-    Extrai o nome do autor de uma página HTML usando várias meta tags e seletores CSS.
+    Classifica o seletor pelo composto mais à direita: ('tag', nome), ('class', nome)
+    ou ('any', ''). Um nó só pode casar com o seletor se satisfizer essa chave.
     """
-    meta_tags_author = [
-        {'name': 'author'},
-        {'property': 'article:author'},
-        {'name': 'citation_author'},
-        {'name': 'dc.creator'},
-        {'name': 'DC.creator'},
-        {'name': 'DC.Creator'},
-        {'name': 'byline'},
-        {'name': 'sailthru.author'}
-    ]
-    for attrs in meta_tags_author:
-        tag = soup.find("meta", attrs=attrs)
+    rightmost = re.split(r'\s*[\s>+~]\s*', selector.strip())[-1]
+    rightmost = re.sub(r'\[[^\]]*\]', '', rightmost)
+    tag_match = re.match(r'[a-zA-Z][\w-]*', rightmost)
+    if tag_match:
+        return 'tag', tag_match.group(0).lower()
+    class_match = re.search(r'\.([\w-]+)', rightmost)
+    if class_match:
+        return 'class', class_match.group(1)
+    return 'any', ''
+
+
+def _get_compiled_selectors() -> Dict[str, Dict[str, List[Tuple[str, Any]]]]:
+    """
+    Compila (uma única vez) todos os seletores CSS usados pelos extratores,
+    agrupados pela chave de `_selector_key` para filtrar candidatos barato.
+    """
+    global _compiled_selectors
+    if _compiled_selectors is None:
+        import soupsieve
+        grouped: Dict[str, Dict[str, List[Tuple[str, Any]]]] = {'tag': {}, 'class': {}, 'any': {}}
+        for selector in dict.fromkeys(AUTHOR_CSS_SELECTORS + ABSTRACT_CSS_SELECTORS):
+            kind, name = _selector_key(selector)
+            grouped[kind].setdefault(name, []).append((selector, soupsieve.compile(selector)))
+        _compiled_selectors = grouped
+    return _compiled_selectors
+
+
+class MetadataIndex:
+    """
+    Índice construído com uma única passagem pelo documento: guarda a primeira <meta>
+    para cada par (name|property, valor) e, em ordem de documento, os nós que casam
+    com cada seletor CSS dos extratores. Equivale a `soup.find("meta", attrs=...)`,
+    `soup.select_one(...)` e `soup.select(...)`, sem percorrer a árvore várias vezes.
+    """
+
+    def __init__(self, soup: "BeautifulSoup"):
+        self._soup = soup
+        self._metas: Dict[Tuple[str, str], Any] = {}
+        self._json_ld: List[str] = []
+        self.tag_count = 0
+        compiled = _get_compiled_selectors()
+        by_tag, by_class, generic = compiled['tag'], compiled['class'], compiled['any'].get('', [])
+        self._matches: Dict[str, List[Any]] = {
+            selector: [] for group in compiled.values() for patterns in group.values() for selector, _ in patterns
+        }
+
+        for tag in soup.find_all(True):
+            self.tag_count += 1
+            if tag.name == 'meta':
+                for attr in META_INDEX_ATTRS:
+                    value = tag.get(attr)
+                    if isinstance(value, str) and (attr, value) not in self._metas:
+                        self._metas[(attr, value)] = tag
+            elif tag.name == 'script' and _is_json_ld(tag.get('type')) and len(self._json_ld) < JSON_LD_MAX_SCRIPTS:
+                self._json_ld.append(tag.string or "")
+            candidates = list(by_tag.get(tag.name, ()))
+            classes = tag.get('class')
+            if classes:
+                for class_name in dict.fromkeys(classes):
+                    candidates.extend(by_class.get(class_name, ()))
+            candidates.extend(generic)
+            for selector, pattern in candidates:
+                if pattern.match(tag):
+                    self._matches[selector].append(tag)
+
+    def meta(self, attrs: Dict[str, str]) -> Optional[Any]:
+        """
+        Primeira <meta> com o atributo/valor informado (ex.: {'name': 'author'}).
+        """
+        ((attr, value),) = attrs.items()
+        return self._metas.get((attr, value))
+
+    def select_one(self, selector: str) -> Optional[Any]:
+        matches = self._matches.get(selector)
+        return matches[0] if matches else None
+
+    def select(self, selector: str) -> List[Any]:
+        return self._matches.get(selector, [])
+
+    def json_ld(self) -> List[str]:
+        """
+        Conteúdo dos primeiros <script type="application/ld+json"> do documento.
+        """
+        return self._json_ld
+
+    def lxml_tree(self) -> Optional[Any]:
+        """
+        O mesmo documento como árvore do lxml (para o htmldate), convertido a partir do
+        BeautifulSoup já montado, sem novo parse do HTML, e cortado após
+        `settings.HTMLDATE_MAX_CHARS` caracteres de texto. None se o lxml não estiver
+        instalado ou se o documento passar de `settings.HTMLDATE_MAX_TAGS` tags.
+        """
+        if self.tag_count > settings.HTMLDATE_MAX_TAGS:
+            return None
+        try:
+            from lxml.html import html_parser
+            from lxml.html.soupparser import convert_tree
+        except ImportError:
+            return None
+        # convert_tree devolve os filhos do <html> (head, body...) já convertidos
+        nodes = [node for node in convert_tree(self._soup) if isinstance(node.tag, str)]
+        if len(nodes) == 1 and nodes[0].tag == "html":
+            root = nodes[0]
+        else:
+            root = html_parser.makeelement("html")
+            root.extend(nodes)
+        _truncate_text(root, settings.HTMLDATE_MAX_CHARS)
+        return root
+
+
+def _truncate_text(root: Any, max_chars: int) -> None:
+    """
+    Corta a árvore do lxml depois dos primeiros `max_chars` caracteres de texto, para que
+    as buscas por regex do htmldate (sobre o documento serializado) tenham custo limitado.
+    A data de publicação fica no cabeçalho ou perto do topo da página.
+    """
+    seen = 0
+    for element in root.iter():
+        seen += len(element.text or "") + len(element.tail or "")
+        if seen > max_chars:
+            break
+    else:
+        return
+    # Remove o elemento que estourou o limite e tudo o que vem depois dele
+    node = element
+    while node is not None and node is not root:
+        parent = node.getparent()
+        for sibling in list(node.itersiblings()):
+            parent.remove(sibling)
+        node = parent
+    element.getparent().remove(element)
+
+
+def _is_json_ld(script_type: Any) -> bool:
+    return isinstance(script_type, str) and script_type.strip().lower().startswith('application/ld+json')
+
+
+def _as_index(doc: Union["BeautifulSoup", MetadataIndex]) -> MetadataIndex:
+    # Qualquer outro objeto é tratado como um índice já construído (ex.: backend selectolax)
+    from bs4 import Tag
+    return MetadataIndex(doc) if isinstance(doc, Tag) else doc
+
+
+def extract_meta_author(soup: Union["BeautifulSoup", MetadataIndex]) -> str:
+    """
+    Autor vindo só das meta tags de `META_TAGS_AUTHOR`, que têm prioridade sobre todos os
+    seletores CSS de `extract_author`.
+    """
+    index = _as_index(soup)
+    for attrs in META_TAGS_AUTHOR:
+        tag = index.meta(attrs)
         if tag and tag.get("content"):
             author_content = tag["content"].strip()
             if author_content and not author_content.lower().startswith("http"):
                 return author_content
+    return ""
+
+
+@timed("extract_author")
+def extract_author(soup: Union["BeautifulSoup", MetadataIndex]) -> str:
+    """
+    Extrai o nome do autor de uma página HTML usando várias meta tags e seletores CSS.
+    Aceita o documento ou um `MetadataIndex` já construído para ele.
+    """
+    index = _as_index(soup)
+    author = extract_meta_author(index)
+    if author:
+        return author
 
-    author_css_selectors = [
-        '.author-name',
-        '.author',
-        '[itemprop="author"] .name',
-        '[itemprop="author"] span[itemprop="name"]',
-        'a[rel="author"]',
-        '.byline .author',
-        '.byline',
-        '.post-author .fn',
-        '.entry-author .author-name',
-        'meta[property="article:author_name"]'
-    ]
-    for selector in author_css_selectors:
-        author_tag = soup.select_one(selector)
+    for selector in AUTHOR_CSS_SELECTORS:
+        author_tag = index.select_one(selector)
         if author_tag:
             if author_tag.name == 'meta' and author_tag.get('content'):
                 author_text = author_tag.get('content', '').strip()
@@ -48,36 +266,32 @@ def extract_author(soup: BeautifulSoup) -> str:
 
     return ""
 
-def extract_abstract(soup: BeautifulSoup) -> str:
+def extract_meta_abstract(soup: Union["BeautifulSoup", MetadataIndex]) -> Optional[str]:
     """
-    Extrai o resumo/abstract de uma página HTML usando várias meta tags e seletores CSS.
+    Resumo vindo só das meta tags de `META_TAGS_ABSTRACT`, que têm prioridade sobre todos
+    os seletores CSS de `extract_abstract`. `None` quando nenhuma dessas tags existe.
     """
-    meta_tags_abstract = [
-        {"name": "description"},
-        {"property": "og:description"},
-        {"name": "twitter:description"},
-        {"name": "DC.Description"},
-        {"name": "DC.description"},
-        {"name": "citation_abstract"}
-    ]
-    for attrs in meta_tags_abstract:
-        tag = soup.find("meta", attrs=attrs)
+    index = _as_index(soup)
+    for attrs in META_TAGS_ABSTRACT:
+        tag = index.meta(attrs)
         if tag and tag.get("content"):
             return tag["content"].strip()
+    return None
+
+
+@timed("extract_abstract")
+def extract_abstract(soup: Union["BeautifulSoup", MetadataIndex]) -> str:
+    """
+    Extrai o resumo/abstract de uma página HTML usando várias meta tags e seletores CSS.
+    Aceita o documento ou um `MetadataIndex` já construído para ele.
+    """
+    index = _as_index(soup)
+    abstract = extract_meta_abstract(index)
+    if abstract is not None:
+        return abstract
 
-    abstract_css_selectors = [
-        'div.abstract > p',
-        'section.abstract > p',
-        'div[class*="abstract"] p',
-        'p[class*="abstract"]',
-        'div#abstract p',
-        'article .entry-content p',
-        'div.article-content p',
-        'section[property="schema:abstract"] p',
-        'div[property="schema:abstract"]'
-    ]
-    for selector in abstract_css_selectors:
-        elements = soup.select(selector)
+    for selector in ABSTRACT_CSS_SELECTORS:
+        elements = index.select(selector)
         if elements:
             abstract_parts = []
             for element in elements:
@@ -92,12 +306,88 @@ def extract_abstract(soup: BeautifulSoup) -> str:
 
     return ""
 
+def _year_from_json_ld(blocks: List[str]) -> str:
+    """
+    `datePublished` do primeiro objeto JSON-LD que o informe (inclusive dentro de `@graph`).
+    """
+    for block in blocks:
+        if not block or len(block) > JSON_LD_MAX_CHARS:
+            continue
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        # Busca em largura, limitada em profundidade: o artigo costuma estar no topo ou no @graph
+        level = data if isinstance(data, list) else [data]
+        for _ in range(4):
+            next_level = []
+            for node in level:
+                if isinstance(node, dict):
+                    match = YEAR_PATTERN.search(str(node.get('datePublished') or ''))
+                    if match:
+                        return match.group(1)
+                    next_level.extend(value for value in node.values() if isinstance(value, (dict, list)))
+                elif isinstance(node, list):
+                    next_level.extend(node)
+            level = next_level
+    return ""
+
+
+def _year_from_htmldate(index: Any) -> str:
+    tree = index.lxml_tree() if hasattr(index, 'lxml_tree') else None
+    if tree is None:
+        return ""
+    try:
+        from htmldate import find_date
+        found = find_date(tree, extensive_search=False, original_date=True)
+    except Exception:
+        # htmldate ausente ou documento que ele não consegue analisar
+        return ""
+    match = YEAR_PATTERN.search(found or "")
+    return match.group(1) if match else ""
+
+
+def preload_date_extractor() -> None:
+    """
+    Importa o htmldate (e o dateparser que ele carrega) de uma vez, antes dos downloads:
+    o import leva centenas de ms e, feito no meio da execução, seguraria todas as threads
+    que chegassem ao fallback ao mesmo tempo.
+    """
+    if not settings.HTMLDATE_FALLBACK:
+        return
+    try:
+        import htmldate  # noqa: F401
+        import lxml.html.soupparser  # noqa: F401
+    except ImportError:
+        pass
+
+
+@timed("extract_page_year")
+def extract_page_year(soup: Union["BeautifulSoup", MetadataIndex]) -> str:
+    """
+    Extrai o ano de publicação do documento já analisado: meta tags (citation_publication_date,
+    article:published_time, Dublin Core...), `datePublished` do JSON-LD e, por último,
+    as heurísticas do htmldate sobre a mesma árvore (desligáveis com `settings.HTMLDATE_FALLBACK`).
+    Aceita o documento ou um índice já construído; nunca baixa nem faz o parse de novo.
+    """
+    index = _as_index(soup)
+    for attrs in META_TAGS_DATE:
+        tag = index.meta(attrs)
+        match = YEAR_PATTERN.search(tag.get("content") or "") if tag else None
+        if match:
+            return match.group(1)
+
+    year = _year_from_json_ld(index.json_ld())
+    if year or not settings.HTMLDATE_FALLBACK:
+        return year
+    return _year_from_htmldate(index)
+
+@timed("extract_year")
 def extract_year(url: str) -> str:
     """
-    Extrai o ano de publicação da URL ou do conteúdo da página.
+    Extrai o ano de publicação da URL (o do conteúdo vem de `extract_page_year`).
     """
     try:
-        import re
         match = re.search(r'/(19\d{2}|20\d{2})/', url)
         if match:
             return match.group(1)
@@ -105,24 +395,76 @@ def extract_year(url: str) -> str:
         pass
     return ""
 
+def _doc_type_from_content_type(ctype: str) -> str:
+    ctype = ctype.lower()
+    if "pdf" in ctype:
+        return "PDF"
+    if "html" in ctype:
+        return "HTML"
+    if "json" in ctype:
+        return "JSON"
+    if "xml" in ctype:
+        return "XML"
+    return ctype.split("/")[0].upper() if "/" in ctype else ctype.upper()
+
+
+def sniff_doc_type(head: bytes) -> str:
+    """
+    Identifica o tipo de documento pelos primeiros bytes do corpo (magic bytes).
+    """
+    if not head:
+        return ""
+    start = head[:1024].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if start.startswith(b"%pdf"):
+        return "PDF"
+    if start.startswith((b"<!doctype html", b"<html", b"<head", b"<body")):
+        return "HTML"
+    if start.startswith(b"<?xml"):
+        # XHTML também começa com o prólogo XML
+        return "HTML" if b"<html" in start else "XML"
+    if start.startswith((b"{", b"[")):
+        return "JSON"
+    return ""
+
+
+DOC_TYPE_EXTENSIONS = {
+    ".pdf": "PDF",
+    ".html": "HTML",
+    ".htm": "HTML",
+    ".json": "JSON",
+    ".xml": "XML"
+}
+
+
+@timed("extract_doc_type")
+def classify_doc_type(content_type: str = "", head: bytes = b"", url: str = "") -> str:
+    """
+    Classifica o tipo de documento sem nenhuma requisição, a partir de uma resposta já obtida:
+    primeiro o Content-Type, depois os primeiros bytes do corpo e, por fim, a extensão da URL.
+    """
+    if content_type:
+        return _doc_type_from_content_type(content_type)
+    sniffed = sniff_doc_type(head)
+    if sniffed:
+        return sniffed
+    if not isinstance(url, str):
+        return ""
+    path = urlparse(url).path.lower()
+    for extension, doc_type in DOC_TYPE_EXTENSIONS.items():
+        if path.endswith(extension):
+            return doc_type
+    return ""
+
+
 def extract_doc_type(url: str, timeout: int = 10) -> str:
     """
     Determina o tipo de documento (PDF, HTML, etc.) com base no Content-Type.
+    Faz uma requisição HEAD; use `classify_doc_type` quando já houver uma resposta.
     """
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        head = requests.head(url, timeout=timeout, headers=headers, allow_redirects=True)
+        head = get_session().head(url, timeout=timeout, allow_redirects=True)
         head.raise_for_status()
-        ctype = head.headers.get("Content-Type", "").lower()
-        if "pdf" in ctype:
-            return "PDF"
-        if "html" in ctype:
-            return "HTML"
-        if "json" in ctype:
-            return "JSON"
-        if "xml" in ctype:
-            return "XML"
-        return ctype.split("/")[0].upper() if "/" in ctype else ctype.upper()
+        return _doc_type_from_content_type(head.headers.get("Content-Type", ""))
     except requests.exceptions.RequestException:
         return ""
     except Exception:
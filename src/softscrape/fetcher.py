@@ -0,0 +1,256 @@
+import re
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional, Tuple
+
+from requests.compat import chardet
+
+from .cache import PageCache
+from .config import settings
+from .extractors import extract_base
+from .metrics import get_metrics, timed
+from .retry import CircuitBreaker, CircuitOpenError, is_retryable_exception
+from .scheduler import HostScheduler, parse_retry_after
+from .session import get_session
+
+HEAD_CLOSE_TAG = b"</head>"
+CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+# Recebe os bytes até </head> (inclusive) e a codificação; True encerra o download ali
+HeadCheck = Callable[[bytes, Optional[str]], bool]
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    status_code: int
+    content_type: str
+    content: bytes
+    encoding: Optional[str] = None
+    from_cache: bool = False
+    # O corpo não foi lido por completo (parou em </head>, no limite de bytes ou não era HTML)
+    truncated: bool = False
+
+    @property
+    def text(self) -> str:
+        """
+        Corpo decodificado, equivalente a `requests.Response.text`.
+        """
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def _read_body(resp, head_check: Optional[HeadCheck], max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    Lê o corpo em blocos até o fim, até `max_bytes`, ou até </head> quando `head_check`
+    confirma que o cabeçalho já basta. Devolve (bytes lidos, truncado).
+    """
+    buffer = bytearray()
+    search_from = 0
+    head_checked = head_check is None
+    for chunk in resp.iter_content(chunk_size=settings.STREAM_CHUNK_SIZE):
+        if not chunk:
+            continue
+        buffer.extend(chunk)
+        if not head_checked:
+            position = bytes(buffer[search_from:]).lower().find(HEAD_CLOSE_TAG)
+            if position >= 0:
+                head_checked = True
+                head_end = search_from + position + len(HEAD_CLOSE_TAG)
+                head = bytes(buffer[:head_end])
+                if head_check(head, resp.encoding or chardet.detect(head)["encoding"]):
+                    return head, True
+            else:
+                # Mantém uma sobreposição para achar a tag dividida entre dois blocos
+                search_from = max(0, len(buffer) - len(HEAD_CLOSE_TAG))
+        if len(buffer) >= max_bytes:
+            return bytes(buffer[:max_bytes]), True
+    return bytes(buffer), False
+
+
+def _read_limited(resp, limit: int) -> bytes:
+    buffer = bytearray()
+    for chunk in resp.iter_content(chunk_size=settings.STREAM_CHUNK_SIZE):
+        if not chunk:
+            continue
+        buffer.extend(chunk[:limit - len(buffer)])
+        if len(buffer) >= limit:
+            break
+    return bytes(buffer)
+
+
+def _read_first_chunk(resp) -> bytes:
+    for chunk in resp.iter_content(chunk_size=settings.STREAM_CHUNK_SIZE):
+        if chunk:
+            return chunk
+    return b""
+
+
+def fetch_page(
+    url: str,
+    cache: Optional[PageCache] = None,
+    timeout: int = 15,
+    head_check: Optional[HeadCheck] = None,
+    max_bytes: Optional[int] = None,
+    scheduler: Optional[HostScheduler] = None,
+    breaker: Optional[CircuitBreaker] = None
+) -> FetchedPage:
+    """
+    Baixa uma página pela sessão compartilhada, em streaming. Com `cache`, envia um GET
+    condicional usando os validadores armazenados e reaproveita o corpo salvo quando o
+    servidor responde 304. Erros HTTP são levantados como `requests.exceptions.HTTPError`.
+
+    O corpo só é lido para HTML, nunca passa de `max_bytes` (`settings.MAX_PAGE_BYTES`)
+    e, com `head_check`, pode parar logo após </head>. Sem Content-Type, apenas o primeiro
+    bloco é lido. PDFs e outros tipos são identificados pelos cabeçalhos, sem baixar o arquivo.
+
+    Com `scheduler`, a requisição ocupa uma vaga e um token do host, e respostas 429/503
+    pausam o host pelo tempo pedido em Retry-After. Com `breaker`, hosts com o circuito
+    aberto não são contatados (`CircuitOpenError`) e cada resposta alimenta o disjuntor.
+    """
+    if breaker is None:
+        return _fetch(url, cache, timeout, head_check, max_bytes, scheduler)
+    host = extract_base(url)
+    if not breaker.allow(host):
+        raise CircuitOpenError(f"Circuito aberto para {host}; {url} não foi requisitada")
+    try:
+        page = _fetch(url, cache, timeout, head_check, max_bytes, scheduler)
+    except Exception as e:
+        if is_retryable_exception(e):
+            breaker.record_failure(host)
+        else:
+            breaker.record_success(host)
+        raise
+    breaker.record_success(host)
+    return page
+
+
+@timed("page_get")
+def _fetch(
+    url: str,
+    cache: Optional[PageCache],
+    timeout: int,
+    head_check: Optional[HeadCheck],
+    max_bytes: Optional[int],
+    scheduler: Optional[HostScheduler]
+) -> FetchedPage:
+    max_bytes = settings.MAX_PAGE_BYTES if max_bytes is None else max_bytes
+    cached = cache.get(url) if cache is not None else None
+    headers = cache.validators(cached) if cached is not None else {}
+
+    host = extract_base(url)
+    with scheduler.slot(host) if scheduler is not None else nullcontext():
+        resp = get_session().get(url, timeout=timeout, allow_redirects=True, headers=headers, stream=True)
+        metrics = get_metrics()
+        # Conexão + envio + cabeçalhos da resposta (o requests não separa DNS e conexão)
+        if isinstance(getattr(resp, "elapsed", None), timedelta):
+            metrics.observe("page_ttfb", resp.elapsed.total_seconds())
+        try:
+            if cached is not None and resp.status_code == 304:
+                cache.record_hit(cached)
+                metrics.inc("cache_requests", cache="pages", result="hit")
+                return FetchedPage(
+                    url=url,
+                    status_code=304,
+                    content_type=cached.content_type,
+                    content=cached.content,
+                    encoding=cached.encoding,
+                    from_cache=True,
+                    truncated=cached.truncated
+                )
+            if scheduler is not None and resp.status_code in (429, 503):
+                scheduler.penalize(host, parse_retry_after(resp.headers.get("Retry-After")))
+            resp.raise_for_status() # Levanta exceção para códigos de erro HTTP
+
+            content_type = resp.headers.get("Content-Type", "")
+            lowered_type = content_type.lower()
+            if "html" in lowered_type:
+                content, truncated = _read_body(resp, head_check, max_bytes)
+            elif not lowered_type:
+                # Sem Content-Type, o primeiro bloco basta para identificar o tipo pelos magic bytes
+                content, truncated = _read_first_chunk(resp), True
+            else:
+                content, truncated = b"", True
+        finally:
+            resp.close()
+
+    # Mesma regra de `Response.text`: charset do cabeçalho ou detecção pelo conteúdo
+    encoding = resp.encoding or (chardet.detect(content)["encoding"] if content else None)
+    metrics.inc("pages_fetched", domain=host)
+    metrics.inc("bytes_downloaded", len(content), domain=host)
+    if cache is not None:
+        cache.record_miss()
+        metrics.inc("cache_requests", cache="pages", result="miss")
+        cache.put(
+            url,
+            content_type=content_type,
+            encoding=encoding,
+            content=content,
+            etag=resp.headers.get("ETag", ""),
+            last_modified=resp.headers.get("Last-Modified", ""),
+            truncated=truncated
+        )
+    return FetchedPage(
+        url=url,
+        status_code=resp.status_code,
+        content_type=content_type,
+        content=content,
+        encoding=encoding,
+        truncated=truncated
+    )
+
+
+@dataclass
+class RangeResult:
+    content: bytes
+    # Posição de `content` no arquivo
+    start: int
+    # Tamanho total do arquivo, quando informado pelo servidor
+    total_size: Optional[int]
+    # O servidor atendeu o Range (206); com False, `content` é o início do arquivo
+    partial: bool
+
+
+def fetch_range(
+    url: str,
+    start: int,
+    end: Optional[int] = None,
+    timeout: int = 15,
+    scheduler: Optional[HostScheduler] = None,
+    max_bytes: Optional[int] = None
+) -> RangeResult:
+    """
+    Baixa só um trecho do arquivo com um GET `Range`: `bytes=start-end` ou, com `start`
+    negativo, os últimos `-start` bytes. Servidores que ignoram o Range respondem 200
+    com o arquivo inteiro; nesse caso só os primeiros `max_bytes` são lidos.
+    """
+    header = f"bytes={start}" if start < 0 else f"bytes={start}-{'' if end is None else end}"
+    wanted = -start if start < 0 else (None if end is None else end - start + 1)
+    limit = min(filter(None, (wanted, max_bytes or settings.MAX_PAGE_BYTES)))
+
+    host = extract_base(url)
+    with scheduler.slot(host) if scheduler is not None else nullcontext():
+        resp = get_session().get(url, timeout=timeout, allow_redirects=True, headers={"Range": header}, stream=True)
+        try:
+            if scheduler is not None and resp.status_code in (429, 503):
+                scheduler.penalize(host, parse_retry_after(resp.headers.get("Retry-After")))
+            if resp.status_code == 416:
+                # Trecho fora do arquivo
+                return RangeResult(content=b"", start=max(start, 0), total_size=None, partial=True)
+            resp.raise_for_status()
+            match = CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+            if resp.status_code == 206 and match:
+                content = _read_limited(resp, limit)
+                total = match.group(3)
+                result = RangeResult(content, int(match.group(1)), int(total) if total.isdigit() else None, True)
+            else:
+                length = resp.headers.get("Content-Length", "")
+                content = _read_limited(resp, max_bytes or limit)
+                result = RangeResult(content, 0, int(length) if length.isdigit() else None, False)
+        finally:
+            resp.close()
+
+    metrics = get_metrics()
+    metrics.inc("range_requests", domain=host)
+    metrics.inc("bytes_downloaded", len(result.content), domain=host)
+    return result
@@ -0,0 +1,169 @@
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from .models import SearchResult
+
+RUNS_DIR = os.path.join(os.path.dirname(__file__), "outputs", "runs")
+
+
+class RunJournal:
+    """
+    Diário durável de uma execução: cada resultado concluído é anexado (JSONL, um arquivo
+    por página da SerpAPI) e o estado (páginas concluídas, próximo offset) é regravado de
+    forma atômica. Permite retomar a execução com `--resume <run-id>` sem repetir chamadas
+    à API nem downloads, e exportar o CSV final sem manter os resultados em memória.
+    """
+
+    STATE_FILENAME = "state.json"
+
+    def __init__(self, run_id: str, state: Dict[str, Any], directory: Optional[str] = None):
+        self.run_id = run_id
+        self.state = state
+        self.path = os.path.join(directory or RUNS_DIR, run_id)
+        self._pages_dir = os.path.join(self.path, "pages")
+        self._open_page: Optional[int] = None
+        self._handle = None
+
+    @classmethod
+    def create(cls, engine: str, engine_name: str, query: str, pages: int, results_per_page: int,
+               directory: Optional[str] = None) -> "RunJournal":
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{engine_name}_{uuid.uuid4().hex[:6]}"
+        state = {
+            "run_id": run_id,
+            "engine": engine,
+            "engine_name": engine_name,
+            "query": query,
+            "pages": pages,
+            "results_per_page": results_per_page,
+            "completed_pages": [],
+            "next_start": 0,
+            "csv_path": None,
+            # Em microssegundos: as execuções de um lote, criadas no mesmo segundo, mantêm a ordem
+            "created_at": datetime.now().isoformat(timespec="microseconds")
+        }
+        journal = cls(run_id, state, directory)
+        os.makedirs(journal._pages_dir, exist_ok=True)
+        journal._save_state()
+        return journal
+
+    @classmethod
+    def open(cls, run_id: str, directory: Optional[str] = None) -> "RunJournal":
+        state_path = os.path.join(directory or RUNS_DIR, run_id, cls.STATE_FILENAME)
+        if not os.path.exists(state_path):
+            raise FileNotFoundError(f"Execução '{run_id}' não encontrada em {os.path.dirname(state_path)}")
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return cls(run_id, state, directory)
+
+    def _save_state(self) -> None:
+        state_path = os.path.join(self.path, self.STATE_FILENAME)
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, state_path)
+
+    def _page_path(self, page: int) -> str:
+        return os.path.join(self._pages_dir, f"page_{page:04d}.jsonl")
+
+    def is_page_done(self, page: int) -> bool:
+        return page in self.state["completed_pages"]
+
+    def page_entries(self, page: int) -> Dict[int, SearchResult]:
+        """
+        Resultados já registrados de uma página, indexados pela posição na lista orgânica.
+        Se uma posição foi registrada mais de uma vez (nova tentativa), vale a última.
+        """
+        return {position: result for position, (result, _) in self.page_records(page).items()}
+
+    def page_records(self, page: int) -> Dict[int, Tuple[SearchResult, Optional[float]]]:
+        """
+        Como `page_entries`, com o instante (epoch) em que o documento foi baixado quando o
+        resultado foi reaproveitado de uma execução anterior (modo incremental); `None`
+        para os baixados nesta execução.
+        """
+        path = self._page_path(page)
+        records: Dict[int, Tuple[SearchResult, Optional[float]]] = {}
+        if not os.path.exists(path):
+            return records
+        if self._open_page == page:
+            self._handle.flush()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    records[entry["position"]] = (SearchResult(**entry["result"]), entry.get("fetched_at"))
+                except (ValueError, KeyError, TypeError):
+                    # Linha incompleta de uma interrupção no meio da escrita
+                    continue
+        return records
+
+    def done_positions(self, page: int) -> Set[int]:
+        """
+        Posições (na lista de resultados orgânicos) já registradas para uma página parcial.
+        """
+        return set(self.page_entries(page))
+
+    def append(self, page: int, position: int, result: SearchResult, fetched_at: Optional[float] = None) -> None:
+        """
+        Anexa um resultado concluído ao diário da página (gravado imediatamente no disco).
+        `fetched_at` acompanha os resultados reaproveitados de execuções anteriores.
+        """
+        if self._open_page != page:
+            self._close_handle()
+            self._handle = open(self._page_path(page), "a", encoding="utf-8")
+            self._open_page = page
+        entry: Dict[str, Any] = {"position": position, "result": result.to_dict()}
+        if fetched_at is not None:
+            entry["fetched_at"] = fetched_at
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def complete_page(self, page: int) -> None:
+        """
+        Marca a página como concluída e registra o próximo offset da SerpAPI a buscar.
+        """
+        if self._handle is not None and self._open_page == page:
+            os.fsync(self._handle.fileno())
+            self._close_handle()
+        completed = set(self.state["completed_pages"])
+        completed.add(page)
+        self.state["completed_pages"] = sorted(completed)
+        pending = [p for p in range(self.state["pages"]) if p not in completed]
+        self.state["next_start"] = pending[0] * self.state["results_per_page"] if pending else None
+        self._save_state()
+
+    def mark_exhausted(self, page: int) -> None:
+        """
+        Registra que a busca não tem resultados além de `page`: as páginas seguintes
+        deixam de existir no plano da execução (inclusive ao retomar).
+        """
+        self.state["pages"] = min(self.state["pages"], page + 1)
+        self.complete_page(page)
+
+    def iter_results(self) -> Iterator[SearchResult]:
+        """
+        Percorre os resultados registrados, página a página e na ordem original.
+        """
+        self._close_handle()
+        for page in range(self.state["pages"]):
+            entries = self.page_entries(page)
+            for position in sorted(entries):
+                yield entries[position]
+
+    def finish(self, csv_path: str) -> None:
+        self.state["csv_path"] = csv_path
+        self._save_state()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._open_page = None
+
+    def close(self) -> None:
+        self._close_handle()
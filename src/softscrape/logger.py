@@ -1,6 +1,16 @@
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from .config import settings
 
 CURRENT_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -13,37 +23,238 @@ LOG_DIR_PATH = os.path.join(LOG_OUTPUT_PARENT_DIR, OUTPUT_DIR_NAME)
 ERROR_LOG_DIR = os.path.join(LOG_DIR_PATH, ERROR_DIR_NAME)
 ERROR_LOG_FILE_PATH = os.path.join(ERROR_LOG_DIR, ERROR_LOG_FILENAME)
 
-os.makedirs(ERROR_LOG_DIR, exist_ok=True)
-
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 
-error_file_handler = logging.FileHandler(ERROR_LOG_FILE_PATH)
-error_file_handler.setLevel(logging.ERROR)
-error_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+class LazyFileHandler(logging.FileHandler):
+    """
+    FileHandler que só cria o diretório e abre o arquivo no primeiro registro emitido,
+    para que importar o pacote não tenha efeitos no disco.
+    """
+
+    def __init__(self, filename: str, mode: str = "a", encoding: str = None):
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Um objeto JSON por linha (horário, nível, logger, thread, mensagem e, quando
+    houver, o domínio e a exceção), para consumo por ferramentas de log estruturado.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        domain = getattr(record, "domain", None)
+        if domain:
+            entry["domain"] = domain
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DomainRateLimitFilter(logging.Filter):
+    """
+    Limita os avisos repetidos de um mesmo domínio (registros com `extra={"domain": ...}`)
+    a `limit` por janela de `window` segundos. Os descartados são contados e informados
+    no próximo aviso aceito do domínio.
+    """
+
+    def __init__(self, limit: int, window: float, clock=time.monotonic):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        # domínio -> (início da janela, avisos emitidos, avisos suprimidos)
+        self._domains: Dict[str, Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        domain = getattr(record, "domain", None)
+        if not domain or record.levelno != logging.WARNING or self.limit <= 0:
+            return True
+        now = self._clock()
+        with self._lock:
+            started, emitted, suppressed = self._domains.get(domain, (now, 0, 0))
+            if now - started >= self.window:
+                started, emitted = now, 0
+            if emitted >= self.limit:
+                self._domains[domain] = (started, emitted, suppressed + 1)
+                return False
+            self._domains[domain] = (started, emitted + 1, 0)
+        if suppressed:
+            # Raro (uma vez por janela): a mensagem é montada aqui para anexar a contagem
+            record.msg = f"{record.getMessage()} (+{suppressed} avisos semelhantes de {domain} suprimidos)"
+            record.args = None
+        return True
+
+    def drain_suppressed(self) -> Dict[str, int]:
+        """
+        Avisos ainda não informados, por domínio (zerando as contagens).
+        """
+        with self._lock:
+            pending = {domain: suppressed for domain, (_, _, suppressed) in self._domains.items() if suppressed}
+            self._domains.clear()
+        return pending
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    Só enfileira o registro: a mensagem (`%`) é montada e formatada na thread do
+    listener, fora do laço de download. A fila é local ao processo, então o registro
+    não precisa ser preparado para serialização.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # O listener só sobe com o primeiro registro: importar o pacote não cria threads
+        if not _listener_started:
+            _start_listener()
+        super().emit(record)
+
+
+class _FlushRequest:
+    """
+    Marcador posto na fila por `flush_logging`: o listener o sinaliza quando chega a ele,
+    ou seja, depois de gravar tudo o que foi enfileirado antes.
+    """
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _FlushingQueueListener(QueueListener):
+    """
+    QueueListener que reconhece os marcadores de `flush_logging`.
+    """
+
+    def handle(self, record) -> None:
+        if isinstance(record, _FlushRequest):
+            record.done.set()
+            return
+        super().handle(record)
+
+
+# Tempo máximo de espera de `flush_logging` pelo listener (s)
+FLUSH_TIMEOUT_SEC = 5.0
+
+console_handler = None
+error_file_handler = None
+jsonl_handler = None
+queue_handler = None
+listener: Optional[QueueListener] = None
 
 _handlers_configured = False
+_listener_started = False
+_listener_lock = threading.Lock()
 
-def get_logger(name: str) -> logging.Logger:
-    global _handlers_configured
+def _install_handlers() -> None:
+    """
+    Instala no logger raiz, uma única vez, um QueueHandler não bloqueante; a escrita no
+    console, no arquivo de erros e (opcionalmente) no log JSONL fica com um QueueListener
+    numa thread própria, então nenhuma thread de trabalho espera por E/S de log. A thread
+    só é iniciada no primeiro registro emitido (ou por `configure_logging`).
+    """
+    global _handlers_configured, console_handler, error_file_handler, jsonl_handler, queue_handler, listener
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    if _handlers_configured:
+        return
+
+    if console_handler is None:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if error_file_handler is None:
+        error_file_handler = LazyFileHandler(ERROR_LOG_FILE_PATH)
+        error_file_handler.setLevel(logging.ERROR)
+        error_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers = [console_handler, error_file_handler]
+    if settings.LOG_JSONL_PATH:
+        if jsonl_handler is None:
+            jsonl_handler = LazyFileHandler(settings.LOG_JSONL_PATH)
+            jsonl_handler.setLevel(logging.INFO)
+            jsonl_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(jsonl_handler)
 
-    if not _handlers_configured:
-        root_logger = logging.getLogger()
-        root_logger.setLevel(logging.INFO)
+    if queue_handler is None:
+        queue_handler = _LocalQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(DomainRateLimitFilter(settings.LOG_DOMAIN_WARNING_LIMIT, settings.LOG_DOMAIN_WARNING_WINDOW_SEC))
+    if listener is None:
+        listener = _FlushingQueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
 
-        # Ensure our specific handlers are on the root logger.
-        # The logging module handles duplicates gracefully (won't add if already present).
-        if console_handler not in root_logger.handlers:
-            root_logger.addHandler(console_handler)
-        if error_file_handler not in root_logger.handlers:
-            root_logger.addHandler(error_file_handler)
-        
-        _handlers_configured = True
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    if queue_handler not in root_logger.handlers:
+        root_logger.addHandler(queue_handler)
 
+    _handlers_configured = True
+
+def _start_listener() -> None:
+    global _listener_started
+    with _listener_lock:
+        if _listener_started or listener is None:
+            return
+        listener.start()
+        _listener_started = True
+
+def configure_logging() -> None:
+    """
+    Instala os handlers e já inicia a thread do listener (chamado pelo ponto de entrada).
+    """
+    _install_handlers()
+    _start_listener()
+
+def flush_logging() -> None:
+    """
+    Espera o listener gravar tudo o que já foi enfileirado.
+    """
+    if _listener_started:
+        request = _FlushRequest()
+        listener.queue.put_nowait(request)
+        request.done.wait(FLUSH_TIMEOUT_SEC)
+    for handler in (console_handler, error_file_handler, jsonl_handler):
+        if handler is not None:
+            handler.flush()
+
+def shutdown_logging() -> None:
+    """
+    Esvazia a fila e encerra a thread do listener (registrado para o fim do processo).
+    """
+    global listener, queue_handler, _handlers_configured, _listener_started
+    if queue_handler is not None:
+        for rate_filter in queue_handler.filters:
+            if isinstance(rate_filter, DomainRateLimitFilter):
+                for domain, suppressed in rate_filter.drain_suppressed().items():
+                    logging.getLogger("Logger").warning("%d avisos de %s foram suprimidos.", suppressed, domain)
+    if _listener_started:
+        listener.stop()
+    for handler in (console_handler, error_file_handler, jsonl_handler):
+        if handler is not None:
+            # Arquivos voltam a ser abertos sob demanda no próximo registro
+            handler.close()
+    if queue_handler is not None:
+        logging.getLogger().removeHandler(queue_handler)
+    listener = None
+    queue_handler = None
+    _handlers_configured = False
+    _listener_started = False
+
+atexit.register(shutdown_logging)
+
+def get_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    _install_handlers()
     return logger
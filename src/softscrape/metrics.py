@@ -0,0 +1,233 @@
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Limites superiores (segundos) dos buckets dos histogramas de tempo
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+PROMETHEUS_PREFIX = "softscrape"
+
+# Série de um contador: pares (rótulo, valor) ordenados
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Histograma de buckets fixos: memória constante por estágio, qualquer que seja o
+    número de observações. Os percentis são estimados por interpolação dentro do bucket.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                # Os extremos observados estreitam o intervalo do bucket
+                lower = max(self.buckets[index - 1] if index > 0 else 0.0, self.min)
+                upper = min(self.buckets[index] if index < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_sec": round(self.sum, 6),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class RunMetrics:
+    """
+    Métricas de uma execução: histogramas de tempo por estágio (busca na SerpAPI, GET
+    das páginas, parse, cada extrator, exportação) e contadores com rótulos (bytes
+    baixados e erros por domínio, acertos de cache). Thread-safe.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started_at = time.time()
+        self._started = clock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(stage, self._clock() - started)
+
+    def histogram(self, stage: str) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(stage)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """
+        Valor de um contador; sem rótulos, a soma de todas as séries.
+        """
+        with self._lock:
+            series = self._counters.get(name, {})
+            if not labels:
+                return sum(series.values())
+            return series.get(tuple(sorted(labels.items())), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Resumo serializável: percentis por estágio e contadores (total e por série).
+        """
+        with self._lock:
+            stages = {stage: histogram.summary() for stage, histogram in sorted(self._histograms.items())}
+            counters = {
+                name: {
+                    "total": sum(series.values()),
+                    "series": [dict(labels, value=value) for labels, value in sorted(series.items())]
+                }
+                for name, series in sorted(self._counters.items())
+            }
+        return {
+            "started_at": self.started_at,
+            "elapsed_sec": round(self._clock() - self._started, 3),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def write_json(self, path: str, **extra: Any) -> str:
+        report = dict(extra, **self.snapshot())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+    def prometheus_text(self) -> str:
+        """
+        Métricas no formato texto do Prometheus (para o textfile collector do node_exporter).
+        """
+        lines: List[str] = []
+        with self._lock:
+            stage_metric = f"{PROMETHEUS_PREFIX}_stage_seconds"
+            lines += [f"# HELP {stage_metric} Tempo por chamada de cada estágio.", f"# TYPE {stage_metric} histogram"]
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{stage_metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{stage_metric}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{stage_metric}_count{{stage="{stage}"}} {histogram.count}')
+            for name, series in sorted(self._counters.items()):
+                metric = f"{PROMETHEUS_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(series.items()):
+                    rendered = ",".join(f'{label}="{_escape(str(text))}"' for label, text in labels)
+                    lines.append(f"{metric}{{{rendered}}} {value}" if rendered else f"{metric} {value}")
+        lines += [
+            f"# TYPE {PROMETHEUS_PREFIX}_run_duration_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_run_duration_seconds {self._clock() - self._started}",
+            f"# TYPE {PROMETHEUS_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_last_run_timestamp_seconds {time.time()}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> str:
+        # Escrita atômica: o collector nunca lê um arquivo pela metade
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+_metrics = RunMetrics()
+
+
+def get_metrics() -> RunMetrics:
+    """
+    Métricas da execução corrente, compartilhadas por todas as threads do processo.
+    """
+    return _metrics
+
+
+def reset_metrics() -> RunMetrics:
+    """
+    Inicia um novo conjunto de métricas (chamado no início de cada execução).
+    """
+    global _metrics
+    _metrics = RunMetrics()
+    return _metrics
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """
+    Decorador que registra a duração de cada chamada no histograma de `stage`.
+    """
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _metrics.observe(stage, time.perf_counter() - started)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def metrics_path_for(output_path: str) -> str:
+    """
+    Caminho do resumo ao lado do arquivo exportado: `resultados_..._<ts>.metrics.json`.
+    """
+    directory, name = os.path.split(output_path)
+    for suffix in (".gz", ".zst"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return os.path.join(directory, f"{os.path.splitext(name)[0]}.metrics.json")
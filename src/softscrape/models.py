@@ -1,7 +1,33 @@
+import sys
+from array import array
 from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-@dataclass
+# Ordem estável dos campos: colunas dos arquivos exportados, da base local e do diário
+FIELD_NAMES = ("title", "author", "abstract", "source", "year", "doc_type", "base", "link")
+# Campos de baixa cardinalidade (poucos valores distintos por varredura): internados em
+# `SearchResult` e codificados por dicionário em `ResultBatch`
+INTERNED_FIELDS = ("source", "year", "doc_type", "base")
+
+Row = Tuple[str, ...]
+
+# Typecode de inteiro sem sinal de 4 bytes (o tamanho de "I" e "L" depende da plataforma):
+# os códigos de `ResultBatch` são lidos pelo pyarrow como `uint32`
+CODE_TYPECODE = next((typecode for typecode in ("I", "L") if array(typecode).itemsize == 4), None)
+if CODE_TYPECODE is None:
+    raise ImportError("Nenhum typecode de array com 4 bytes sem sinal nesta plataforma.")
+
+
+@dataclass(frozen=True)
 class SearchResult:
+    """
+    Um resultado exportado. Imutável e sem `__dict__` (slots): em varreduras de centenas de
+    milhares de resultados, cada instância ocupa só os ponteiros dos campos, e os valores
+    de baixa cardinalidade (`INTERNED_FIELDS`) são compartilhados entre as instâncias.
+    Para alterar campos, use `dataclasses.replace`.
+    """
+    __slots__ = FIELD_NAMES
+
     title: str
     author: str
     abstract: str
@@ -9,4 +35,108 @@ class SearchResult:
     year: str
     doc_type: str
     base: str
-    link: str
\ No newline at end of file
+    link: str
+
+    def __post_init__(self):
+        for name in INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                object.__setattr__(self, name, sys.intern(value))
+
+    def __reduce__(self):
+        # Instâncias imutáveis com slots não se restauram atributo a atributo (pickle/copy)
+        return (SearchResult, self.to_row())
+
+    def to_row(self) -> Row:
+        """
+        Valores na ordem de `FIELD_NAMES`.
+        """
+        return (self.title, self.author, self.abstract, self.source, self.year, self.doc_type, self.base, self.link)
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Dicionário na ordem de `FIELD_NAMES` (mesmo conteúdo de `dataclasses.asdict`, sem cópia recursiva).
+        """
+        return dict(zip(FIELD_NAMES, self.to_row()))
+
+
+class ResultBatch:
+    """
+    Lote colunar de resultados, para manter ou exportar muitos resultados sem um objeto por
+    linha. Os campos de baixa cardinalidade são codificados por dicionário (um `array` de
+    códigos de 4 bytes por linha e a lista de valores distintos); os demais ficam em listas
+    de strings. Os exportadores consomem o lote diretamente (`ResultSink.write_batch`) e
+    `to_arrow` o converte numa tabela do pyarrow (opcional) sem passar por `SearchResult`.
+    """
+
+    def __init__(self, results: Iterable[SearchResult] = ()):
+        self._columns: Dict[str, List[str]] = {name: [] for name in FIELD_NAMES if name not in INTERNED_FIELDS}
+        self._codes: Dict[str, array] = {name: array(CODE_TYPECODE) for name in INTERNED_FIELDS}
+        self._values: Dict[str, List[str]] = {name: [] for name in INTERNED_FIELDS}
+        self._lookup: Dict[str, Dict[str, int]] = {name: {} for name in INTERNED_FIELDS}
+        self._size = 0
+        self.extend(results)
+
+    def append_row(self, row: Row) -> None:
+        """
+        Acrescenta uma linha com os valores na ordem de `FIELD_NAMES`.
+        """
+        for name, value in zip(FIELD_NAMES, row):
+            lookup = self._lookup.get(name)
+            if lookup is None:
+                self._columns[name].append(value)
+                continue
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self._values[name])
+                self._values[name].append(value)
+            self._codes[name].append(code)
+        self._size += 1
+
+    def append(self, result: SearchResult) -> None:
+        self.append_row(result.to_row())
+
+    def extend(self, results: Iterable[SearchResult]) -> None:
+        for result in results:
+            self.append_row(result.to_row())
+
+    def column(self, name: str) -> List[str]:
+        """
+        Valores de uma coluna, um por linha.
+        """
+        if name in self._codes:
+            values = self._values[name]
+            return [values[code] for code in self._codes[name]]
+        return list(self._columns[name])
+
+    def rows(self) -> Iterator[Row]:
+        return zip(*(self.column(name) for name in FIELD_NAMES))
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        for row in self.rows():
+            yield SearchResult(*row)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def to_arrow(self, schema: Optional[Any] = None) -> Any:
+        """
+        Tabela do pyarrow com uma coluna por campo; os campos de baixa cardinalidade viram
+        colunas de dicionário (os mesmos códigos e valores do lote, sem decodificar). Com
+        `schema`, a tabela é convertida para ele (ex.: todas as colunas como `string`).
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("A conversão para Arrow requer o pacote opcional pyarrow (pip install pyarrow).") from e
+        arrays = []
+        for name in FIELD_NAMES:
+            if name in self._codes:
+                codes = self._codes[name]
+                # Os códigos são lidos do buffer do `array`, sem cópia elemento a elemento
+                indices = pa.Array.from_buffers(pa.uint32(), len(codes), [None, pa.py_buffer(codes)])
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(self._values[name], type=pa.string())))
+            else:
+                arrays.append(pa.array(self._columns[name], type=pa.string()))
+        table = pa.Table.from_arrays(arrays, names=list(FIELD_NAMES))
+        return table.cast(schema) if schema is not None else table
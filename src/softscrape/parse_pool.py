@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple, Union
+
+from .config import settings
+from .extractors import preload_date_extractor
+from .logger import get_logger
+
+_log = get_logger("ParsePool")
+
+# Documento grande: (nome do segmento de memória compartilhada, tamanho em bytes)
+SharedDocument = Tuple[str, int]
+
+
+def default_workers() -> int:
+    """
+    Processos de parse pelo número de núcleos, deixando um livre para as threads de download.
+    """
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _read_shared(document: SharedDocument) -> bytes:
+    name, size = document
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        if sys.version_info < (3, 13):
+            # Antes do 3.13, anexar registra o segmento no resource tracker, que o apagaria
+            # (e avisaria de "vazamento") ao fim do worker; quem cria o segmento é o pai
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, "shared_memory")
+        return bytes(segment.buf[:size])
+    finally:
+        segment.close()
+
+
+def extract_fields(document: Union[bytes, SharedDocument], encoding: Optional[str], url: str, backend: str) -> Tuple[str, str, str]:
+    """
+    Executado no processo de parse: decodifica o documento, monta o índice com o backend
+    pedido e devolve (autor, resumo, ano). Documentos grandes chegam por memória compartilhada.
+    """
+    from .extractors import extract_abstract, extract_author, extract_page_year
+    from .parsers import parse_html
+
+    content = document if isinstance(document, bytes) else _read_shared(document)
+    try:
+        index = parse_html(content.decode(encoding or "utf-8", errors="replace"), backend=backend)
+        return extract_author(index), extract_abstract(index), extract_page_year(index)
+    except Exception as e:
+        # A exceção volta ao processo principal; a URL identifica o documento no log
+        raise RuntimeError(f"Falha no parse de {url}: {e}") from e
+
+
+class ParsePool:
+    """
+    Estágio de parse em processos separados, para que o BeautifulSoup e os extratores
+    usem todos os núcleos em vez de disputar o GIL com as threads de download.
+
+    Entre os dois estágios há uma fila limitada (`queue_size` documentos em parse ou
+    aguardando): quando ela enche, a thread de download que chama `extract` espera,
+    segurando o ritmo dos downloads. Documentos a partir de `shm_threshold` bytes são
+    copiados uma única vez para memória compartilhada e o worker lê dali; só o nome do
+    segmento é serializado, em vez de o corpo ser enviado por pickle ao processo.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        shm_threshold: Optional[int] = None,
+        backend: Optional[str] = None
+    ):
+        self.workers = workers or settings.PARSE_WORKERS or default_workers()
+        self.queue_size = queue_size or settings.PARSE_QUEUE_SIZE or 2 * self.workers
+        self.shm_threshold = settings.PARSE_SHM_THRESHOLD if shm_threshold is None else shm_threshold
+        self.backend = backend or settings.HTML_PARSER
+        # spawn: processos limpos, sem herdar locks das threads de download (fork + threads);
+        # cada worker já sobe com o htmldate importado, como o processo principal
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=preload_date_extractor
+        )
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        _log.info("Parse em %d processos (fila de %d documentos).", self.workers, self.queue_size)
+
+    def submit(self, content: bytes, encoding: Optional[str], url: str) -> "Future[Tuple[str, str, str]]":
+        """
+        Envia um documento ao estágio de parse, bloqueando enquanto a fila estiver cheia.
+        """
+        self._slots.acquire()
+        segment = None
+        try:
+            document: Union[bytes, SharedDocument] = content
+            if self.shm_threshold and len(content) >= self.shm_threshold:
+                segment = shared_memory.SharedMemory(create=True, size=len(content))
+                segment.buf[:len(content)] = content
+                document = (segment.name, len(content))
+            future = self._executor.submit(extract_fields, document, encoding, url, self.backend)
+        except BaseException:
+            self._release(segment)
+            raise
+        future.add_done_callback(lambda _: self._release(segment))
+        return future
+
+    def _release(self, segment: Optional[shared_memory.SharedMemory]) -> None:
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+        self._slots.release()
+
+    def extract(self, content: bytes, encoding: Optional[str], url: str) -> Tuple[str, str, str]:
+        """
+        (autor, resumo, ano) do documento, extraídos num processo de parse.
+        """
+        return self.submit(content, encoding, url).result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,136 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .config import settings
+from .extractors import JSON_LD_MAX_SCRIPTS, MetadataIndex, META_INDEX_ATTRS, _is_json_ld
+from .metrics import timed
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+# Tags cujo texto o BeautifulSoup não devolve em get_text() (Script, Stylesheet, TemplateString, RubyText...)
+_NON_TEXT_CONTAINERS = {"script", "style", "template", "rt", "rp"}
+
+
+class LexborNode:
+    """
+    Adaptador mínimo de um nó do selectolax (lexbor) com a interface de `bs4.Tag`
+    usada pelos extratores: `name`, `get`, `[]` e `get_text`.
+    """
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any):
+        self._node = node
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    def get(self, attr: str, default: Any = None) -> Any:
+        attributes = self._node.attributes
+        if attr not in attributes:
+            return default
+        value = attributes[attr]
+        return "" if value is None else value
+
+    def __getitem__(self, attr: str) -> str:
+        value = self.get(attr)
+        if value is None:
+            raise KeyError(attr)
+        return value
+
+    def _strings(self) -> Iterator[str]:
+        for child in self._node.traverse(include_text=True):
+            if child.tag == "-text" and child.parent is not None and child.parent.tag not in _NON_TEXT_CONTAINERS:
+                yield child.text_content or ""
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        if strip:
+            return separator.join(text.strip() for text in self._strings() if text.strip())
+        return separator.join(self._strings())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LexborNode) and self._node.mem_id == other._node.mem_id
+
+    def __hash__(self) -> int:
+        return hash(self._node.mem_id)
+
+
+class LexborMetadataIndex:
+    """
+    Equivalente do `MetadataIndex` sobre uma árvore do selectolax/lexbor, para que
+    `extract_author`/`extract_abstract`/`extract_page_year` rodem sem construir um
+    BeautifulSoup. Sem árvore do lxml, o ano não passa pelas heurísticas do htmldate.
+    """
+
+    def __init__(self, tree: Any):
+        self.tree = tree
+        self._metas: Dict[Tuple[str, str], LexborNode] = {}
+        for node in tree.css("meta"):
+            attributes = node.attributes
+            for attr in META_INDEX_ATTRS:
+                value = attributes.get(attr)
+                if value is not None and (attr, value) not in self._metas:
+                    self._metas[(attr, value)] = LexborNode(node)
+        self._matches: Dict[str, List[LexborNode]] = {}
+
+    def meta(self, attrs: Dict[str, str]) -> Optional[LexborNode]:
+        ((attr, value),) = attrs.items()
+        return self._metas.get((attr, value))
+
+    def select(self, selector: str) -> List[LexborNode]:
+        if selector not in self._matches:
+            self._matches[selector] = [LexborNode(node) for node in self.tree.css(selector)]
+        return self._matches[selector]
+
+    def json_ld(self) -> List[str]:
+        # Mesmo critério do MetadataIndex: prefixo do tipo, sem distinção de maiúsculas
+        scripts = [node for node in self.tree.css("script[type]") if _is_json_ld(node.attributes.get("type"))]
+        return [node.text(deep=True) or "" for node in scripts[:JSON_LD_MAX_SCRIPTS]]
+
+    def select_one(self, selector: str) -> Optional[LexborNode]:
+        if selector in self._matches:
+            matches = self._matches[selector]
+            return matches[0] if matches else None
+        node = self.tree.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+
+def _lexbor_parser() -> Any:
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError as e:
+        raise ImportError("O backend 'selectolax' requer o pacote opcional selectolax (pip install selectolax).") from e
+    return LexborHTMLParser
+
+
+@timed("parse")
+def parse_html(html: Union[str, bytes], backend: Optional[str] = None) -> Union[MetadataIndex, LexborMetadataIndex]:
+    """
+    Faz o parse do documento com o backend escolhido (`settings.HTML_PARSER` por padrão)
+    e devolve o índice de metadados consumido pelos extratores.
+    """
+    backend = backend or settings.HTML_PARSER
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend de parser desconhecido: '{backend}'. Opções: {', '.join(PARSER_BACKENDS)}")
+    if backend == "selectolax":
+        return LexborMetadataIndex(_lexbor_parser()(html))
+    from bs4 import BeautifulSoup
+    return MetadataIndex(BeautifulSoup(html, backend))
+
+
+def available_backends() -> List[str]:
+    """
+    Backends utilizáveis no ambiente atual (lxml e selectolax são opcionais).
+    """
+    backends = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        backends.append("lxml")
+    except ImportError:
+        pass
+    try:
+        _lexbor_parser()
+        backends.append("selectolax")
+    except ImportError:
+        pass
+    return backends
@@ -0,0 +1,649 @@
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from .config import settings
+from .fetcher import fetch_range
+from .logger import get_logger
+from .metrics import timed
+from .scheduler import HostScheduler
+
+_log = get_logger("PdfMetadata")
+
+WHITESPACE = b" \t\r\n\f\x00"
+DELIMITERS = b"()<>[]{}/%"
+OBJECT_HEADER = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+PDF_DATE_YEAR = re.compile(r"^(?:D:)?((?:19|20)\d{2})")
+YEAR = re.compile(r"\b((?:19|20)\d{2})\b")
+ABSTRACT_MARKER = re.compile(r"\b(?:abstract|resumo|summary)\b[\s.:—-]*", re.IGNORECASE)
+# Campos do XMP com a data de publicação, em ordem de preferência
+XMP_YEAR_TAGS = ("prism:publicationDate", "prism:coverDate", "dc:date")
+# Data de criação do arquivo: só um último recurso para o ano (ver `PdfMetadata.creation_year`)
+XMP_CREATION_TAGS = ("xmp:CreateDate",)
+
+
+class Ref(NamedTuple):
+    num: int
+    gen: int
+
+
+class Name(str):
+    """
+    Nome PDF (`/Author`), distinto das strings, que são lidas como `bytes`.
+    """
+
+
+class PdfError(ValueError):
+    """
+    Estrutura do PDF não reconhecida (ou fora do que este leitor suporta).
+    """
+
+
+class ByteBudgetExceeded(Exception):
+    """
+    O próximo trecho passaria do orçamento de bytes do documento.
+    """
+
+
+@dataclass
+class PdfMetadata:
+    """
+    `year` vem só de datas de publicação (XMP); `creation_year` é o ano de criação do
+    arquivo (`/CreationDate` do Info ou `xmp:CreateDate`), que pode ser bem posterior à
+    publicação e só deve ser usado quando não houver outra fonte para o ano.
+    """
+    title: str = ""
+    author: str = ""
+    year: str = ""
+    abstract: str = ""
+    creation_year: str = ""
+
+
+class RangeReader:
+    """
+    Acesso aleatório a um PDF remoto por requisições Range, com orçamento de bytes.
+    Trechos já baixados são reaproveitados; se o servidor ignorar o Range, o início
+    do arquivo (até o orçamento) é baixado uma vez e as leituras são atendidas dele.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        budget: Optional[int] = None,
+        block_size: Optional[int] = None,
+        timeout: int = 15,
+        scheduler: Optional[HostScheduler] = None
+    ):
+        self.url = url
+        self.budget = budget or settings.PDF_BYTE_BUDGET
+        self.block_size = block_size or settings.PDF_RANGE_BLOCK
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.used = 0
+        self.size: Optional[int] = None
+        self.ranges_supported = True
+        self._segments: List[Tuple[int, bytes]] = []
+
+    def _fetch(self, start: int, end: Optional[int] = None) -> bytes:
+        remaining = self.budget - self.used
+        wanted = -start if start < 0 else (None if end is None else end - start + 1)
+        if remaining <= 0 or (wanted is not None and wanted > remaining):
+            raise ByteBudgetExceeded(f"{self.url}: orçamento de {self.budget} bytes esgotado")
+        result = fetch_range(self.url, start, end, timeout=self.timeout, scheduler=self.scheduler, max_bytes=remaining)
+        self.used += len(result.content)
+        if result.total_size is not None:
+            self.size = result.total_size
+        if not result.partial:
+            # Sem suporte a Range: só o início do arquivo está disponível
+            self.ranges_supported = False
+            if self.size is None and len(result.content) < remaining:
+                self.size = len(result.content)
+        self._segments.append((result.start, result.content))
+        return result.content
+
+    def tail(self, length: int) -> Tuple[int, bytes]:
+        """
+        Os últimos `length` bytes e a posição em que começam.
+        """
+        content = self._fetch(-length)
+        if not self.ranges_supported:
+            if self.size is None:
+                raise PdfError(f"{self.url}: servidor sem Range e arquivo maior que o orçamento")
+            return 0, content
+        return (self.size or len(content)) - len(content), content
+
+    def read(self, start: int, length: int) -> bytes:
+        if self.size is not None:
+            length = min(length, self.size - start)
+        if length <= 0:
+            return b""
+        for segment_start, data in self._segments:
+            if segment_start <= start and start + length <= segment_start + len(data):
+                offset = start - segment_start
+                return data[offset:offset + length]
+        if not self.ranges_supported:
+            raise ByteBudgetExceeded(f"{self.url}: trecho {start} fora do início já baixado")
+        # Blocos alinhados: leituras vizinhas (objeto e seu stream) caem no mesmo download
+        block_start = start - start % self.block_size
+        block_end = max(start + length, block_start + self.block_size) - 1
+        if self.size is not None:
+            block_end = min(block_end, self.size - 1)
+        data = self._fetch(block_start, block_end)
+        return data[start - block_start:start - block_start + length]
+
+    def loaded(self) -> List[Tuple[int, bytes]]:
+        return list(self._segments)
+
+
+def _skip_whitespace(data: bytes, pos: int) -> int:
+    while pos < len(data):
+        char = data[pos:pos + 1]
+        if char == b"%":
+            end = data.find(b"\n", pos)
+            pos = len(data) if end < 0 else end + 1
+        elif char in WHITESPACE:
+            pos += 1
+        else:
+            break
+    return pos
+
+
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+def _parse_literal_string(data: bytes, pos: int) -> Tuple[bytes, int]:
+    out = bytearray()
+    depth = 1
+    pos += 1
+    while pos < len(data):
+        char = data[pos:pos + 1]
+        if char == b"\\":
+            following = data[pos + 1:pos + 2]
+            if following in _ESCAPES:
+                out += _ESCAPES[following]
+                pos += 2
+            elif following.isdigit():
+                digits = re.match(rb"[0-7]{1,3}", data[pos + 1:pos + 4]).group(0)
+                out.append(int(digits, 8) & 0xFF)
+                pos += 1 + len(digits)
+            elif following in (b"\r", b"\n"):
+                # Barra no fim da linha: a string continua na linha seguinte
+                pos += 3 if data[pos + 1:pos + 3] == b"\r\n" else 2
+            else:
+                out += following
+                pos += 2
+            continue
+        if char == b"(":
+            depth += 1
+        elif char == b")":
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+        out += char
+        pos += 1
+    raise PdfError("string literal sem fechamento")
+
+
+def parse_value(data: bytes, pos: int = 0) -> Tuple[Any, int]:
+    """
+    Lê um objeto PDF a partir de `pos`: dicionário, array, string (bytes), nome,
+    número, referência indireta (`Ref`), booleano ou null. Devolve (valor, nova posição).
+    """
+    pos = _skip_whitespace(data, pos)
+    if pos >= len(data):
+        raise PdfError("fim inesperado do objeto")
+    char = data[pos:pos + 1]
+    if data.startswith(b"<<", pos):
+        result: Dict[str, Any] = {}
+        pos += 2
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b">>", pos):
+                return result, pos + 2
+            key, pos = parse_value(data, pos)
+            if not isinstance(key, Name):
+                raise PdfError("chave de dicionário inválida")
+            result[key], pos = parse_value(data, pos)
+    if char == b"<":
+        end = data.find(b">", pos)
+        if end < 0:
+            raise PdfError("string hexadecimal sem fechamento")
+        digits = re.sub(rb"\s", b"", data[pos + 1:end])
+        if len(digits) % 2:
+            digits += b"0"
+        return bytes.fromhex(digits.decode("ascii")), end + 1
+    if char == b"(":
+        return _parse_literal_string(data, pos)
+    if char == b"[":
+        items = []
+        pos += 1
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b"]", pos):
+                return items, pos + 1
+            item, pos = parse_value(data, pos)
+            items.append(item)
+    if char == b"/":
+        end = pos + 1
+        while end < len(data) and data[end:end + 1] not in WHITESPACE and data[end:end + 1] not in DELIMITERS:
+            end += 1
+        name = re.sub(rb"#([0-9a-fA-F]{2})", lambda m: bytes([int(m.group(1), 16)]), data[pos + 1:end])
+        return Name(name.decode("latin-1")), end
+    number = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)").match(data, pos)
+    if number:
+        token = number.group(0)
+        reference = re.compile(rb"(\d+)\s+(\d+)\s+R\b").match(data, pos)
+        if reference:
+            return Ref(int(reference.group(1)), int(reference.group(2))), reference.end()
+        value = float(token) if b"." in token else int(token)
+        return value, number.end()
+    for keyword, value in ((b"true", True), (b"false", False), (b"null", None)):
+        if data.startswith(keyword, pos):
+            return value, pos + len(keyword)
+    raise PdfError(f"token inesperado na posição {pos}: {data[pos:pos + 10]!r}")
+
+
+def decode_text(value: Any) -> str:
+    """
+    Texto de uma string PDF: UTF-16BE com BOM, UTF-8 com BOM ou PDFDocEncoding (≈ latin-1).
+    """
+    if not isinstance(value, bytes):
+        return ""
+    if value.startswith(b"\xfe\xff"):
+        text = value[2:].decode("utf-16-be", errors="replace")
+    elif value.startswith(b"\xef\xbb\xbf"):
+        text = value[3:].decode("utf-8", errors="replace")
+    else:
+        text = value.decode("latin-1")
+    return " ".join(text.replace("\x00", "").split())
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """
+    Desfaz o preditor PNG (Predictor >= 10) usado nos xref streams.
+    """
+    rows = []
+    previous = bytearray(columns)
+    stride = columns + 1
+    for offset in range(0, len(data) - columns, stride):
+        kind, row = data[offset], bytearray(data[offset + 1:offset + stride])
+        for i in range(len(row)):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                upper_left = previous[i - 1] if i else 0
+                estimate = left + up - upper_left
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else upper_left)) & 0xFF
+        rows.append(bytes(row))
+        previous = row
+    return b"".join(rows)
+
+
+def decode_stream(stream_dict: Dict[str, Any], raw: bytes, max_output: int) -> bytes:
+    """
+    Conteúdo de um stream sem filtro ou com FlateDecode (limitado a `max_output` bytes).
+    Outros filtros levantam `PdfError`.
+    """
+    filters = stream_dict.get("Filter")
+    filters = filters if isinstance(filters, list) else [filters] if filters else []
+    params = stream_dict.get("DecodeParms")
+    params = (params[0] if params else None) if isinstance(params, list) else params
+    data = raw
+    for name in filters:
+        if name != "FlateDecode":
+            raise PdfError(f"filtro não suportado: {name}")
+        data = zlib.decompressobj().decompress(data, max_output)
+    if isinstance(params, dict) and params.get("Predictor", 1) >= 10:
+        data = _png_unpredict(data, int(params.get("Columns", 1)))
+    return data
+
+
+class PdfDocument:
+    """
+    Leitura preguiçosa da estrutura de um PDF remoto: a cauda (startxref e trailer),
+    as tabelas ou streams de referência cruzada e apenas os objetos pedidos.
+    """
+
+    def __init__(self, reader: RangeReader, tail_bytes: Optional[int] = None):
+        self.reader = reader
+        self.tail_bytes = tail_bytes or settings.PDF_TAIL_BYTES
+        self.trailer: Dict[str, Any] = {}
+        # número do objeto -> (1, posição) ou (2, número do object stream, índice)
+        self.xref: Dict[int, Tuple[int, int, int]] = {}
+        self._objects: Dict[int, Any] = {}
+        self._object_streams: Dict[int, Dict[int, Any]] = {}
+
+    def load(self) -> None:
+        tail_start, tail = self.reader.tail(self.tail_bytes)
+        position = tail.rfind(b"startxref")
+        if position >= 0:
+            offset_match = re.match(rb"\s*(\d+)", tail[position + len(b"startxref"):])
+            if offset_match:
+                self._load_xref_chain(int(offset_match.group(1)))
+        if not self.trailer:
+            # Sem xref utilizável (ou servidor sem Range): procura o trailer no que foi baixado
+            for _, data in self.reader.loaded():
+                found = data.rfind(b"trailer")
+                if found >= 0:
+                    self.trailer, _ = parse_value(data, found + len(b"trailer"))
+                    break
+        if not self.trailer:
+            raise PdfError(f"{self.reader.url}: trailer não encontrado")
+
+    def _load_xref_chain(self, offset: int) -> None:
+        seen = set()
+        while offset is not None and offset not in seen and len(seen) < 8:
+            seen.add(offset)
+            head = self.reader.read(offset, 64)
+            if head.lstrip().startswith(b"xref"):
+                section_trailer = self._read_xref_table(offset)
+            else:
+                section_trailer = self._read_xref_stream(offset)
+            for key, value in section_trailer.items():
+                # A seção mais recente prevalece
+                self.trailer.setdefault(key, value)
+            previous = section_trailer.get("Prev")
+            offset = previous if isinstance(previous, int) else None
+
+    def _read_xref_table(self, offset: int) -> Dict[str, Any]:
+        data = self.reader.read(offset, self.reader.block_size)
+        pos = data.find(b"xref") + 4
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b"trailer", pos):
+                trailer_data = data[pos + len(b"trailer"):]
+                if b">>" not in trailer_data:
+                    trailer_data = self.reader.read(offset + pos + len(b"trailer"), 4096)
+                trailer, _ = parse_value(trailer_data)
+                return trailer
+            header = re.compile(rb"(\d+)\s+(\d+)").match(data, pos)
+            if not header:
+                raise PdfError("tabela xref inválida")
+            first, count = int(header.group(1)), int(header.group(2))
+            pos = _skip_whitespace(data, header.end())
+            needed = pos + 20 * count + 4096
+            if needed > len(data):
+                data = data + self.reader.read(offset + len(data), needed - len(data))
+            for index in range(count):
+                entry = data[pos + 20 * index:pos + 20 * index + 18]
+                if entry.endswith(b"n"):
+                    self.xref.setdefault(first + index, (1, int(entry[:10]), 0))
+            pos += 20 * count
+
+    def _read_xref_stream(self, offset: int) -> Dict[str, Any]:
+        stream_dict, raw = self._read_object_at(offset)
+        if not isinstance(stream_dict, dict) or stream_dict.get("Type") != "XRef":
+            raise PdfError("xref stream inválido")
+        data = decode_stream(stream_dict, raw, settings.PDF_BYTE_BUDGET * 4)
+        widths = stream_dict["W"]
+        index = stream_dict.get("Index") or [0, stream_dict["Size"]]
+        entry_size = sum(widths)
+        pos = 0
+        for first, count in zip(index[::2], index[1::2]):
+            for num in range(first, first + count):
+                entry = data[pos:pos + entry_size]
+                pos += entry_size
+                fields, cursor = [], 0
+                for width in widths:
+                    fields.append(int.from_bytes(entry[cursor:cursor + width], "big") if width else None)
+                    cursor += width
+                kind = 1 if fields[0] is None else fields[0]
+                if kind in (1, 2):
+                    self.xref.setdefault(num, (kind, fields[1], fields[2] or 0))
+        return stream_dict
+
+    def _read_object_at(self, offset: int) -> Tuple[Any, Optional[bytes]]:
+        data = self.reader.read(offset, 4096)
+        header = OBJECT_HEADER.match(data, _skip_whitespace(data, 0))
+        if not header:
+            raise PdfError(f"objeto não encontrado na posição {offset}")
+        while True:
+            try:
+                value, pos = parse_value(data, header.end())
+                break
+            except PdfError:
+                # Objeto maior que o trecho lido: amplia até o orçamento permitir
+                if len(data) >= settings.PDF_BYTE_BUDGET:
+                    raise
+                more = self.reader.read(offset + len(data), len(data))
+                if not more:
+                    raise
+                data += more
+        pos = _skip_whitespace(data, pos)
+        if not data.startswith(b"stream", pos):
+            return value, None
+        pos += len(b"stream")
+        pos += 2 if data.startswith(b"\r\n", pos) else 1
+        length = value.get("Length") if isinstance(value, dict) else None
+        if isinstance(length, Ref):
+            length = self.resolve(length)
+        if not isinstance(length, int):
+            end = self.reader.read(offset + pos, settings.PDF_BYTE_BUDGET).find(b"endstream")
+            length = max(end, 0)
+        raw = self.reader.read(offset + pos, length)
+        return value, raw
+
+    def _object_stream(self, num: int) -> Dict[int, Any]:
+        if num in self._object_streams:
+            return self._object_streams[num]
+        entry = self.xref.get(num)
+        if entry is None or entry[0] != 1:
+            raise PdfError(f"object stream {num} não localizado")
+        stream_dict, raw = self._read_object_at(entry[1])
+        data = decode_stream(stream_dict, raw or b"", settings.PDF_BYTE_BUDGET * 4)
+        first = int(stream_dict["First"])
+        numbers = [int(token) for token in data[:first].split()]
+        objects = {}
+        for obj_num, obj_offset in zip(numbers[::2], numbers[1::2]):
+            objects[obj_num], _ = parse_value(data, first + obj_offset)
+        self._object_streams[num] = objects
+        return objects
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Segue referências indiretas até o valor (objetos comuns ou dentro de object streams).
+        """
+        depth = 0
+        while isinstance(value, Ref) and depth < 8:
+            depth += 1
+            if value.num in self._objects:
+                value = self._objects[value.num]
+                continue
+            entry = self.xref.get(value.num)
+            if entry is None:
+                resolved = self._find_loaded_object(value.num)
+            elif entry[0] == 1:
+                resolved, raw = self._read_object_at(entry[1])
+                if raw is not None:
+                    resolved = (resolved, raw)
+            else:
+                resolved = self._object_stream(entry[1]).get(value.num)
+            self._objects[value.num] = resolved
+            value = resolved
+        return value
+
+    def _find_loaded_object(self, num: int) -> Any:
+        pattern = re.compile(rb"(?<!\d)%d\s+0\s+obj\b" % num)
+        for _, data in self.reader.loaded():
+            match = pattern.search(data)
+            if match:
+                value, _ = parse_value(data, match.end())
+                return value
+        return None
+
+    def resolve_dict(self, value: Any) -> Dict[str, Any]:
+        value = self.resolve(value)
+        if isinstance(value, tuple):
+            value = value[0]
+        return value if isinstance(value, dict) else {}
+
+    def stream(self, ref: Any, max_output: int) -> bytes:
+        value = self.resolve(ref)
+        if not isinstance(value, tuple):
+            return b""
+        stream_dict, raw = value
+        return decode_stream(stream_dict, raw, max_output)
+
+    def first_page(self) -> Dict[str, Any]:
+        node = self.resolve_dict(self.resolve_dict(self.trailer.get("Root")).get("Pages"))
+        for _ in range(16):
+            if node.get("Type") == "Page" or "Contents" in node:
+                return node
+            kids = self.resolve(node.get("Kids"))
+            if not kids:
+                break
+            node = self.resolve_dict(kids[0])
+        return {}
+
+
+def extract_page_text(content: bytes, max_chars: int) -> str:
+    """
+    Texto dos operadores de texto (Tj, TJ, ', ") de um content stream, na ordem em que
+    aparecem. Fontes com codificação própria (CID/Identity-H) não são decodificadas.
+    """
+    parts: List[str] = []
+    operands: List[Any] = []
+    size = 0
+    pos = 0
+    while pos < len(content) and size < max_chars:
+        pos = _skip_whitespace(content, pos)
+        if pos >= len(content):
+            break
+        char = content[pos:pos + 1]
+        if char in b"(<[/" or char.isdigit() or char in b"+-.":
+            try:
+                value, pos = parse_value(content, pos)
+            except PdfError:
+                pos += 1
+                continue
+            operands.append(value)
+            continue
+        match = re.compile(rb"[A-Za-z'\"*]+").match(content, pos)
+        if not match:
+            pos += 1
+            continue
+        operator = match.group(0)
+        pos = match.end()
+        if operator == b"BI":
+            # Imagem embutida: pula os dados binários até EI
+            end = content.find(b"EI", pos)
+            pos = len(content) if end < 0 else end + 2
+        elif operator in (b"Tj", b"'", b'"') and operands and isinstance(operands[-1], bytes):
+            parts.append(operands[-1].decode("latin-1"))
+        elif operator == b"TJ" and operands and isinstance(operands[-1], list):
+            for item in operands[-1]:
+                if isinstance(item, bytes):
+                    parts.append(item.decode("latin-1"))
+                elif isinstance(item, (int, float)) and item < -200:
+                    parts.append(" ")
+        elif operator in (b"Td", b"TD", b"T*", b"ET", b"Tm"):
+            parts.append(" ")
+        if operator in (b"Tj", b"TJ", b"'", b'"'):
+            size += len(parts[-1]) if parts else 0
+        operands = []
+    return " ".join("".join(parts).split())
+
+
+def _looks_like_text(text: str) -> bool:
+    if len(text) < 40:
+        return False
+    readable = sum(1 for char in text if char.isalpha() or char.isspace() or char in ".,;:()-'\"")
+    return readable / len(text) > 0.9
+
+
+def _xmp_field(xmp: str, tag: str) -> str:
+    match = re.search(rf"<{tag}\b[^>]*>(.*?)</{tag}>", xmp, re.DOTALL)
+    if match:
+        items = re.findall(r"<rdf:li\b[^>]*>(.*?)</rdf:li>", match.group(1), re.DOTALL)
+        text = ", ".join(item.strip() for item in items) if items else match.group(1)
+    else:
+        attribute = re.search(rf'\b{tag}="([^"]*)"', xmp)
+        text = attribute.group(1) if attribute else ""
+    text = re.sub(r"<[^>]+>", " ", text)
+    for entity, char in (("&lt;", "<"), ("&gt;", ">"), ("&quot;", '"'), ("&apos;", "'"), ("&amp;", "&")):
+        text = text.replace(entity, char)
+    return " ".join(text.split())
+
+
+def _apply_info(metadata: PdfMetadata, info: Dict[str, Any]) -> None:
+    metadata.title = metadata.title or decode_text(info.get("Title"))
+    metadata.author = metadata.author or decode_text(info.get("Author"))
+    if not metadata.creation_year:
+        match = PDF_DATE_YEAR.match(decode_text(info.get("CreationDate")))
+        metadata.creation_year = match.group(1) if match else ""
+
+
+def _apply_xmp(metadata: PdfMetadata, xmp: str) -> None:
+    metadata.title = metadata.title or _xmp_field(xmp, "dc:title")
+    metadata.author = metadata.author or _xmp_field(xmp, "dc:creator")
+    metadata.abstract = metadata.abstract or _xmp_field(xmp, "dc:description")
+    for tag in XMP_YEAR_TAGS:
+        match = YEAR.search(_xmp_field(xmp, tag))
+        if match:
+            metadata.year = match.group(1)
+            break
+    for tag in XMP_CREATION_TAGS:
+        if metadata.creation_year:
+            break
+        match = YEAR.search(_xmp_field(xmp, tag))
+        metadata.creation_year = match.group(1) if match else ""
+
+
+def _abstract_from_text(text: str, max_chars: int) -> str:
+    marker = ABSTRACT_MARKER.search(text)
+    if not marker:
+        return ""
+    abstract = text[marker.end():marker.end() + max_chars].strip()
+    return abstract + "..." if len(text) - marker.end() > max_chars else abstract
+
+
+@timed("extract_pdf")
+def extract_pdf_metadata(
+    url: str,
+    scheduler: Optional[HostScheduler] = None,
+    budget: Optional[int] = None,
+    timeout: int = 15
+) -> PdfMetadata:
+    """
+    Título, autor, ano e início do resumo de um PDF remoto, sem baixar o arquivo: lê por
+    Range a cauda (startxref/trailer), o dicionário Info e o XMP do catálogo e, se ainda
+    faltar o resumo, o texto da primeira página. Para ao atingir `budget` bytes
+    (`settings.PDF_BYTE_BUDGET`) e devolve o que já tiver sido encontrado.
+    """
+    metadata = PdfMetadata()
+    reader = RangeReader(url, budget=budget, timeout=timeout, scheduler=scheduler)
+    document = PdfDocument(reader)
+    try:
+        document.load()
+        _apply_info(metadata, document.resolve_dict(document.trailer.get("Info")))
+        catalog = document.resolve_dict(document.trailer.get("Root"))
+        if "Metadata" in catalog:
+            xmp = document.stream(catalog["Metadata"], settings.PDF_BYTE_BUDGET)
+            _apply_xmp(metadata, xmp.decode("utf-8", errors="replace"))
+        if not metadata.abstract:
+            contents = document.first_page().get("Contents")
+            contents = document.resolve(contents)
+            refs = contents if isinstance(contents, list) else [contents] if contents else []
+            text = " ".join(
+                extract_page_text(document.stream(ref, settings.PDF_BYTE_BUDGET * 4), settings.PDF_ABSTRACT_MAX_CHARS * 4)
+                for ref in refs
+            )
+            if _looks_like_text(text):
+                metadata.abstract = _abstract_from_text(text, settings.PDF_ABSTRACT_MAX_CHARS)
+    except ByteBudgetExceeded as e:
+        _log.debug("Metadados parciais do PDF: %s", e)
+    except (PdfError, KeyError, IndexError, TypeError, ValueError, zlib.error) as e:
+        _log.debug("PDF não interpretado (%s): %s", url, e)
+    except requests.exceptions.RequestException as e:
+        _log.debug("Falha ao ler trechos do PDF %s: %s", url, e)
+    return metadata
@@ -0,0 +1,357 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from .extractors import (
+    extract_author, extract_year, extract_page_year, classify_doc_type, extract_base, extract_abstract,
+    extract_meta_author, extract_meta_abstract
+)
+from .models import SearchResult
+from .cache import PageCache
+from .config import settings
+from .dedupe import is_error_doc_type
+from .fetcher import fetch_page
+from .metrics import get_metrics
+from .parse_pool import ParsePool
+from .parsers import parse_html
+from .pdf_metadata import extract_pdf_metadata
+from .retry import CircuitBreaker
+from .scheduler import HostScheduler
+from .store import StoredResult
+from .urls import canonicalize_url
+from .logger import get_logger
+
+_log = get_logger("Pipeline")
+
+
+@dataclass
+class PageMetadata:
+    """
+    O que é extraído do documento de um link, independente da busca que o trouxe.
+    `failed` indica que o download/extração falhou e `doc_type` guarda o marcador do erro.
+    `title` e `year` só são preenchidos quando o próprio documento os informa (metadados
+    de PDF; o ano também das meta tags e do JSON-LD das páginas HTML). `creation_year` é o
+    ano de criação do arquivo PDF, usado só depois de todas as outras fontes do ano.
+    """
+    author: str = ""
+    abstract: str = ""
+    title: str = ""
+    year: str = ""
+    creation_year: str = ""
+    doc_type: str = ""
+    failed: bool = False
+
+
+class LinkMemo:
+    """
+    Memoização thread-safe por link: a primeira thread que pede um link faz o download
+    e as demais (de qualquer consulta do lote) aguardam e reaproveitam o mesmo resultado.
+    Os links são indexados pela URL canônica (`urls.canonicalize_url`), então variantes
+    do mesmo endereço (http/https, `www.`, parâmetros de rastreamento) são consultadas no
+    índice antes de qualquer download. Visões diferentes da mesma obra (resumo e PDF do
+    arXiv, página e PDF de um DOI) são baixadas separadamente: o tipo, o autor e o resumo
+    de cada uma são próprios; elas só se unem depois, em `dedupe`.
+
+    O memo guarda no máximo `max_entries` links já concluídos (por padrão,
+    `settings.LINK_MEMO_MAX_ENTRIES`): os usados há mais tempo são descartados primeiro.
+    Downloads em andamento nunca são descartados.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries or settings.LINK_MEMO_MAX_ENTRIES
+        self.hits = 0
+
+    def get_or_compute(self, link: str, compute: Callable[[], PageMetadata]) -> PageMetadata:
+        key = canonicalize_url(link)
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+                self._evict_locked()
+            else:
+                self._futures.move_to_end(key)
+                self.hits += 1
+        if not owner:
+            return future.result()
+        try:
+            future.set_result(compute())
+        except BaseException as e:
+            future.set_exception(e)
+        return future.result()
+
+    def _evict_locked(self) -> None:
+        excess = len(self._futures) - self.max_entries
+        if excess <= 0:
+            return
+        # Do menos para o mais recente; quem ainda espera um download já tem o Future em mãos
+        settled = []
+        for key, future in self._futures.items():
+            if future.done():
+                settled.append(key)
+                if len(settled) == excess:
+                    break
+        for key in settled:
+            del self._futures[key]
+
+    def forget(self, link: str) -> None:
+        """
+        Descarta o resultado guardado de um link (ex.: antes de uma nova tentativa).
+        """
+        with self._lock:
+            self._futures.pop(canonicalize_url(link), None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+
+class PriorResults:
+    """
+    Modo incremental: o que a base local já tem sobre os links de uma página da busca.
+    Um link é reaproveitado, sem download, quando seu último download não terminou em
+    erro e foi feito há no máximo `max_age_sec`; links novos, com erro ou antigos são
+    baixados de novo.
+    """
+
+    def __init__(self, stored: Dict[str, StoredResult], max_age_sec: float, now: Optional[float] = None):
+        # `stored` vem de `ResultStore.latest_by_links`, indexado pela URL canônica
+        self._stored = stored
+        self.max_age_sec = max_age_sec
+        # Um único instante de referência: a decisão sobre um link não muda durante a página
+        self.now = time.time() if now is None else now
+
+    def reusable(self, link: str) -> Optional[StoredResult]:
+        prior = self._stored.get(canonicalize_url(link)) if link else None
+        if prior is None or is_error_doc_type(prior.result.doc_type):
+            return None
+        if self.now - prior.fetched_at > self.max_age_sec:
+            return None
+        return prior
+
+
+@dataclass
+class PipelineContext:
+    """
+    Recursos compartilhados entre os workers do estágio de download/extração.
+    """
+    page_cache: Optional[PageCache] = None
+    scheduler: Optional[HostScheduler] = None
+    # Com um memo, links repetidos (na mesma consulta ou entre consultas) são baixados uma vez
+    link_memo: Optional[LinkMemo] = None
+    breaker: Optional[CircuitBreaker] = None
+    # Com um pool de processos, o parse dos documentos completos sai das threads de download
+    parse_pool: Optional[ParsePool] = None
+    # No modo incremental, resultados recentes e sem erro são reaproveitados da base local
+    prior: Optional[PriorResults] = None
+
+
+def _author_from_publication_info(item: Dict[str, Any]) -> str:
+    """
+    Obtém o autor a partir do `publication_info` retornado pela SerpAPI (Google Scholar).
+    """
+    publication_info = item.get("publication_info", {})
+    if isinstance(publication_info.get("authors"), list):
+        authors_list = [auth.get("name") for auth in publication_info.get("authors") if auth.get("name")]
+        if authors_list:
+            return ", ".join(authors_list)
+    # Fallback para o sumário da SerpAPI se autores não estiverem em 'authors'
+    elif isinstance(publication_info.get("summary"), str):
+        summary_parts = publication_info.get("summary").split(" - ")
+        if len(summary_parts) > 0:
+            potential_authors = summary_parts[0].strip()
+            # Heurística para evitar nomes de periódicos ou strings muito longas
+            if (',' in potential_authors or ' and ' in potential_authors.lower() or 'et al' in potential_authors.lower() or len(potential_authors.split()) < 7) and \
+               not any(char.isdigit() for char in potential_authors) and \
+               len(potential_authors) < 150 and \
+               potential_authors.lower() != "abstract" and \
+               potential_authors.lower() != "introduction": # Evitar palavras comuns
+                return potential_authors
+    return ""
+
+
+def _failed(link: str, doc_type: str) -> PageMetadata:
+    # Classe do erro por domínio, para o resumo de métricas da execução
+    get_metrics().inc("errors", domain=extract_base(link), error=doc_type)
+    return PageMetadata(doc_type=doc_type, failed=True)
+
+
+def _reused_page(prior: StoredResult) -> PageMetadata:
+    get_metrics().inc("recrawl_reused", domain=extract_base(prior.result.link))
+    result = prior.result
+    return PageMetadata(author=result.author, abstract=result.abstract, title=result.title, year=result.year, doc_type=result.doc_type)
+
+
+def _extract_page(link: str, context: PipelineContext) -> PageMetadata:
+    """
+    Baixa o documento de um link e extrai tipo, autor e resumo (de PDFs, também título e
+    ano, lidos por Range em `pdf_metadata`). Erros de rede/HTTP viram
+    marcadores em `doc_type` (TIMEOUT, HTTP_ERROR_<status>, REQUEST_ERROR, PROCESSING_ERROR).
+    """
+    metadata = PageMetadata()
+    try:
+        head_index = {}
+
+        def head_has_metadata(head: bytes, encoding: Optional[str]) -> bool:
+            # O <head> só basta quando autor e resumo vêm das meta tags de maior prioridade:
+            # nenhum seletor do <body> passaria à frente delas. O índice é reaproveitado
+            index = parse_html(head.decode(encoding or "utf-8", errors="replace"))
+            if extract_meta_author(index) and extract_meta_abstract(index):
+                head_index["index"] = index
+                return True
+            return False
+
+        page = fetch_page(
+            link,
+            cache=context.page_cache,
+            timeout=15,
+            head_check=head_has_metadata if settings.STREAM_HEAD_ONLY else None,
+            scheduler=context.scheduler,
+            breaker=context.breaker
+        )
+
+        # Determina o tipo de documento ANTES de tentar parsear como HTML
+        # Isso é importante porque não queremos tentar parsear um PDF como HTML
+        content_type_header = page.content_type.lower()
+        if "pdf" in content_type_header:
+            metadata.doc_type = "PDF"
+        elif "html" in content_type_header:
+            metadata.doc_type = "HTML"
+            if "index" not in head_index and context.parse_pool is not None:
+                # Documento completo: parse e extração num processo do estágio de parse
+                with get_metrics().timer("parse_pool"):
+                    metadata.author, metadata.abstract, metadata.year = context.parse_pool.extract(page.content, page.encoding, link)
+            else:
+                # Parse com o backend configurado; o índice resultante alimenta todos os extratores
+                index = head_index.get("index") or parse_html(page.text)
+                metadata.author = extract_author(index)
+                metadata.abstract = extract_abstract(index)
+                metadata.year = extract_page_year(index)
+        else:
+            # Para outros tipos de conteúdo, tenta obter o tipo principal
+            metadata.doc_type = content_type_header.split("/")[0].upper() if "/" in content_type_header else content_type_header.upper()
+
+        # Sem Content-Type, classifica pelos primeiros bytes já baixados e pela URL (sem novo HEAD)
+        if not metadata.doc_type:
+            metadata.doc_type = classify_doc_type(page.content_type, page.content, link)
+
+        if metadata.doc_type == "PDF" and settings.PDF_METADATA_ENABLED:
+            # Só a cauda, os objetos de metadados e a primeira página, por Range
+            pdf = extract_pdf_metadata(link, scheduler=context.scheduler, timeout=15)
+            metadata.author, metadata.abstract = pdf.author, pdf.abstract
+            metadata.title, metadata.year = pdf.title, pdf.year
+            metadata.creation_year = pdf.creation_year
+
+    except requests.exceptions.Timeout:
+        _log.warning("Timeout ao tentar acessar %s", link, extra={"domain": extract_base(link)})
+        return _failed(link, "TIMEOUT") # Marca como timeout para análise posterior
+    except requests.exceptions.HTTPError as http_err:
+        _log.warning("Erro HTTP %d ao acessar %s", http_err.response.status_code, link, extra={"domain": extract_base(link)})
+        return _failed(link, f"HTTP_ERROR_{http_err.response.status_code}")
+    except requests.exceptions.RequestException as req_err:
+        _log.warning("Falha na requisição para %s: %s", link, req_err, extra={"domain": extract_base(link)})
+        return _failed(link, "REQUEST_ERROR")
+    except Exception as e:
+        _log.warning("Falha geral ao processar dados de %s: %s", link, e, extra={"domain": extract_base(link)})
+        return _failed(link, "PROCESSING_ERROR")
+    return metadata
+
+
+def process_result(item: Dict[str, Any], search_engine_api: str, context: Optional[PipelineContext] = None) -> SearchResult:
+    """
+    Baixa a página de um resultado orgânico e extrai seus metadados. Com `context.prior`,
+    os campos de um link recente e sem erro vêm da base local, sem download.
+    """
+    context = context or PipelineContext()
+    title   = item.get("title", "")
+    link    = item.get("link", "")
+    snippet = item.get("snippet", "") # Usado como fallback para o resumo
+    source  = item.get("displayed_link", item.get("source", "")) # Fallback para 'source' se 'displayed_link' não existir
+
+    author = ""
+    year = "" # Inicializa o ano
+    doc_type = ""
+    base = ""
+    full_abstract = snippet # Inicializa o resumo com o snippet da API
+
+    if link:
+        # Tenta obter o ano da URL antes de fazer a requisição, se possível
+        year = extract_year(link) # extract_year agora só usa a URL
+
+        prior = context.prior.reusable(link) if context.prior is not None else None
+        if prior is not None:
+            page = _reused_page(prior)
+        elif context.link_memo is not None:
+            page = context.link_memo.get_or_compute(link, lambda: _extract_page(link, context))
+        else:
+            page = _extract_page(link, context)
+        doc_type = page.doc_type
+
+        if not page.failed:
+            author = page.author
+            # Título e ano do próprio documento completam os da busca (o ano da URL tem prioridade)
+            title = title or page.title
+            year = year or page.year
+            if page.abstract:
+                full_abstract = page.abstract
+
+            # Se o autor não foi encontrado na página e o buscador é scholar, tenta obter da SerpAPI
+            if not author and search_engine_api == "google_scholar":
+                author = _author_from_publication_info(item)
+
+            # Se o ano ainda não foi encontrado, tenta obter do snippet do Google Scholar
+            if not year and search_engine_api == "google_scholar" and item.get("snippet"):
+                # Exemplo: "JM Viviescas, A Serna - 2023 - repositorio.unal.edu.co"
+                snippet_year_match = re.search(r'\b(19\d{2}|20\d{2})\b', item.get("snippet", ""))
+                if snippet_year_match:
+                    year = snippet_year_match.group(1)
+
+            # A data de criação do PDF costuma ser a da digitalização ou do depósito: último recurso
+            year = year or page.creation_year
+
+            base = extract_base(link)
+    else:
+        _log.info("Resultado '%s' sem link, pulando extração da página.", title)
+        doc_type = "NO_LINK"
+
+    return SearchResult(
+        title=title,
+        author=author,
+        abstract=full_abstract,
+        source=source,
+        year=year,
+        doc_type=doc_type,
+        base=base,
+        link=link
+    )
+
+
+def process_results(
+    items: List[Dict[str, Any]],
+    search_engine_api: str,
+    executor: Optional[ThreadPoolExecutor] = None,
+    context: Optional[PipelineContext] = None
+) -> Iterator[SearchResult]:
+    """
+    Processa os resultados orgânicos em paralelo, devolvendo-os na ordem original.
+
+    Se nenhum `executor` for informado, um pool temporário com
+    `settings.FETCH_WORKERS` threads é criado para esta chamada.
+    """
+    def task(item: Dict[str, Any]) -> SearchResult:
+        return process_result(item, search_engine_api, context=context)
+
+    if executor is None:
+        workers = max(1, min(settings.FETCH_WORKERS, len(items) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+            yield from pool.map(task, items)
+        return
+    yield from executor.map(task, items)
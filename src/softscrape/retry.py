@@ -0,0 +1,219 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import requests
+
+from .config import settings
+from .logger import get_logger
+from .scheduler import parse_retry_after
+
+_log = get_logger("Retry")
+
+T = TypeVar("T")
+
+# Marcadores de `doc_type` que indicam falha transitória (vale tentar de novo mais tarde)
+RETRYABLE_DOC_TYPES = ("TIMEOUT", "REQUEST_ERROR")
+
+
+def is_retryable_exception(exc: BaseException, statuses: Optional[Sequence[int]] = None) -> bool:
+    """
+    Classifica uma exceção de rede: timeouts e falhas de conexão são transitórios;
+    erros HTTP só quando o status está em `statuses` (`settings.RETRY_STATUSES`).
+    """
+    statuses = settings.RETRY_STATUSES if statuses is None else statuses
+    if isinstance(exc, requests.exceptions.HTTPError):
+        response = exc.response
+        return response is not None and response.status_code in statuses
+    return isinstance(exc, (
+        requests.exceptions.Timeout,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ChunkedEncodingError,
+        CircuitOpenError
+    ))
+
+
+def is_retryable_doc_type(doc_type: str, statuses: Optional[Sequence[int]] = None) -> bool:
+    """
+    Mesma classificação aplicada aos marcadores de erro gravados num `SearchResult`.
+    """
+    statuses = settings.RETRY_STATUSES if statuses is None else statuses
+    if doc_type in RETRYABLE_DOC_TYPES:
+        return True
+    if doc_type.startswith("HTTP_ERROR_"):
+        code = doc_type[len("HTTP_ERROR_"):]
+        return code.isdigit() and int(code) in statuses
+    return False
+
+
+class RetryBudget:
+    """
+    Orçamento de novas tentativas de uma execução, compartilhado entre a API e os links,
+    para que uma fonte instável não multiplique o tempo total da execução.
+    """
+
+    def __init__(self, max_retries: Optional[int] = None):
+        self.max_retries = settings.RETRY_BUDGET if max_retries is None else max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_consume(self) -> bool:
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.max_retries - self.used
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    O circuito do host está aberto: a requisição nem é enviada.
+    """
+
+
+@dataclass
+class _HostCircuit:
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trial_in_flight: bool = False
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por host: após `failure_threshold` falhas transitórias seguidas, o host
+    fica bloqueado por `reset_timeout` segundos; depois, uma única requisição de teste
+    decide entre fechar o circuito (sucesso) ou reabri-lo (falha).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = settings.CIRCUIT_RESET_SEC if reset_timeout is None else reset_timeout
+        self._clock = clock
+        self._hosts: Dict[str, _HostCircuit] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return True
+            if circuit.trial_in_flight or self._clock() - circuit.opened_at < self.reset_timeout:
+                return False
+            circuit.trial_in_flight = True
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            circuit = self._hosts.setdefault(host, _HostCircuit())
+            circuit.failures += 1
+            # A requisição de teste falhou, ou o limite de falhas seguidas foi atingido
+            if circuit.trial_in_flight or (circuit.opened_at is None and circuit.failures >= self.failure_threshold):
+                _log.warning("Circuito aberto para %s após %d falhas.", host, circuit.failures)
+                circuit.opened_at = self._clock()
+                circuit.trial_in_flight = False
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            circuit = self._hosts.get(host)
+            return circuit is not None and circuit.opened_at is not None
+
+
+class RetryPolicy:
+    """
+    Novas tentativas com backoff exponencial limitado e jitter completo: a espera da
+    tentativa n é sorteada em [0, min(max_delay, base_delay × 2^n)], respeitando um
+    Retry-After maior. Cada nova tentativa consome o `budget` da execução.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        retry_statuses: Optional[Sequence[int]] = None,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random
+    ):
+        self.max_attempts = max_attempts or settings.RETRY_MAX_ATTEMPTS
+        self.base_delay = settings.RETRY_BASE_DELAY_SEC if base_delay is None else base_delay
+        self.max_delay = settings.RETRY_MAX_DELAY_SEC if max_delay is None else max_delay
+        self.retry_statuses = tuple(settings.RETRY_STATUSES if retry_statuses is None else retry_statuses)
+        self.budget = budget or RetryBudget()
+        self._sleep = sleep
+        self._rng = rng
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = self._rng() * min(self.max_delay, self.base_delay * (2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, settings.RETRY_AFTER_MAX_SEC))
+        return delay
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        return is_retryable_exception(exc, self.retry_statuses)
+
+    def call(self, fn: Callable[[], T], description: str = "") -> T:
+        """
+        Executa `fn`, repetindo-a em erros transitórios até `max_attempts` tentativas
+        ou até o orçamento acabar; o último erro é relançado.
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                attempt += 1
+                if attempt >= self.max_attempts or not self.is_retryable(e) or not self.budget.try_consume():
+                    raise
+                response = getattr(e, "response", None)
+                retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+                delay = self.backoff(attempt - 1, retry_after)
+                _log.warning("Tentativa %d/%d falhou (%s); nova tentativa em %.1fs.", attempt, self.max_attempts, description or e, delay)
+                self._sleep(delay)
+
+
+@dataclass
+class DeferredItem:
+    page: int
+    position: int
+    item: Dict[str, Any] = field(repr=False)
+
+
+class DeferredRetryQueue:
+    """
+    Fila de links que falharam por motivo transitório, reprocessados ao final da
+    consulta em vez de bloquear o laço principal.
+    """
+
+    def __init__(self):
+        self._items: List[DeferredItem] = []
+        self._lock = threading.Lock()
+
+    def add(self, page: int, position: int, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items.append(DeferredItem(page, position, item))
+
+    def drain(self) -> List[DeferredItem]:
+        with self._lock:
+            items, self._items = self._items, []
+        return items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
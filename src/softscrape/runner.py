@@ -0,0 +1,427 @@
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from itertools import chain
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .cache import PageCache, ResponseCache
+from .clients.serpapi_client import MAX_RESULTS_PER_CALL, SerpApiClient, has_more_results
+from .config import settings
+from .dedupe import deduplicate
+from .exporters import ResultSink, build_output_path, open_sink
+from .extractors import preload_date_extractor
+from .journal import RunJournal
+from .logger import get_logger
+from .metrics import get_metrics, metrics_path_for, reset_metrics
+from .parse_pool import ParsePool
+from .pipeline import LinkMemo, PipelineContext, PriorResults, process_results
+from .retry import CircuitBreaker, DeferredRetryQueue, RetryBudget, RetryPolicy, is_retryable_doc_type
+from .scheduler import HostScheduler, TokenBucket
+from .session import close_session
+from .store import ResultStore
+
+_log = get_logger("Runner")
+
+ENGINES = {"google": "google", "scholar": "google_scholar"}
+OUTPUT_PREFIX = "resultados_pesquisa"
+
+
+@dataclass
+class RunResources:
+    """
+    Recursos compartilhados por todas as consultas de um processo: cliente da SerpAPI
+    (com cache, limite de taxa e novas tentativas), cache de páginas, escalonador e
+    disjuntor por host, memo de links, o pool de threads de download, a política de
+    novas tentativas (com o orçamento da execução) e a base local de resultados.
+    Com `incremental`, links recentes e sem erro na base não são baixados de novo.
+    """
+    client: SerpApiClient
+    context: PipelineContext
+    fetch_pool: ThreadPoolExecutor
+    retry_policy: RetryPolicy
+    store: Optional[ResultStore] = None
+    incremental: bool = False
+
+
+@contextmanager
+def open_resources(incremental: Optional[bool] = None) -> Iterator[RunResources]:
+    """
+    Cria os recursos compartilhados e os fecha (sessão HTTP e caches) ao final.
+    As métricas da execução recomeçam do zero. Sem `incremental`, vale
+    `settings.INCREMENTAL_RECRAWL`.
+    """
+    reset_metrics()
+    preload_date_extractor()
+    cache = ResponseCache() if settings.SERPAPI_CACHE_ENABLED or settings.SERPAPI_OFFLINE else None
+    api_rate_limiter = TokenBucket(rate=1.0 / settings.PAUSE_SEC) if settings.PAUSE_SEC > 0 else None
+    retry_policy = RetryPolicy(budget=RetryBudget())
+    client = SerpApiClient(
+        cache=cache, offline=settings.SERPAPI_OFFLINE, rate_limiter=api_rate_limiter, retry_policy=retry_policy
+    )
+    page_cache = PageCache() if settings.PAGE_CACHE_ENABLED else None
+    parse_pool = ParsePool() if settings.PARSE_IN_PROCESSES else None
+    store = ResultStore() if settings.RESULT_STORE_ENABLED else None
+    incremental = settings.INCREMENTAL_RECRAWL if incremental is None else incremental
+    if incremental and store is None:
+        _log.warning("O modo incremental requer a base local (RESULT_STORE_ENABLED); todos os links serão baixados.")
+        incremental = False
+    context = PipelineContext(
+        page_cache=page_cache, scheduler=HostScheduler(), link_memo=LinkMemo(), breaker=CircuitBreaker(),
+        parse_pool=parse_pool
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=settings.FETCH_WORKERS, thread_name_prefix="fetch") as fetch_pool:
+            yield RunResources(client=client, context=context, fetch_pool=fetch_pool, retry_policy=retry_policy, store=store,
+                               incremental=incremental)
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+        if store is not None:
+            store.close()
+        close_session()
+        if cache is not None:
+            cache.close()
+        if page_cache is not None:
+            stats = page_cache.stats
+            _log.info("Cache de páginas: %d hits, %d misses, %d bytes economizados.", stats.hits, stats.misses, stats.bytes_saved)
+            page_cache.close()
+        _log.info("Links únicos processados: %d (%d repetidos reaproveitados).", len(context.link_memo), context.link_memo.hits)
+        _log.info("Novas tentativas usadas: %d de %d.", retry_policy.budget.used, retry_policy.budget.max_retries)
+
+
+def write_metrics_report(output_path: str, **extra) -> Optional[str]:
+    """
+    Grava o resumo das métricas da execução ao lado de `output_path`
+    (`<saída>.metrics.json`) e, se configurado, o arquivo texto do Prometheus.
+    """
+    metrics = get_metrics()
+    if settings.METRICS_PROMETHEUS_FILE:
+        metrics.write_prometheus(settings.METRICS_PROMETHEUS_FILE)
+    if not settings.METRICS_ENABLED:
+        return None
+    path = metrics.write_json(metrics_path_for(output_path), output=output_path, **extra)
+    _log.info("Métricas da execução em: %s", path)
+    return path
+
+
+def plan_pagination(engine: str, pages: Optional[int] = None, results_per_page: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Converte o pedido (páginas × resultados por página) em (chamadas, `num` por chamada).
+    Com `settings.MAXIMIZE_PAGE_SIZE`, usa o maior `num` que o buscador aceita para
+    obter o mesmo total de resultados com menos chamadas à API.
+    """
+    pages = settings.PAGES if pages is None else pages
+    results_per_page = results_per_page or settings.RESULTS_PER_PAGE
+    if not settings.MAXIMIZE_PAGE_SIZE:
+        return pages, results_per_page
+    wanted = pages * results_per_page
+    num = max(1, min(MAX_RESULTS_PER_CALL.get(engine, results_per_page), wanted))
+    return math.ceil(wanted / num), num
+
+
+def run_job(journal: RunJournal, resources: RunResources, sink: Optional[ResultSink] = None, show_progress: bool = True) -> None:
+    """
+    Executa (ou retoma) uma consulta registrada em `journal`: busca as páginas pendentes
+    na SerpAPI, processa os links no pool compartilhado e registra cada resultado no
+    diário. Com `sink`, os resultados também são gravados na ordem das páginas.
+
+    A página N+1 é pedida à API enquanto os links da página N são baixados, mas só
+    depois de confirmar que a N não é a última: a paginação para quando os resultados
+    acabam, sem gastar chamadas com páginas vazias.
+
+    Links que falham por motivo transitório vão para uma fila reprocessada ao final
+    (`drain_deferred`); o novo resultado substitui o anterior no diário. Por fim, o diário
+    é copiado para a base local de resultados (`resources.store`).
+
+    No modo incremental (`resources.incremental`), os links de cada página são comparados
+    com a base numa única consulta: só os novos, os que falharam e os antigos demais são
+    baixados; os outros reaproveitam os campos gravados, com o instante do download original.
+    """
+    from tqdm import tqdm
+
+    state = journal.state
+    query, search_engine_api = state["query"], state["engine"]
+    pages, results_per_page = state["pages"], state["results_per_page"]
+    label = "Scholar" if search_engine_api == "google_scholar" else "Google"
+    # Páginas já concluídas numa execução anterior não são buscadas de novo
+    pending_pages = [page for page in range(pages) if not journal.is_page_done(page)]
+    deferred = DeferredRetryQueue()
+    reused = fetched = 0
+
+    def search_page(page: int):
+        return resources.client.search(query, start=page * results_per_page, num=results_per_page, engine=search_engine_api)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="serpapi") as api_pool:
+        next_index = 0
+        next_search = api_pool.submit(search_page, pending_pages[0]) if pending_pages else None
+        for page in tqdm(range(pages), desc=f"Páginas {label}", disable=not show_progress):
+            if journal.is_page_done(page):
+                if sink is not None:
+                    entries = journal.page_entries(page)
+                    sink.write_many(entries[position] for position in sorted(entries))
+                continue
+
+            current_search = next_search
+            next_index += 1
+            try:
+                data = current_search.result()
+            except Exception as e:
+                _log.error("Erro ao buscar dados da API para a página %d no %s: %s", page + 1, label, e)
+                data = None
+
+            # Pré-busca a próxima página da API enquanto os links desta são baixados;
+            # o balde de tokens do cliente mantém o intervalo mínimo entre chamadas
+            more = not data or has_more_results(data, page * results_per_page, results_per_page)
+            next_search = None
+            if more and next_index < len(pending_pages):
+                next_search = api_pool.submit(search_page, pending_pages[next_index])
+
+            if not data: # Verifica se data é None ou vazio
+                if data is not None:
+                    _log.warning("Nenhum dado retornado pela API para a página %d no %s.", page + 1, label)
+                continue # Pula para a próxima página em caso de erro na API (ela fica pendente no diário)
+
+            organic_results = data.get("organic_results", [])
+            if not organic_results:
+                _log.info("Nenhum resultado orgânico encontrado na página %d para %s.", page + 1, label)
+
+            # Numa página interrompida, apenas os links que faltam são processados
+            done = journal.page_entries(page)
+            pending_items = [item for position, item in enumerate(organic_results) if position not in done]
+
+            context, prior = resources.context, None
+            if resources.incremental:
+                prior = PriorResults(
+                    resources.store.latest_by_links(item.get("link", "") for item in pending_items),
+                    settings.RECRAWL_MAX_AGE_SEC
+                )
+                context = replace(context, prior=prior)
+
+            # Os links da página são baixados e extraídos em paralelo; a ordem dos resultados é preservada
+            page_results = process_results(pending_items, search_engine_api, executor=resources.fetch_pool, context=context)
+            for position in tqdm(range(len(organic_results)), desc=f"Resultados Página {page+1}", leave=False, disable=not show_progress):
+                if position in done:
+                    result = done[position]
+                else:
+                    result = next(page_results)
+                    stored = prior.reusable(organic_results[position].get("link", "")) if prior is not None else None
+                    if stored is not None:
+                        reused += 1
+                    else:
+                        fetched += 1
+                    journal.append(page, position, result, fetched_at=stored.fetched_at if stored is not None else None)
+                    if is_retryable_doc_type(result.doc_type):
+                        deferred.add(page, position, organic_results[position])
+                    # Uma linha por resultado: só em DEBUG, para o volume de log não crescer com a busca
+                    _log.debug("Processado: %.60s...", result.title)
+                if sink is not None:
+                    sink.write(result)
+
+            if not more:
+                journal.mark_exhausted(page)
+                _log.info("Fim dos resultados de '%.40s' (%s) na página %d.", query, label, page + 1)
+                break
+            journal.complete_page(page)
+            _log.info("Página %d de '%.40s' (%s) concluída.", page + 1, query, label)
+
+    if resources.incremental:
+        _log.info("Modo incremental em '%.40s' (%s): %d links reaproveitados da base, %d processados.", query, label, reused, fetched)
+    drain_deferred(journal, resources, deferred)
+    if resources.store is not None:
+        # Já com os resultados das novas tentativas; ao retomar, as linhas são substituídas
+        resources.store.record_journal(journal)
+
+
+def drain_deferred(journal: RunJournal, resources: RunResources, deferred: DeferredRetryQueue) -> None:
+    """
+    Reprocessa os links da fila em até `settings.RETRY_DEFERRED_ROUNDS` rodadas, com
+    backoff entre elas. Cada link consome uma unidade do orçamento de novas tentativas.
+    """
+    engine = journal.state["engine"]
+    policy = resources.retry_policy
+    memo = resources.context.link_memo
+    for round_index in range(settings.RETRY_DEFERRED_ROUNDS):
+        queued = deferred.drain()
+        if not queued:
+            return
+        allowed = [entry for entry in queued if policy.budget.try_consume()]
+        if len(allowed) < len(queued):
+            _log.warning("Orçamento de novas tentativas esgotado: %d links ficam com o erro original.", len(queued) - len(allowed))
+        if not allowed:
+            return
+        delay = policy.backoff(round_index)
+        _log.info("Nova tentativa de %d links em %.1fs (rodada %d).", len(allowed), delay, round_index + 1)
+        time.sleep(delay)
+        if memo is not None:
+            for entry in allowed:
+                memo.forget(entry.item.get("link", ""))
+
+        items = [entry.item for entry in allowed]
+        for entry, result in zip(allowed, process_results(items, engine, executor=resources.fetch_pool, context=resources.context)):
+            journal.append(entry.page, entry.position, result)
+            if is_retryable_doc_type(result.doc_type):
+                deferred.add(entry.page, entry.position, entry.item)
+            else:
+                _log.debug("Recuperado na nova tentativa: %.60s...", result.title)
+    if len(deferred):
+        _log.warning("%d links continuam com erro após as novas tentativas.", len(deferred))
+
+
+def export_journals(journals: Sequence[RunJournal], sink: ResultSink) -> None:
+    """
+    Grava no `sink` os resultados registrados nos diários, na ordem das execuções e
+    das páginas. Com `settings.DEDUPE_RESULTS`, documentos repetidos viram uma única
+    linha com os campos mais completos (a leitura é feita do disco, em streaming).
+    """
+    def source():
+        return chain.from_iterable(journal.iter_results() for journal in journals)
+
+    sink.write_many(deduplicate(source) if settings.DEDUPE_RESULTS else source())
+
+
+def export_store(
+    run_ids: Optional[Sequence[str]] = None,
+    query: Optional[str] = None,
+    engines: Sequence[str] = (),
+    store: Optional[ResultStore] = None
+) -> ResultSink:
+    """
+    Gera o arquivo de saída (no formato de `settings.EXPORT_FORMAT`) a partir da base local,
+    filtrando por execução, consulta e buscador. Para uma execução, reproduz o arquivo que
+    ela gerou: mesma ordem e, com `settings.DEDUPE_RESULTS`, a mesma deduplicação.
+    Devolve o destino já fechado (`path`, `rows`).
+    """
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Buscador desconhecido: {', '.join(unknown)}. Opções: {', '.join(ENGINES)}")
+    owned = store is None
+    store = store or ResultStore()
+    try:
+        apis = [ENGINES[engine] for engine in engines] or [None]
+        selected = list(dict.fromkeys(
+            run_id for api in apis for run_id in store.run_ids(query=query, engine=api)
+            if not run_ids or run_id in run_ids
+        ))
+        if not selected:
+            raise LookupError("Nenhuma execução da base corresponde aos filtros informados.")
+
+        def source():
+            return store.iter_results(run_ids=selected)
+
+        engine_name = "_".join(dict.fromkeys(api for api in apis if api)) or "base"
+        with open_sink(prefix=f"{OUTPUT_PREFIX}_base", engine_name=engine_name) as sink:
+            if settings.DEDUPE_RESULTS:
+                sink.write_many(deduplicate(source))
+            else:
+                # Sem deduplicação, as linhas vão da base ao arquivo em lotes colunares
+                for batch in store.iter_batches(run_ids=selected):
+                    sink.write_batch(batch)
+    finally:
+        if owned:
+            store.close()
+    _log.info("Arquivo exportado da base em: %s (%d resultados de %d execuções)", sink.path, sink.rows, len(selected))
+    return sink
+
+
+def run_to_file(journal: RunJournal, resources: RunResources, prefix: str = OUTPUT_PREFIX, show_progress: bool = True) -> ResultSink:
+    """
+    Executa a consulta do `journal` e gera seu arquivo de saída. Sem deduplicação nem
+    novas tentativas adiadas, as linhas são gravadas à medida que ficam prontas; caso
+    contrário, ao fim, a partir do diário.
+    Devolve o destino já fechado (`path`, `rows`).
+    """
+    sink = open_sink(prefix=prefix, engine_name=journal.state["engine_name"])
+    try:
+        # Deduplicação e novas tentativas adiadas alteram linhas depois de produzidas
+        if settings.DEDUPE_RESULTS or settings.RETRY_DEFERRED_ROUNDS:
+            run_job(journal, resources, show_progress=show_progress)
+            export_journals([journal], sink)
+        else:
+            run_job(journal, resources, sink=sink, show_progress=show_progress)
+    finally:
+        sink.close()
+    journal.finish(sink.path)
+    return sink
+
+
+@dataclass
+class BatchJob:
+    query: str
+    engine: str
+
+
+def load_queries(path: str) -> List[str]:
+    """
+    Lê um arquivo de consultas: uma por linha, ignorando linhas vazias e comentários (#).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _slug(text: str, max_length: int = 40) -> str:
+    return re.sub(r"[^0-9a-zA-Z]+", "-", text).strip("-").lower()[:max_length].rstrip("-") or "consulta"
+
+
+def run_batch(
+    queries: Sequence[str],
+    engines: Sequence[str] = ("google",),
+    merge: bool = False,
+    concurrency: Optional[int] = None,
+    incremental: Optional[bool] = None
+) -> List[str]:
+    """
+    Executa consultas × buscadores num único processo, sem interação. As consultas rodam
+    em paralelo (`settings.BATCH_CONCURRENCY`) sobre os mesmos pools de conexão, caches
+    e memo de links, de modo que um link retornado por várias consultas é baixado uma vez.
+
+    Gera um arquivo por consulta/buscador ou, com `merge`, um único arquivo na ordem do
+    lote, com os documentos repetidos unidos entre consultas e buscadores. Devolve os
+    caminhos gerados. `incremental` é repassado a `open_resources`.
+    """
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Buscador desconhecido: {', '.join(unknown)}. Opções: {', '.join(ENGINES)}")
+    jobs = [BatchJob(query, ENGINES[engine]) for query in queries for engine in engines]
+    if not jobs:
+        return []
+
+    journals = [
+        RunJournal.create(job.engine, job.engine, job.query, *plan_pagination(job.engine))
+        for job in jobs
+    ]
+    for journal in journals:
+        _log.info("Lote: execução %s para '%.50s' (%s).", journal.run_id, journal.state["query"], journal.state["engine"])
+
+    def execute(index: int, journal: RunJournal, resources: RunResources) -> Optional[str]:
+        try:
+            if merge:
+                run_job(journal, resources, show_progress=False)
+                return None
+            prefix = f"{OUTPUT_PREFIX}_{index + 1:03d}_{_slug(journal.state['query'])}"
+            return run_to_file(journal, resources, prefix=prefix, show_progress=False).path
+        finally:
+            journal.close()
+
+    workers = max(1, min(concurrency or settings.BATCH_CONCURRENCY, len(jobs)))
+    engine_name = "_".join(dict.fromkeys(job.engine for job in jobs))
+    with open_resources(incremental=incremental) as resources:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as job_pool:
+            futures = [job_pool.submit(execute, index, journal, resources) for index, journal in enumerate(journals)]
+            paths = [future.result() for future in futures]
+
+    if not merge:
+        # Um único resumo para o lote (os recursos e as métricas são compartilhados)
+        write_metrics_report(build_output_path(f"{OUTPUT_PREFIX}_lote", engine_name, settings.EXPORT_FORMAT), jobs=len(jobs))
+        return paths
+
+    # Arquivo único: reaproveita os diários em disco, na ordem do lote
+    with open_sink(prefix=f"{OUTPUT_PREFIX}_lote", engine_name=engine_name) as sink:
+        export_journals(journals, sink)
+    for journal in journals:
+        journal.finish(sink.path)
+    _log.info("Arquivo do lote em: %s (%d resultados)", sink.path, sink.rows)
+    write_metrics_report(sink.path, jobs=len(jobs), rows=sink.rows)
+    return [sink.path]
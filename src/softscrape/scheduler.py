@@ -0,0 +1,133 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .config import settings
+
+
+class TokenBucket:
+    """
+    Balde de tokens thread-safe: `rate` tokens por segundo, até `capacity` acumulados.
+    `acquire` bloqueia apenas a thread chamadora até haver token disponível.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if rate <= 0:
+            raise ValueError("A taxa do balde de tokens deve ser positiva.")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Consome `tokens`, esperando o necessário. Devolve o tempo total esperado (s).
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Suspende a emissão de tokens por `seconds` (ex.: Retry-After de um 429) e zera o saldo.
+        """
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostScheduler:
+    """
+    Escalonador de cortesia por domínio (chave: `extract_base(link)`): limita as
+    requisições simultâneas a cada host e a taxa de cada um com um balde de tokens.
+    Hosts diferentes não se bloqueiam entre si.
+    """
+
+    def __init__(
+        self,
+        max_per_host: Optional[int] = None,
+        rate_per_host: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retry_after: Optional[float] = None
+    ):
+        self.max_per_host = max_per_host or settings.HOST_MAX_CONCURRENCY
+        self.rate_per_host = rate_per_host or settings.HOST_RATE_PER_SEC
+        self.burst = burst or settings.HOST_BURST
+        self.max_retry_after = settings.RETRY_AFTER_MAX_SEC if max_retry_after is None else max_retry_after
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str) -> Tuple[threading.BoundedSemaphore, TokenBucket]:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+            return self._semaphores[host], self._buckets[host]
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        """
+        Reserva uma vaga de concorrência e um token do host durante a requisição.
+        """
+        semaphore, bucket = self._host_state(host)
+        with semaphore:
+            bucket.acquire()
+            yield
+
+    def penalize(self, host: str, retry_after: Optional[float]) -> None:
+        """
+        Respeita um 429/503: pausa o host pelo Retry-After (limitado a `max_retry_after`),
+        ou por um intervalo de token quando o servidor não informa o tempo.
+        """
+        _, bucket = self._host_state(host)
+        delay = 1.0 / self.rate_per_host if retry_after is None else retry_after
+        bucket.pause(min(delay, self.max_retry_after))
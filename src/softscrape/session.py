@@ -0,0 +1,61 @@
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import settings
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def default_headers() -> Dict[str, str]:
+    """
+    Cabeçalhos enviados em todas as requisições do pacote.
+    """
+    return {"User-Agent": settings.USER_AGENT}
+
+
+def build_session(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None
+) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pools de conexão por host (keep-alive) e cabeçalhos padrão.
+
+    `pool_connections` é a quantidade de hosts mantidos em cache e `pool_maxsize`
+    o número de conexões reaproveitáveis por host.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or settings.HTTP_POOL_MAXSIZE
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(default_headers())
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Devolve a sessão compartilhada do processo, criando-a no primeiro uso.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def close_session() -> None:
+    """
+    Fecha a sessão compartilhada e libera as conexões abertas.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,261 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import settings
+from .journal import RunJournal
+from .logger import get_logger
+from .models import FIELD_NAMES, ResultBatch, SearchResult
+from .urls import canonicalize_url, dedupe_key
+
+_log = get_logger("ResultStore")
+
+STORE_PATH = os.path.join(os.path.dirname(__file__), "outputs", "results.sqlite3")
+RESULT_COLUMNS = list(FIELD_NAMES)
+# Linhas lidas por vez na exportação
+READ_CHUNK_SIZE = 1000
+# Chaves por consulta `IN (...)`, abaixo do limite de parâmetros do SQLite
+LOOKUP_CHUNK_SIZE = 500
+
+
+def title_hash(title: str) -> str:
+    """
+    Hash do título normalizado (sem acentos, pontuação nem diferença de caixa), para achar
+    o mesmo trabalho sob links diferentes. String vazia para títulos vazios.
+    """
+    normalized = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode("ascii")
+    normalized = " ".join(re.sub(r"[^0-9a-z]+", " ", normalized.lower()).split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16] if normalized else ""
+
+
+@dataclass
+class StoredResult:
+    """
+    Um resultado gravado na base e o instante (epoch) em que seu documento foi baixado.
+    """
+    result: SearchResult
+    fetched_at: float
+
+
+class ResultStore:
+    """
+    Base local (SQLite) com os resultados de todas as execuções: cada linha guarda os
+    campos do `SearchResult`, a execução (consulta e buscador) e a posição em que
+    apareceu. Índices na chave canônica do link, no domínio, no ano e no hash do título
+    respondem "já vimos este trabalho?" sem juntar CSVs. Em modo WAL, outros processos
+    podem ler a base enquanto uma execução grava; as inserções são feitas em lotes, cada
+    lote numa transação.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: Optional[int] = None):
+        self.path = path or settings.RESULT_STORE_PATH or STORE_PATH
+        self.batch_size = batch_size or settings.RESULT_STORE_BATCH_SIZE
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Any, ...]] = []
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Em WAL, NORMAL só arrisca a última transação numa queda de energia, nunca a integridade
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY,"
+            " query TEXT NOT NULL,"
+            " engine TEXT NOT NULL,"
+            " engine_name TEXT NOT NULL,"
+            " created_at TEXT NOT NULL,"
+            " recorded_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " run_id TEXT NOT NULL REFERENCES runs (run_id),"
+            " page INTEGER NOT NULL,"
+            " position INTEGER NOT NULL,"
+            + "".join(f" {column} TEXT NOT NULL," for column in RESULT_COLUMNS) +
+            " link_key TEXT NOT NULL,"
+            " title_hash TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (run_id, page, position))"
+        )
+        for column in ("link_key", "base", "year", "title_hash"):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_results_{column} ON results ({column})")
+        self._conn.commit()
+
+    def record_run(self, run_id: str, query: str, engine: str, engine_name: str, created_at: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, query, engine, engine_name, created_at, recorded_at) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (run_id) DO UPDATE SET recorded_at = excluded.recorded_at",
+                (run_id, query, engine, engine_name, created_at, time.time())
+            )
+            self._conn.commit()
+
+    def add(self, run_id: str, page: int, position: int, result: SearchResult, fetched_at: Optional[float] = None) -> None:
+        """
+        Enfileira um resultado; a fila é gravada numa única transação a cada `batch_size`
+        linhas (ou em `flush`). Uma posição já gravada na mesma execução é substituída.
+        """
+        row = (
+            run_id, page, position, *result.to_row(),
+            dedupe_key(result.link) if result.link else "", title_hash(result.title),
+            time.time() if fetched_at is None else fetched_at
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" * len(self._pending[0]))
+        with self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO results VALUES ({placeholders})", self._pending)
+        self._pending = []
+
+    def record_journal(self, journal: RunJournal) -> int:
+        """
+        Grava (ou regrava, ao retomar) a execução e todos os resultados do seu diário.
+        Devolve o número de resultados gravados.
+        """
+        state = journal.state
+        self.record_run(journal.run_id, state["query"], state["engine"], state["engine_name"], state["created_at"])
+        count = 0
+        for page in range(state["pages"]):
+            records = journal.page_records(page)
+            for position in sorted(records):
+                # Resultados reaproveitados (modo incremental) mantêm o instante do download original
+                result, fetched_at = records[position]
+                self.add(journal.run_id, page, position, result, fetched_at=fetched_at)
+                count += 1
+        self.flush()
+        return count
+
+    def iter_results(
+        self,
+        run_ids: Optional[Sequence[str]] = None,
+        query: Optional[str] = None,
+        engine: Optional[str] = None
+    ) -> Iterator[SearchResult]:
+        """
+        Resultados gravados, na ordem das execuções e, dentro de cada uma, na ordem da busca,
+        opcionalmente filtrados por execução, consulta e buscador. A leitura usa uma conexão
+        própria (somente leitura), então não disputa a conexão de gravação.
+        """
+        for rows in self._iter_chunks(run_ids, query, engine):
+            for row in rows:
+                yield SearchResult(*row)
+
+    def iter_batches(
+        self,
+        run_ids: Optional[Sequence[str]] = None,
+        query: Optional[str] = None,
+        engine: Optional[str] = None
+    ) -> Iterator[ResultBatch]:
+        """
+        Como `iter_results`, em lotes colunares de até `READ_CHUNK_SIZE` linhas, montados
+        direto das linhas lidas (sem um `SearchResult` por linha).
+        """
+        for rows in self._iter_chunks(run_ids, query, engine):
+            batch = ResultBatch()
+            for row in rows:
+                batch.append_row(row)
+            yield batch
+
+    def _iter_chunks(
+        self,
+        run_ids: Optional[Sequence[str]],
+        query: Optional[str],
+        engine: Optional[str]
+    ) -> Iterator[List[Tuple[str, ...]]]:
+        conditions, params = [], []
+        if run_ids:
+            conditions.append(f"r.run_id IN ({', '.join('?' * len(run_ids))})")
+            params.extend(run_ids)
+        if query is not None:
+            conditions.append("runs.query = ?")
+            params.append(query)
+        if engine is not None:
+            conditions.append("runs.engine = ?")
+            params.append(engine)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            f"SELECT {', '.join(f'r.{column}' for column in RESULT_COLUMNS)} FROM results r"
+            f" JOIN runs ON runs.run_id = r.run_id{where}"
+            " ORDER BY runs.created_at, r.run_id, r.page, r.position"
+        )
+        self.flush()
+        # URI montada pelo pathlib: `#`, `?` e `%` no caminho não viram fragmento/consulta
+        conn = sqlite3.connect(Path(self.path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(READ_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def latest_by_links(self, links: Iterable[str]) -> Dict[str, StoredResult]:
+        """
+        Para cada link já visto, o resultado do download mais recente entre todas as
+        execuções, indexado pela URL canônica (`urls.canonicalize_url`). A busca usa o
+        índice de `link_key`; entre as linhas com a mesma chave, só valem as do mesmo
+        endereço (o resumo e o PDF de um artigo do arXiv têm a mesma chave, não os mesmos campos).
+        """
+        wanted = {canonicalize_url(link) for link in links if link}
+        keys = list(dict.fromkeys(dedupe_key(link) for link in wanted))
+        latest: Dict[str, StoredResult] = {}
+        columns = ", ".join(RESULT_COLUMNS)
+        with self._lock:
+            self._flush_locked()
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT fetched_at, {columns} FROM results"
+                    f" WHERE link_key IN ({', '.join('?' * len(chunk))}) ORDER BY fetched_at",
+                    chunk
+                )
+                # Em ordem crescente de fetched_at: a última linha de cada endereço prevalece
+                for row in rows:
+                    result = SearchResult(*row[1:])
+                    url = canonicalize_url(result.link)
+                    if url in wanted:
+                        latest[url] = StoredResult(result, row[0])
+        return latest
+
+    def run_ids(self, query: Optional[str] = None, engine: Optional[str] = None) -> List[str]:
+        sql, params = "SELECT run_id FROM runs", []
+        conditions = []
+        if query is not None:
+            conditions.append("query = ?")
+            params.append(query)
+        if engine is not None:
+            conditions.append("engine = ?")
+            params.append(engine)
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql + " ORDER BY created_at, run_id", params)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
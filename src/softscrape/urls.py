@@ -0,0 +1,90 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parâmetros de rastreamento/sessão que não mudam o documento apontado. Nomes genéricos
+# (`source`, `ref`, `sid`, `share`, `via`, `campaign`...) ficam de fora: em muitos sites
+# eles fazem parte do endereço do conteúdo
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "yclid", "dclid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "ref_src", "spm", "cmpid", "jsessionid", "phpsessid"
+}
+TRACKING_PREFIXES = ("utm_", "hsa_", "pk_", "mtm_")
+
+DOI_PATTERN = re.compile(r"\b(10\.\d{4,9}/[^\s?#\"'<>]+)", re.IGNORECASE)
+# Sufixos que editoras penduram após o DOI para a mesma obra (visões HTML/PDF/resumo)
+DOI_TRAILING_SUFFIXES = ("/full", "/abstract", "/summary", "/pdf", "/epdf", "/pdfdirect", "/html", "/meta", ".pdf", ".full")
+ARXIV_PATTERN = re.compile(r"arxiv\.org/(?:abs|pdf|html)/(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?", re.IGNORECASE)
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Forma canônica de uma URL para comparação: http/https equivalentes, host em
+    minúsculas sem `www.` nem porta padrão, sem fragmento, sem parâmetros de
+    rastreamento e com os demais parâmetros ordenados. URLs inválidas voltam sem mudança.
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if port is not None and str(port) not in _DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def extract_doi(text: str) -> str:
+    """
+    DOI contido numa URL ou texto (ex.: doi.org/10.1145/..., /doi/pdf/10.1002/...),
+    em minúsculas e sem sufixos de visualização. String vazia se não houver.
+    """
+    if not text:
+        return ""
+    match = DOI_PATTERN.search(text)
+    if not match:
+        return ""
+    doi = match.group(1).rstrip(".,;)/").lower()
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in DOI_TRAILING_SUFFIXES:
+            if doi.endswith(suffix):
+                doi = doi[:-len(suffix)]
+                stripped = True
+    return doi
+
+
+def dedupe_key(url: str) -> str:
+    """
+    Chave de deduplicação de um link: o DOI quando presente, o identificador do arXiv
+    para espelhos abs/pdf e, nos demais casos, a URL canônica.
+    """
+    doi = extract_doi(url)
+    if doi:
+        return f"doi:{doi}"
+    arxiv = ARXIV_PATTERN.search(url or "")
+    if arxiv:
+        return f"arxiv:{arxiv.group(1).lower()}"
+    return canonicalize_url(url)
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
+
+# O módulo define uma chave fictícia da SerpAPI ao ser importado
+with patch.dict(os.environ):
+    from run_benchmark import Scenario, calibrate, compare, percentile, run_scenario, summarize
+import memory_benchmark
+
+class TestBenchmarkHelpers(unittest.TestCase):
+
+    def test_percentile_interpolates(self):
+        values = [0.4, 0.1, 0.3, 0.2]
+        self.assertAlmostEqual(percentile(values, 0.5), 0.25)
+        self.assertAlmostEqual(percentile(values, 0.95), 0.385)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_compare_flags_only_regressions_beyond_tolerance(self):
+        baseline = {"relative_throughput": 400.0, "results_per_sec": 20.0, "latency_p95_ms": 100.0, "peak_rss_mb": 60.0}
+        report = {"relative_throughput": 280.0, "results_per_sec": 5.0, "latency_p95_ms": 900.0, "peak_rss_mb": 61.0}
+
+        regressions = compare(report, baseline, tolerance=0.25)
+
+        # Vazão absoluta e latências são só informativas
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("relative_throughput"))
+
+    def test_compare_ignores_missing_metrics(self):
+        self.assertEqual(compare({"relative_throughput": 1.0, "peak_rss_mb": None}, {"relative_throughput": None, "peak_rss_mb": 60.0}), [])
+
+    def test_summarize_takes_the_median_of_runs(self):
+        reports = [
+            {"rows": 10, "results_per_sec": value, "relative_throughput": value * 10, "latency_p50_ms": 1.0}
+            for value in (12.0, 30.0, 15.0)
+        ]
+
+        summary = summarize(reports)
+
+        self.assertEqual((summary["results_per_sec"], summary["relative_throughput"]), (15.0, 150.0))
+        self.assertEqual((summary["runs"], summary["rows"]), (3, 10))
+        self.assertIsNone(summary["peak_rss_mb"])
+
+    def test_calibration_measures_pages_per_second(self):
+        self.assertGreater(calibrate(page_kb=4, rounds=1, round_sec=0.01), 0)
+
+    def test_memory_benchmark_ranks_representations(self):
+        report = memory_benchmark.run(results=2000, seed=1)
+
+        sizes = report["bytes_per_result"]
+        self.assertLess(sizes["slots"], sizes["dataclass"])
+        self.assertLess(sizes["batch"], sizes["slots"])
+        self.assertGreater(report["overhead_reduction"]["slots"], 0.5)
+
+class TestBenchmarkSmoke(unittest.TestCase):
+
+    def test_end_to_end_run_against_local_server(self):
+        scenario = Scenario(results=20, latency_ms=0.0, jitter_ms=0.0, error_rate=0.2, page_kb=8, seed=7)
+
+        report = run_scenario(scenario)
+
+        self.assertEqual(report["rows"], 20)
+        # As falhas transitórias (503 na primeira requisição) são recuperadas nas novas tentativas
+        self.assertEqual(report["error_rows"], 0)
+        self.assertGreater(report["results_per_sec"], 0)
+        self.assertLessEqual(report["latency_p50_ms"], report["latency_p95_ms"])
+        self.assertTrue({"search", "fetch", "parse", "export"} <= set(report["stages_sec"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.cache import PageCache, ResponseCache
+
+def _params(start=0, **overrides):
+    params = {"engine": "google", "q": "llm productivity", "api_key": "secret", "start": start, "num": 10, "hl": "pt", "gl": "br"}
+    params.update(overrides)
+    return params
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "serpapi.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_put_and_get(self):
+        cache = ResponseCache(self.path, ttl_sec=60, max_entries=10)
+        self.assertIsNone(cache.get(_params()))
+        cache.put(_params(), {"organic_results": [{"title": "A"}]})
+        self.assertEqual(cache.get(_params()), {"organic_results": [{"title": "A"}]})
+        cache.close()
+
+    def test_key_ignores_api_key_and_uses_search_params(self):
+        self.assertEqual(ResponseCache.make_key(_params()), ResponseCache.make_key(_params(api_key="other")))
+        self.assertNotEqual(ResponseCache.make_key(_params()), ResponseCache.make_key(_params(start=10)))
+        self.assertNotEqual(ResponseCache.make_key(_params()), ResponseCache.make_key(_params(engine="google_scholar")))
+        self.assertNotEqual(ResponseCache.make_key(_params()), ResponseCache.make_key(_params(gl="us")))
+
+    def test_persists_across_instances(self):
+        cache = ResponseCache(self.path, ttl_sec=60, max_entries=10)
+        cache.put(_params(), {"ok": True})
+        cache.close()
+        reopened = ResponseCache(self.path, ttl_sec=60, max_entries=10)
+        self.assertEqual(reopened.get(_params()), {"ok": True})
+        reopened.close()
+
+    def test_ttl_expiration(self):
+        cache = ResponseCache(self.path, ttl_sec=0.05, max_entries=10)
+        cache.put(_params(), {"ok": True})
+        time.sleep(0.1)
+        self.assertIsNone(cache.get(_params()))
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.path, ttl_sec=60, max_entries=2)
+        cache.put(_params(start=0), {"page": 0})
+        time.sleep(0.01)
+        cache.put(_params(start=10), {"page": 1})
+        time.sleep(0.01)
+        cache.get(_params(start=0)) # página 0 passa a ser a mais recente
+        time.sleep(0.01)
+        cache.put(_params(start=20), {"page": 2})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(_params(start=10)))
+        self.assertEqual(cache.get(_params(start=0)), {"page": 0})
+        cache.close()
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "pages.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_put_get_and_validators(self):
+        cache = PageCache(self.path, max_bytes=1024)
+        cache.put("http://example.com/a", "text/html", "utf-8", b"<html></html>", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        cached = cache.get("http://example.com/a")
+        self.assertEqual(cached.content, b"<html></html>")
+        self.assertEqual(cached.content_type, "text/html")
+        self.assertEqual(cache.validators(cached), {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        cache.close()
+
+    def test_pages_without_validators_are_not_stored(self):
+        cache = PageCache(self.path, max_bytes=1024)
+        cache.put("http://example.com/a", "text/html", "utf-8", b"<html></html>")
+        self.assertIsNone(cache.get("http://example.com/a"))
+        cache.close()
+
+    def test_max_bytes_eviction(self):
+        cache = PageCache(self.path, max_bytes=25)
+        cache.put("http://example.com/a", "text/html", None, b"a" * 10, etag="a")
+        time.sleep(0.01)
+        cache.put("http://example.com/b", "text/html", None, b"b" * 10, etag="b")
+        time.sleep(0.01)
+        cache.record_hit(cache.get("http://example.com/a"))
+        time.sleep(0.01)
+        cache.put("http://example.com/c", "text/html", None, b"c" * 10, etag="c")
+        self.assertIsNone(cache.get("http://example.com/b"))
+        self.assertIsNotNone(cache.get("http://example.com/a"))
+        self.assertLessEqual(cache.total_bytes, 25)
+        self.assertEqual(cache.stats.evicted, 1)
+        cache.put("http://example.com/big", "text/html", None, b"x" * 100, etag="big")
+        self.assertIsNone(cache.get("http://example.com/big"))
+        cache.close()
+
+    def test_stats(self):
+        cache = PageCache(self.path, max_bytes=1024)
+        cache.put("http://example.com/a", "text/html", None, b"12345", etag="a")
+        cache.record_miss()
+        cache.record_hit(cache.get("http://example.com/a"))
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.bytes_saved, 5)
+        cache.close()
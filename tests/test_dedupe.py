@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.dedupe import deduplicate, merge_results, result_key
+from softscrape.models import SearchResult
+
+def _result(link, **fields):
+    values = dict(title="", author="", abstract="", source="", year="", doc_type="", base="", link=link)
+    values.update(fields)
+    return SearchResult(**values)
+
+class TestDedupe(unittest.TestCase):
+
+    def test_merge_keeps_richer_fields(self):
+        google = _result("http://example.com/p", title="Paper", abstract="Short", doc_type="TIMEOUT")
+        scholar = _result("https://example.com/p", title="Paper", author="A Author", abstract="A much longer abstract",
+                          year="2023", doc_type="PDF")
+        merged = merge_results(google, scholar)
+        self.assertEqual(merged.link, "http://example.com/p")
+        self.assertEqual((merged.author, merged.abstract, merged.year, merged.doc_type),
+                         ("A Author", "A much longer abstract", "2023", "PDF"))
+
+    def test_merge_does_not_replace_real_doc_type_with_error(self):
+        merged = merge_results(_result("x", doc_type="HTML"), _result("x", doc_type="HTTP_ERROR_404"))
+        self.assertEqual(merged.doc_type, "HTML")
+
+    def test_deduplicate_preserves_first_occurrence_order(self):
+        results = [
+            _result("https://doi.org/10.1000/abc", title="First"),
+            _result("https://b.com/x"),
+            _result("https://journal.org/doi/full/10.1000/ABC", author="Writer"),
+            _result("", title="No link"),
+            _result("", title="No link"),
+            _result("http://www.b.com/x/?utm_source=feed", year="2020"),
+        ]
+        deduped = list(deduplicate(lambda: iter(results)))
+        self.assertEqual([r.link for r in deduped], ["https://doi.org/10.1000/abc", "https://b.com/x", "", ""])
+        self.assertEqual((deduped[0].title, deduped[0].author), ("First", "Writer"))
+        self.assertEqual(deduped[1].year, "2020")
+
+    def test_deduplicate_without_duplicates_is_identity(self):
+        results = [_result("https://a.com/1"), _result("https://a.com/2")]
+        self.assertEqual(list(deduplicate(lambda: iter(results))), results)
+
+    def test_result_key_without_link(self):
+        self.assertEqual(result_key(_result("")), "")
@@ -1,5 +1,7 @@
 import unittest
 import os
+import gzip
+import json
 import pandas as pd
 from datetime import datetime
 from typing import List
@@ -7,8 +9,8 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from softscrape.models import SearchResult
-from softscrape.exporters import to_csv, OUTPUT_DIR
+from softscrape.models import ResultBatch, SearchResult
+from softscrape.exporters import ResultSink, to_csv, export, open_sink, OUTPUT_DIR
 
 class TestExporters(unittest.TestCase):
 
@@ -24,7 +26,7 @@ class TestExporters(unittest.TestCase):
 
     def tearDown(self):
         for item in os.listdir(OUTPUT_DIR):
-            if item.startswith(self.prefix) and item.endswith(".csv"):
+            if item.startswith(self.prefix):
                 os.remove(os.path.join(OUTPUT_DIR, item))
 
     def test_to_csv_creates_file(self):
@@ -78,3 +80,82 @@ class TestExporters(unittest.TestCase):
         self.assertEqual(len(df), 0)
         expected_columns = list(SearchResult.__annotations__.keys())
         self.assertListEqual(list(df.columns), expected_columns)
+
+    def test_sink_writes_rows_as_they_arrive(self):
+        sink = open_sink("csv", prefix=self.prefix, engine_name=self.engine_name, compression="")
+        sink.write(self.results[0])
+        sink._file.flush()
+        self.assertEqual(len(pd.read_csv(sink.path)), 1)
+        sink.write(self.results[1])
+        path = sink.close()
+        self.assertEqual(sink.rows, 2)
+        self.assertEqual(list(pd.read_csv(path)["title"]), ["Test Title 1", "Test Title 2"])
+
+    def test_export_jsonl_gzip(self):
+        path = export(self.results, fmt="jsonl", prefix=self.prefix, engine_name=self.engine_name, compression="gzip")
+        self.assertTrue(path.endswith(".jsonl.gz"))
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[1]["author"], "Author B")
+        self.assertListEqual(list(rows[0].keys()), list(SearchResult.__annotations__.keys()))
+
+    def test_export_csv_gzip_matches_plain_csv(self):
+        plain = pd.read_csv(export(self.results, fmt="csv", prefix=self.prefix, engine_name=self.engine_name, compression=""))
+        compressed = pd.read_csv(export(self.results, fmt="csv", prefix=self.prefix, engine_name=self.engine_name, compression="gzip"))
+        pd.testing.assert_frame_equal(plain, compressed)
+
+    def test_export_zstd(self):
+        try:
+            import zstandard
+        except ImportError:
+            self.skipTest("zstandard não instalado")
+        path = export(self.results, fmt="jsonl", prefix=self.prefix, engine_name=self.engine_name, compression="zstd")
+        with zstandard.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_export_parquet(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow não instalado")
+        path = export(self.results, fmt="parquet", prefix=self.prefix, engine_name=self.engine_name, compression="")
+        table = pq.read_table(path)
+        self.assertEqual(table.column("title").to_pylist(), ["Test Title 1", "Test Title 2"])
+
+    def test_write_batch_matches_row_by_row_export(self):
+        batch = ResultBatch(self.results)
+        for fmt in ("csv", "jsonl"):
+            expected = export(self.results, fmt=fmt, prefix=self.prefix, engine_name=self.engine_name, compression="")
+            with open_sink(fmt, prefix=self.prefix, engine_name=self.engine_name, compression="",
+                           path=expected.replace(self.engine_name, f"{self.engine_name}_batch")) as sink:
+                sink.write_batch(batch)
+            self.assertEqual(sink.rows, 2)
+            with open(expected, encoding="utf-8") as original, open(sink.path, encoding="utf-8") as batched:
+                self.assertEqual(batched.read(), original.read())
+
+    def test_parquet_write_batch(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow não instalado")
+        with open_sink("parquet", prefix=self.prefix, engine_name=self.engine_name, compression="") as sink:
+            sink.write(self.results[1])
+            sink.write_batch(ResultBatch(self.results))
+        table = pq.read_table(sink.path)
+        self.assertEqual(table.column("title").to_pylist(), ["Test Title 2", "Test Title 1", "Test Title 2"])
+        self.assertEqual(table.schema.field("doc_type").type, pa.string())
+
+    def test_open_sink_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            open_sink("xlsx", prefix=self.prefix, engine_name=self.engine_name)
+        with self.assertRaises(ValueError):
+            open_sink("csv", prefix=self.prefix, engine_name=self.engine_name, compression="bz2")
+
+    def test_incomplete_sink_fails_on_creation(self):
+        class RowsOnlySink(ResultSink):
+            def _write_row(self, row):
+                pass
+
+        with self.assertRaises(TypeError):
+            RowsOnlySink("unused.csv")
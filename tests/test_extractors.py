@@ -12,10 +12,33 @@ from softscrape.extractors import (
     extract_author,
     extract_abstract,
     extract_year,
+    extract_page_year,
     extract_doc_type,
-    extract_base
+    classify_doc_type,
+    sniff_doc_type,
+    extract_base,
+    MetadataIndex,
+    AUTHOR_CSS_SELECTORS,
+    ABSTRACT_CSS_SELECTORS,
+    META_TAGS_AUTHOR,
+    META_TAGS_ABSTRACT
 )
 
+RICH_HTML_DOC = '''
+<html><head>
+<meta name="author" content="">
+<meta name="author" content="Shadowed Author">
+<meta name="citation_author" content="Citation Author">
+<meta property="og:description" content="OG description">
+</head><body>
+<div class="byline">By <span class="author">Inner Author</span></div>
+<div itemprop="author"><span itemprop="name">Item Name</span><span class="name">Item Class</span></div>
+<div class="abstract"><p>First part.</p><p>Second part.</p></div>
+<div class="paper-abstract-box"><p>Nested abstract.</p></div>
+<article><div class="entry-content"><p>Entry one.</p><p>Entry two.</p></div></article>
+</body></html>
+'''
+
 class TestExtractors(unittest.TestCase):
 
     def test_extract_author(self):
@@ -94,6 +117,24 @@ class TestExtractors(unittest.TestCase):
         soup = BeautifulSoup(html_doc, 'html.parser')
         self.assertEqual(extract_abstract(soup), "") # Changed from "Abstract via CSS Meta."
 
+    def test_metadata_index_matches_soup_queries(self):
+        soup = BeautifulSoup(RICH_HTML_DOC, 'html.parser')
+        index = MetadataIndex(soup)
+        for selector in AUTHOR_CSS_SELECTORS + ABSTRACT_CSS_SELECTORS:
+            self.assertEqual(index.select(selector), soup.select(selector), selector)
+            self.assertIs(index.select_one(selector), soup.select_one(selector), selector)
+        for attrs in META_TAGS_AUTHOR + META_TAGS_ABSTRACT:
+            self.assertIs(index.meta(attrs), soup.find("meta", attrs=attrs), attrs)
+
+    def test_extractors_accept_prebuilt_index(self):
+        soup = BeautifulSoup(RICH_HTML_DOC, 'html.parser')
+        index = MetadataIndex(soup)
+        # A primeira meta "author" tem conteúdo vazio e, como no soup.find, esconde a segunda
+        self.assertEqual(extract_author(index), "Citation Author")
+        self.assertEqual(extract_author(index), extract_author(soup))
+        self.assertEqual(extract_abstract(index), "OG description")
+        self.assertEqual(extract_abstract(index), extract_abstract(soup))
+
     def test_extract_year(self):
         self.assertEqual(extract_year("http://example.com/blog/2023/article.html"), "2023")
         self.assertEqual(extract_year("http://example.com/papers/1999/old_paper.pdf"), "1999")
@@ -102,8 +143,49 @@ class TestExtractors(unittest.TestCase):
         self.assertEqual(extract_year("http://example.com/archive/2005/doc.html"), "2005")
         self.assertEqual(extract_year(None), "") # Test for potential exception
 
-    @patch('softscrape.extractors.requests.head')
-    def test_extract_doc_type(self, mock_head):
+    def test_extract_page_year_sources_in_order(self):
+        html = '''<html><head>
+        <meta property="article:published_time" content="2019-03-01T10:00:00Z">
+        <meta name="citation_publication_date" content="2018/07/15">
+        <script type="application/ld+json">{"@type": "ScholarlyArticle", "datePublished": "2017-01-01"}</script>
+        </head><body></body></html>'''
+        self.assertEqual(extract_page_year(BeautifulSoup(html, "html.parser")), "2018")
+
+        html = '<html><head><meta property="article:published_time" content="2019-03-01T10:00:00Z"></head></html>'
+        self.assertEqual(extract_page_year(BeautifulSoup(html, "html.parser")), "2019")
+
+    def test_extract_page_year_from_json_ld(self):
+        html = '''<html><head>
+        <script type="application/ld+json">not json</script>
+        <script type="application/ld+json">{"@context": "https://schema.org", "@graph": [
+            {"@type": "WebSite", "name": "Site"},
+            {"@type": "Article", "datePublished": "2016-05-20T08:00:00+00:00"}
+        ]}</script>
+        </head><body></body></html>'''
+        self.assertEqual(extract_page_year(MetadataIndex(BeautifulSoup(html, "html.parser"))), "2016")
+
+    def test_extract_page_year_htmldate_fallback_on_same_tree(self):
+        html = ('<html><head><title>Post</title></head><body><article>'
+                '<time datetime="2015-09-12" class="entry-date published">12 Sep 2015</time>'
+                '<p>Text.</p></article></body></html>')
+        index = MetadataIndex(BeautifulSoup(html, "html.parser"))
+        import htmldate
+        with patch('htmldate.find_date', wraps=htmldate.find_date) as find_date, \
+             patch('softscrape.extractors.get_session') as mock_get_session:
+            self.assertEqual(extract_page_year(index), "2015")
+        # O htmldate recebe a árvore já convertida (não o HTML) e nada é baixado
+        self.assertEqual(find_date.call_args.args[0].tag, "html")
+        mock_get_session.assert_not_called()
+
+        with patch('softscrape.extractors.settings.HTMLDATE_FALLBACK', False):
+            self.assertEqual(extract_page_year(index), "")
+        # Documentos grandes demais não passam pelo htmldate
+        with patch('softscrape.extractors.settings.HTMLDATE_MAX_TAGS', 3):
+            self.assertEqual(extract_page_year(index), "")
+
+    @patch('softscrape.extractors.get_session')
+    def test_extract_doc_type(self, mock_get_session):
+        mock_head = mock_get_session.return_value.head
         mock_response_pdf = MagicMock()
         mock_response_pdf.headers = {"Content-Type": "application/pdf"}
         mock_response_pdf.raise_for_status = MagicMock()
@@ -149,6 +231,26 @@ class TestExtractors(unittest.TestCase):
         
         mock_head.side_effect = None 
 
+    def test_classify_doc_type_prefers_content_type(self):
+        self.assertEqual(classify_doc_type("application/pdf", b"<html>", "http://example.com/a.html"), "PDF")
+        self.assertEqual(classify_doc_type("text/html; charset=utf-8"), "HTML")
+        self.assertEqual(classify_doc_type("application/json"), "JSON")
+        self.assertEqual(classify_doc_type("image/png"), "IMAGE")
+
+    def test_classify_doc_type_sniffs_magic_bytes(self):
+        self.assertEqual(classify_doc_type("", b"%PDF-1.7\n%...", "http://example.com/download"), "PDF")
+        self.assertEqual(classify_doc_type("", b"\xef\xbb\xbf  <!DOCTYPE html><html>", ""), "HTML")
+        self.assertEqual(classify_doc_type("", b'<?xml version="1.0"?><html xmlns="http://www.w3.org/1999/xhtml">', ""), "HTML")
+        self.assertEqual(classify_doc_type("", b'<?xml version="1.0"?><feed>', ""), "XML")
+        self.assertEqual(classify_doc_type("", b' {"a": 1}', ""), "JSON")
+        self.assertEqual(sniff_doc_type(b""), "")
+
+    def test_classify_doc_type_falls_back_to_url_extension(self):
+        self.assertEqual(classify_doc_type("", b"binary", "http://example.com/paper.PDF?download=1"), "PDF")
+        self.assertEqual(classify_doc_type("", b"", "http://example.com/index.htm"), "HTML")
+        self.assertEqual(classify_doc_type("", b"", "http://example.com/download"), "")
+        self.assertEqual(classify_doc_type("", b"", None), "")
+
     def test_extract_base(self):
         self.assertEqual(extract_base("http://example.com/path/to/page?query=string#fragment"), "example.com")
         self.assertEqual(extract_base("https://www.another-example.co.uk:8080/path"), "www.another-example.co.uk:8080")
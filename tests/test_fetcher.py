@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import tempfile
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.cache import PageCache
+from softscrape.fetcher import fetch_page, fetch_range
+from softscrape.retry import CircuitBreaker, CircuitOpenError
+
+def _mock_response(status_code=200, headers=None, content=b"", encoding="utf-8"):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    resp.content = content
+    resp.iter_content.side_effect = lambda chunk_size: iter([content[i:i + 4] for i in range(0, len(content), 4)])
+    resp.encoding = encoding
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.exceptions.HTTPError(response=resp)
+    return resp
+
+class TestFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = PageCache(os.path.join(self.tmpdir.name, "pages.sqlite3"), max_bytes=1024 * 1024)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    @patch('softscrape.fetcher.get_session')
+    def test_fetch_page_without_cache(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = _mock_response(
+            headers={"Content-Type": "text/html; charset=utf-8"}, content="Olá".encode("utf-8"))
+        page = fetch_page("http://example.com/a")
+        self.assertEqual(page.content_type, "text/html; charset=utf-8")
+        self.assertEqual(page.text, "Olá")
+        self.assertFalse(page.from_cache)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_conditional_get_reuses_body_on_304(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = _mock_response(
+            headers={"Content-Type": "text/html", "ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+            content=b"<html>body</html>")
+        first = fetch_page("http://example.com/a", cache=self.cache)
+        self.assertFalse(first.from_cache)
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {})
+
+        mock_get.return_value = _mock_response(status_code=304)
+        second = fetch_page("http://example.com/a", cache=self.cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.content, b"<html>body</html>")
+        self.assertEqual(second.content_type, "text/html")
+        self.assertEqual(mock_get.call_args.kwargs["headers"],
+                         {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertEqual(self.cache.stats.bytes_saved, len(b"<html>body</html>"))
+
+    @patch('softscrape.fetcher.get_session')
+    def test_http_error_raised(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = _mock_response(status_code=503)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            fetch_page("http://example.com/a", cache=self.cache)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_429_penalizes_host(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = _mock_response(status_code=429, headers={"Retry-After": "7"})
+        scheduler = MagicMock()
+        with self.assertRaises(requests.exceptions.HTTPError):
+            fetch_page("https://dl.acm.org/doi/1", scheduler=scheduler)
+        scheduler.slot.assert_called_once_with("dl.acm.org")
+        scheduler.penalize.assert_called_once_with("dl.acm.org", 7.0)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_stops_at_head_when_check_passes(self, mock_get_session):
+        body = b"<html><head><meta name='author' content='A'></HEAD><body>" + b"x" * 1000 + b"</body></html>"
+        mock_get_session.return_value.get.return_value = _mock_response(headers={"Content-Type": "text/html"}, content=body)
+        seen = []
+        page = fetch_page("http://example.com/a", head_check=lambda head, encoding: seen.append(head) or True)
+        self.assertTrue(page.truncated)
+        self.assertTrue(page.content.endswith(b"</HEAD>"))
+        self.assertEqual(seen, [page.content])
+
+    @patch('softscrape.fetcher.get_session')
+    def test_reads_body_when_head_is_not_enough(self, mock_get_session):
+        body = b"<html><head></head><body><div class='abstract'><p>x</p></div></body></html>"
+        mock_get_session.return_value.get.return_value = _mock_response(headers={"Content-Type": "text/html"}, content=body)
+        page = fetch_page("http://example.com/a", head_check=lambda head, encoding: False)
+        self.assertFalse(page.truncated)
+        self.assertEqual(page.content, body)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_max_bytes_cap(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = _mock_response(headers={"Content-Type": "text/html"}, content=b"y" * 100)
+        page = fetch_page("http://example.com/a", max_bytes=10)
+        self.assertTrue(page.truncated)
+        self.assertEqual(page.content, b"y" * 10)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_pdf_body_is_not_downloaded(self, mock_get_session):
+        response = _mock_response(headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.7" + b"0" * 100)
+        mock_get_session.return_value.get.return_value = response
+        page = fetch_page("http://example.com/a.pdf")
+        self.assertEqual(page.content, b"")
+        self.assertTrue(page.truncated)
+        response.iter_content.assert_not_called()
+        response.close.assert_called_once()
+
+    @patch('softscrape.fetcher.get_session')
+    def test_fetch_range_partial_and_ignored(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = _mock_response(
+            status_code=206, headers={"Content-Range": "bytes 990-999/1000"}, content=b"startxref\n")
+        result = fetch_range("http://example.com/a.pdf", -10)
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"Range": "bytes=-10"})
+        self.assertEqual((result.content, result.start, result.total_size, result.partial), (b"startxref\n", 990, 1000, True))
+
+        # Servidor sem suporte a Range: só o início do arquivo, até max_bytes
+        mock_get.return_value = _mock_response(headers={"Content-Length": "1000"}, content=b"%PDF-1.7" + b"0" * 992)
+        result = fetch_range("http://example.com/a.pdf", 0, 99, max_bytes=16)
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"Range": "bytes=0-99"})
+        self.assertEqual((result.content, result.start, result.total_size, result.partial), (b"%PDF-1.7" + b"0" * 8, 0, 1000, False))
+
+    @patch('softscrape.fetcher.get_session')
+    def test_circuit_breaker_blocks_failing_host(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        mock_get.return_value = _mock_response(status_code=503)
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                fetch_page("http://flaky.com/a", breaker=breaker)
+        with self.assertRaises(CircuitOpenError):
+            fetch_page("http://flaky.com/b", breaker=breaker)
+        self.assertEqual(mock_get.call_count, 2)
+
+        # Erros permanentes (404) não contam como falha do host
+        mock_get.return_value = _mock_response(status_code=404)
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                fetch_page("http://other.com/missing", breaker=breaker)
+        self.assertFalse(breaker.is_open("other.com"))
+
@@ -0,0 +1,62 @@
+import unittest
+import subprocess
+import sys
+import os
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+# Orçamento absoluto do import a frio de `softscrape.main` (ms): opcional, só verificado
+# quando definido (o tempo absoluto varia demais entre máquinas)
+IMPORT_TIME_BUDGET_MS = os.getenv("SOFTSCRAPE_IMPORT_BUDGET_MS")
+# Sem orçamento absoluto, o import do pacote é comparado ao de `requests` (dependência
+# obrigatória) medido na mesma execução: no máximo este múltiplo dele
+IMPORT_TIME_BASELINE_RATIO = 2.5
+# Dependências pesadas que só devem ser carregadas no primeiro uso
+LAZY_MODULES = ("bs4", "soupsieve", "htmldate", "dateparser", "pandas", "tqdm", "pyarrow")
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+def _import_time_ms(module: str = "softscrape.main") -> float:
+    stderr = _run_python(f"import {module}", "-X", "importtime").stderr
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000.0
+    raise AssertionError(f"{module} não apareceu na saída de -X importtime")
+
+class TestImportTime(unittest.TestCase):
+
+    def test_heavy_dependencies_are_lazy(self):
+        code = "import sys, softscrape.main; print(','.join(m for m in %r if m in sys.modules))" % (LAZY_MODULES,)
+        loaded = _run_python(code).stdout.strip()
+        self.assertEqual(loaded, "", f"Importados no startup: {loaded}")
+
+    def test_import_time_relative_to_requests(self):
+        # Medições alternadas e o melhor de cada lado descartam o ruído de disco/CPU da máquina
+        package, baseline = [], []
+        for _ in range(3):
+            baseline.append(_import_time_ms("requests"))
+            package.append(_import_time_ms())
+        self.assertLess(min(package), min(baseline) * IMPORT_TIME_BASELINE_RATIO,
+                        f"import softscrape.main levou {min(package):.0f} ms (requests: {min(baseline):.0f} ms)")
+
+    @unittest.skipUnless(IMPORT_TIME_BUDGET_MS, "defina SOFTSCRAPE_IMPORT_BUDGET_MS para verificar o tempo absoluto")
+    def test_import_time_within_budget(self):
+        best = min(_import_time_ms() for _ in range(3))
+        self.assertLess(best, float(IMPORT_TIME_BUDGET_MS), f"import softscrape.main levou {best:.0f} ms")
+
+    def test_import_has_no_filesystem_side_effects(self):
+        code = (
+            "import logging, softscrape.main, softscrape.logger as lg; "
+            "print(lg.error_file_handler.stream is None)"
+        )
+        self.assertEqual(_run_python(code).stdout.strip(), "True")
+
+    def test_import_starts_no_threads(self):
+        code = (
+            "import threading, softscrape.main, softscrape.logger as lg; "
+            "print(threading.active_count(), lg._listener_started)"
+        )
+        self.assertEqual(_run_python(code).stdout.strip(), "1 False")
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.journal import RunJournal
+from softscrape.models import SearchResult
+
+def _result(title):
+    return SearchResult(title=title, author="", abstract="", source="", year="", doc_type="HTML", base="example.com", link=f"http://example.com/{title}")
+
+class TestRunJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _create(self, pages=3):
+        return RunJournal.create("google", "google", "query", pages=pages, results_per_page=10, directory=self.tmpdir.name)
+
+    def test_create_and_open(self):
+        journal = self._create()
+        reopened = RunJournal.open(journal.run_id, directory=self.tmpdir.name)
+        self.assertEqual(reopened.state["engine"], "google")
+        self.assertEqual(reopened.state["next_start"], 0)
+        with self.assertRaises(FileNotFoundError):
+            RunJournal.open("missing", directory=self.tmpdir.name)
+
+    def test_complete_page_records_next_offset(self):
+        journal = self._create()
+        journal.append(0, 0, _result("a"))
+        journal.complete_page(0)
+        self.assertEqual(journal.state["next_start"], 10)
+        journal.complete_page(2)
+        self.assertEqual(journal.state["next_start"], 10)
+        journal.complete_page(1)
+        self.assertIsNone(journal.state["next_start"])
+        reopened = RunJournal.open(journal.run_id, directory=self.tmpdir.name)
+        self.assertTrue(reopened.is_page_done(1))
+
+    def test_mark_exhausted_drops_later_pages(self):
+        journal = self._create(pages=5)
+        journal.append(0, 0, _result("a"))
+        journal.mark_exhausted(1)
+        self.assertEqual(journal.state["pages"], 2)
+        self.assertEqual(journal.state["next_start"], 0)
+        journal.complete_page(0)
+        self.assertIsNone(journal.state["next_start"])
+        self.assertEqual([r.title for r in journal.iter_results()], ["a"])
+
+    def test_partial_page_positions_survive_interruption(self):
+        journal = self._create()
+        journal.append(1, 0, _result("a"))
+        journal.append(1, 2, _result("c"))
+        journal.close()
+        # Simula uma linha cortada no meio por um Ctrl-C
+        with open(journal._page_path(1), "a", encoding="utf-8") as f:
+            f.write('{"position": 3, "res')
+        reopened = RunJournal.open(journal.run_id, directory=self.tmpdir.name)
+        self.assertFalse(reopened.is_page_done(1))
+        self.assertEqual(reopened.done_positions(1), {0, 2})
+
+    def test_iter_results_in_page_and_position_order(self):
+        journal = self._create()
+        journal.append(1, 1, _result("d"))
+        journal.append(1, 0, _result("c"))
+        journal.complete_page(1)
+        journal.append(0, 0, _result("a"))
+        journal.append(0, 1, _result("b"))
+        journal.complete_page(0)
+        self.assertEqual([r.title for r in journal.iter_results()], ["a", "b", "c", "d"])
+
+    def test_reused_results_keep_their_fetch_time(self):
+        journal = self._create()
+        journal.append(0, 0, _result("a"), fetched_at=1700000000.5)
+        journal.append(0, 1, _result("b"))
+        journal.close()
+        reopened = RunJournal.open(journal.run_id, directory=self.tmpdir.name)
+        self.assertEqual(reopened.page_records(0), {0: (_result("a"), 1700000000.5), 1: (_result("b"), None)})
+        self.assertEqual(reopened.page_entries(0), {0: _result("a"), 1: _result("b")})
@@ -1,11 +1,19 @@
 import unittest
 import logging
+import json
 import os
 import sys
+import threading
+from logging.handlers import QueueHandler
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from softscrape.logger import get_logger, ERROR_LOG_FILE_PATH, ERROR_LOG_DIR, LOG_DIR_PATH
+import softscrape.logger
+from softscrape.logger import (
+    get_logger, flush_logging, DomainRateLimitFilter, JsonLinesFormatter,
+    ERROR_LOG_FILE_PATH, ERROR_LOG_DIR, LOG_DIR_PATH
+)
 
 class TestLogger(unittest.TestCase):
 
@@ -16,13 +24,7 @@ class TestLogger(unittest.TestCase):
         if os.path.exists(ERROR_LOG_FILE_PATH):
             os.remove(ERROR_LOG_FILE_PATH)
         
-        root_logger = logging.getLogger()
-        for handler in root_logger.handlers[:]:
-            handler.close() 
-            root_logger.removeHandler(handler)
-        
-        import softscrape.logger
-        softscrape.logger._handlers_configured = False
+        self._reset_logging()
 
     def tearDown(self):
         if os.path.exists(ERROR_LOG_FILE_PATH):
@@ -38,33 +40,72 @@ class TestLogger(unittest.TestCase):
                 # print(f"Warning: Could not remove directory in tearDown: {e}")
                 pass 
         
+        self._reset_logging()
+
+    def _reset_logging(self):
+        softscrape.logger.shutdown_logging()
         root_logger = logging.getLogger()
         for handler in root_logger.handlers[:]:
             handler.close()
             root_logger.removeHandler(handler)
-        
-        import softscrape.logger
-        softscrape.logger._handlers_configured = False
 
     def _flush_loggers(self):
-        root_logger = logging.getLogger()
-        for handler in root_logger.handlers:
-            handler.flush()
+        flush_logging()
+
+    def _listener_handlers(self):
+        return softscrape.logger.listener.handlers
 
     def test_get_logger_returns_logger_instance(self):
         logger = get_logger("TestLogger")
         self.assertIsInstance(logger, logging.Logger)
         self.assertEqual(logger.name, "TestLogger")
 
+    def test_root_logger_only_enqueues(self):
+        get_logger("QueueTest")
+        root_logger = logging.getLogger()
+        self.assertEqual([type(h) for h in root_logger.handlers if isinstance(h, QueueHandler)], [softscrape.logger._LocalQueueHandler])
+        self.assertFalse(any(isinstance(h, logging.FileHandler) for h in root_logger.handlers))
+
     def test_logger_has_console_handler(self):
         logger = get_logger("ConsoleTest")
-        root_logger = logging.getLogger()
-        self.assertTrue(any(isinstance(h, logging.StreamHandler) and h.stream == sys.stdout for h in root_logger.handlers))
+        self.assertTrue(any(isinstance(h, logging.StreamHandler) and h.stream == sys.stdout for h in self._listener_handlers()))
 
     def test_logger_has_error_file_handler(self):
         logger = get_logger("FileTest")
-        root_logger = logging.getLogger()
-        self.assertTrue(any(isinstance(h, logging.FileHandler) and h.baseFilename == ERROR_LOG_FILE_PATH for h in root_logger.handlers))
+        self.assertTrue(any(isinstance(h, logging.FileHandler) and h.baseFilename == ERROR_LOG_FILE_PATH for h in self._listener_handlers()))
+
+    def test_listener_starts_on_first_record(self):
+        logger = get_logger("LazyListenerTest")
+        self.assertFalse(softscrape.logger._listener_started)
+        logger.info("Primeiro registro")
+        self.assertTrue(softscrape.logger._listener_started)
+
+    def test_configure_logging_starts_listener(self):
+        softscrape.logger.configure_logging()
+        self.assertTrue(softscrape.logger._listener_started)
+
+    def test_flush_waits_without_restarting_listener(self):
+        logger = get_logger("FlushTest")
+        logger.error("Antes do flush")
+        with patch.object(softscrape.logger.listener, "stop") as mock_stop:
+            self._flush_loggers()
+        mock_stop.assert_not_called()
+        with open(ERROR_LOG_FILE_PATH, 'r') as f:
+            self.assertIn("Antes do flush", f.read())
+
+    def test_messages_are_formatted_in_listener_thread(self):
+        logger = get_logger("LazyFormatTest")
+        formatted_in = []
+
+        class Argument:
+            def __str__(self):
+                formatted_in.append(threading.current_thread())
+                return "valor"
+
+        logger.info("Mensagem com %s", Argument())
+        self._flush_loggers()
+        self.assertTrue(formatted_in)
+        self.assertNotIn(threading.current_thread(), formatted_in)
 
     def test_error_log_file_created_on_error(self):
         logger = get_logger("ErrorLogCreationTest")
@@ -109,3 +150,63 @@ class TestLogger(unittest.TestCase):
         get_logger("TestOnce2")
         self.assertEqual(len(root_logger.handlers), initial_handler_count)
         self.assertTrue(softscrape.logger._handlers_configured)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestDomainRateLimitFilter(unittest.TestCase):
+
+    def _record(self, domain, level=logging.WARNING, msg="Falha em %s"):
+        record = logging.LogRecord("Pipeline", level, __file__, 1, msg, (domain,), None)
+        record.domain = domain
+        return record
+
+    def test_limits_warnings_per_domain_and_reports_suppressed(self):
+        clock = FakeClock()
+        rate_filter = DomainRateLimitFilter(limit=2, window=60, clock=clock)
+
+        accepted = [rate_filter.filter(self._record("a.com")) for _ in range(5)]
+        self.assertEqual(accepted, [True, True, False, False, False])
+        # Outros domínios e outros níveis não são afetados
+        self.assertTrue(rate_filter.filter(self._record("b.com")))
+        self.assertTrue(rate_filter.filter(self._record("a.com", level=logging.ERROR)))
+
+        clock.now = 61
+        record = self._record("a.com")
+        self.assertTrue(rate_filter.filter(record))
+        self.assertEqual(record.getMessage(), "Falha em a.com (+3 avisos semelhantes de a.com suprimidos)")
+
+    def test_drain_suppressed_reports_pending_counts(self):
+        rate_filter = DomainRateLimitFilter(limit=1, window=60, clock=FakeClock())
+        for _ in range(4):
+            rate_filter.filter(self._record("a.com"))
+        rate_filter.filter(self._record("b.com"))
+
+        self.assertEqual(rate_filter.drain_suppressed(), {"a.com": 3})
+        self.assertEqual(rate_filter.drain_suppressed(), {})
+
+    def test_records_without_domain_pass(self):
+        rate_filter = DomainRateLimitFilter(limit=1, window=60, clock=FakeClock())
+        record = logging.LogRecord("Runner", logging.WARNING, __file__, 1, "Aviso", None, None)
+        self.assertTrue(all(rate_filter.filter(record) for _ in range(3)))
+
+class TestJsonLinesFormatter(unittest.TestCase):
+
+    def test_formats_one_json_object_per_record(self):
+        record = logging.LogRecord("Pipeline", logging.WARNING, __file__, 1, "Erro HTTP %d ao acessar %s", (503, "http://a.com/x"), None)
+        record.domain = "a.com"
+
+        entry = json.loads(JsonLinesFormatter().format(record))
+
+        self.assertEqual(entry["level"], "WARNING")
+        self.assertEqual(entry["logger"], "Pipeline")
+        self.assertEqual(entry["message"], "Erro HTTP 503 ao acessar http://a.com/x")
+        self.assertEqual(entry["domain"], "a.com")
+        self.assertIn("ts", entry)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import softscrape.main as main
+from softscrape.journal import RunJournal
+from softscrape.models import SearchResult
+
+def _fake_process_results(items, search_engine_api, executor=None, context=None):
+    for item in items:
+        yield SearchResult(title=item["title"], author="", abstract="", source="", year="", doc_type="HTML", base="", link=item["link"])
+
+class _FakeSink:
+    def __init__(self, exported):
+        self.path = "out.csv"
+        self.rows = 0
+        self._results = []
+        exported.append(self._results)
+
+    def write(self, result):
+        self._results.append(result)
+        self.rows += 1
+
+    def write_many(self, results):
+        for result in results:
+            self.write(result)
+
+    def close(self):
+        return self.path
+
+class TestMainResume(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.exported = []
+        patches = [
+            patch('softscrape.journal.RUNS_DIR', self.tmpdir.name),
+            patch('softscrape.runner.process_results', side_effect=_fake_process_results),
+            patch('softscrape.runner.open_sink', side_effect=lambda **kwargs: _FakeSink(self.exported)),
+            patch('softscrape.runner.ResponseCache'),
+            patch('softscrape.runner.PageCache'),
+            patch('softscrape.runner.settings.PAUSE_SEC', 0),
+            patch('softscrape.runner.settings.METRICS_ENABLED', False),
+            patch('softscrape.store.STORE_PATH', os.path.join(self.tmpdir.name, "results.sqlite3")),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_resume_skips_completed_pages_and_links(self, mock_client_cls):
+        journal = RunJournal.create("google", "google", "query", pages=2, results_per_page=2)
+        journal.append(0, 0, SearchResult(title="p0-0", author="", abstract="", source="", year="", doc_type="HTML", base="", link="l00"))
+        journal.append(0, 1, SearchResult(title="p0-1", author="", abstract="", source="", year="", doc_type="HTML", base="", link="l01"))
+        journal.complete_page(0)
+        journal.append(1, 0, SearchResult(title="p1-0", author="", abstract="", source="", year="", doc_type="HTML", base="", link="l10"))
+        journal.close()
+
+        mock_client_cls.return_value.search.return_value = {
+            "organic_results": [{"title": "p1-0", "link": "l10"}, {"title": "p1-1", "link": "l11"}]
+        }
+        main.run(resume=journal.run_id)
+
+        mock_client_cls.return_value.search.assert_called_once_with("query", start=2, num=2, engine="google")
+        self.assertEqual([r.title for r in self.exported[0]], ["p0-0", "p0-1", "p1-0", "p1-1"])
+        state = RunJournal.open(journal.run_id).state
+        self.assertEqual(state["completed_pages"], [0, 1])
+        self.assertEqual(state["csv_path"], "out.csv")
+
+    def test_parse_args(self):
+        self.assertEqual(main.parse_args(["--resume", "abc"]).resume, "abc")
+        self.assertIsNone(main.parse_args([]).resume)
+
+    def test_parse_args_batch_options(self):
+        args = main.parse_args(["--batch", "queries.txt", "--engine", "google", "scholar", "--merge"])
+        self.assertEqual((args.batch, args.engine, args.merge), ("queries.txt", ["google", "scholar"], True))
+
+    @patch('softscrape.main.run_batch')
+    @patch('softscrape.main.run')
+    def test_main_dispatches_batch_and_single_runs(self, mock_run, mock_run_batch):
+        main.main(["--engine", "scholar", "--query", "q"])
+        mock_run.assert_called_once_with(resume=None, engine="scholar", query="q", incremental=None)
+        main.main(["--engine", "google", "scholar", "--query", "q"])
+        mock_run_batch.assert_called_once_with(["q"], ["google", "scholar"], merge=False, incremental=None)
+        main.main(["--engine", "google", "--query", "q", "--incremental"])
+        mock_run.assert_called_with(resume=None, engine="google", query="q", incremental=True)
+
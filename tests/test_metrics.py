@@ -0,0 +1,134 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.metrics import Histogram, RunMetrics, get_metrics, metrics_path_for, reset_metrics, timed
+
+class TestHistogram(unittest.TestCase):
+
+    def test_counts_sum_and_extremes(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.2, 0.4, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 3.65)
+        self.assertEqual((histogram.min, histogram.max), (0.05, 3.0))
+
+    def test_quantiles_stay_within_observed_range(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for _ in range(100):
+            histogram.observe(0.5)
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.5)
+        self.assertAlmostEqual(histogram.quantile(0.95), 0.5)
+        self.assertEqual(Histogram().quantile(0.5), 0.0)
+
+    def test_quantile_interpolates_inside_bucket(self):
+        histogram = Histogram(buckets=(1.0, 2.0))
+        histogram.observe(1.0)
+        histogram.observe(1.5)
+        histogram.observe(2.0)
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.25)
+
+class TestRunMetrics(unittest.TestCase):
+
+    def test_labelled_counters(self):
+        run_metrics = RunMetrics()
+        run_metrics.inc("bytes_downloaded", 100, domain="a.com")
+        run_metrics.inc("bytes_downloaded", 50, domain="b.com")
+        run_metrics.inc("bytes_downloaded", 25, domain="a.com")
+
+        self.assertEqual(run_metrics.counter("bytes_downloaded", domain="a.com"), 125)
+        self.assertEqual(run_metrics.counter("bytes_downloaded"), 175)
+        self.assertEqual(run_metrics.counter("errors"), 0)
+
+    def test_timer_records_elapsed_time_even_on_error(self):
+        ticks = iter([0.0, 10.0, 10.25])
+        run_metrics = RunMetrics(clock=lambda: next(ticks))
+
+        with self.assertRaises(ValueError):
+            with run_metrics.timer("parse"):
+                raise ValueError("html quebrado")
+
+        self.assertEqual(run_metrics.histogram("parse").count, 1)
+        self.assertAlmostEqual(run_metrics.histogram("parse").sum, 0.25)
+
+    def test_concurrent_updates_are_not_lost(self):
+        run_metrics = RunMetrics()
+
+        def work():
+            for _ in range(1000):
+                run_metrics.inc("pages_fetched", domain="a.com")
+                run_metrics.observe("page_get", 0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(run_metrics.counter("pages_fetched"), 4000)
+        self.assertEqual(run_metrics.histogram("page_get").count, 4000)
+
+    def test_write_json_summary(self):
+        run_metrics = RunMetrics()
+        run_metrics.observe("serpapi_search", 0.2)
+        run_metrics.inc("errors", domain="a.com", error="TIMEOUT")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = run_metrics.write_json(os.path.join(tmpdir, "run.metrics.json"), rows=10)
+            with open(path, encoding="utf-8") as f:
+                summary = json.load(f)
+
+        self.assertEqual(summary["rows"], 10)
+        self.assertEqual(summary["stages"]["serpapi_search"]["count"], 1)
+        self.assertAlmostEqual(summary["stages"]["serpapi_search"]["p50_ms"], 200.0)
+        self.assertEqual(summary["counters"]["errors"]["series"], [{"domain": "a.com", "error": "TIMEOUT", "value": 1}])
+
+    def test_prometheus_textfile(self):
+        run_metrics = RunMetrics()
+        run_metrics.observe("parse", 0.003)
+        run_metrics.inc("bytes_downloaded", 42, domain='a"b.com')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = run_metrics.write_prometheus(os.path.join(tmpdir, "softscrape.prom"))
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            self.assertEqual(os.listdir(tmpdir), ["softscrape.prom"])
+
+        self.assertIn('softscrape_stage_seconds_bucket{stage="parse",le="0.0025"} 0', text)
+        self.assertIn('softscrape_stage_seconds_bucket{stage="parse",le="0.005"} 1', text)
+        self.assertIn('softscrape_stage_seconds_bucket{stage="parse",le="+Inf"} 1', text)
+        self.assertIn('softscrape_stage_seconds_count{stage="parse"} 1', text)
+        self.assertIn('softscrape_bytes_downloaded_total{domain="a\\"b.com"} 42', text)
+
+class TestModuleHelpers(unittest.TestCase):
+
+    def tearDown(self):
+        reset_metrics()
+
+    def test_timed_records_into_current_metrics(self):
+        @timed("extract_author")
+        def extract():
+            return "Autor"
+
+        current = reset_metrics()
+        self.assertEqual(extract(), "Autor")
+        self.assertIs(get_metrics(), current)
+        self.assertEqual(current.histogram("extract_author").count, 1)
+
+    def test_metrics_path_for(self):
+        self.assertEqual(metrics_path_for(os.path.join("out", "r_google_1.csv")), os.path.join("out", "r_google_1.metrics.json"))
+        self.assertEqual(metrics_path_for("r_google_1.jsonl.gz"), "r_google_1.metrics.json")
+        self.assertEqual(metrics_path_for("r_google_1.parquet"), "r_google_1.metrics.json")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,14 @@
 import unittest
-from dataclasses import fields
+import copy
+import pickle
+from array import array
+from dataclasses import FrozenInstanceError, asdict, fields, replace
 import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from softscrape.models import SearchResult
+from softscrape.models import CODE_TYPECODE, FIELD_NAMES, ResultBatch, SearchResult
 
 class TestModels(unittest.TestCase):
 
@@ -63,3 +66,69 @@ class TestModels(unittest.TestCase):
         self.assertEqual(result.doc_type, "")
         self.assertEqual(result.base, "")
         self.assertEqual(result.link, "")
+
+    def _result(self, **changes):
+        values = dict(title="T", author="A", abstract="R", source="example.com", year="2023",
+                      doc_type="HTML", base="example.com", link="http://example.com/1")
+        values.update(changes)
+        return SearchResult(**values)
+
+    def test_search_result_is_slotted_and_frozen(self):
+        result = self._result()
+        self.assertFalse(hasattr(result, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            result.title = "Outro"
+        self.assertEqual(replace(result, doc_type="PDF").doc_type, "PDF")
+        self.assertEqual(len({result, self._result()}), 1)
+
+    def test_low_cardinality_fields_are_interned(self):
+        # Strings iguais criadas separadamente (como as lidas de JSON) passam a ser o mesmo objeto
+        first = self._result(doc_type="".join(["HT", "ML"]), base="".join(["example", ".com"]))
+        second = self._result(doc_type="".join(["H", "TML"]), base="".join(["exam", "ple.com"]))
+        self.assertIs(first.doc_type, second.doc_type)
+        self.assertIs(first.base, second.base)
+        self.assertIs(first.source, second.source)
+
+    def test_serialization_follows_field_order(self):
+        result = self._result()
+        self.assertEqual(FIELD_NAMES, tuple(field.name for field in fields(SearchResult)))
+        self.assertEqual(result.to_row(), ("T", "A", "R", "example.com", "2023", "HTML", "example.com", "http://example.com/1"))
+        self.assertEqual(list(result.to_dict()), list(FIELD_NAMES))
+        self.assertEqual(result.to_dict(), asdict(result))
+        self.assertEqual(SearchResult(**result.to_dict()), result)
+
+    def test_pickle_and_copy(self):
+        result = self._result()
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertEqual(copy.deepcopy(result), result)
+
+    def test_result_batch_round_trip(self):
+        results = [self._result(title=f"T{i}", doc_type="PDF" if i % 2 else "HTML", link=f"http://example.com/{i}") for i in range(5)]
+        batch = ResultBatch(results)
+        batch.append_row(self._result(title="Extra").to_row())
+
+        self.assertEqual(len(batch), 6)
+        self.assertEqual(list(batch)[:5], results)
+        self.assertEqual(batch.column("doc_type"), ["HTML", "PDF", "HTML", "PDF", "HTML", "HTML"])
+        self.assertEqual(next(iter(batch.rows())), results[0].to_row())
+
+    def test_result_batch_codes_are_four_bytes(self):
+        # O pyarrow lê o buffer dos códigos como uint32
+        self.assertEqual(array(CODE_TYPECODE).itemsize, 4)
+
+    def test_result_batch_to_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.skipTest("pyarrow não instalado")
+        batch = ResultBatch([self._result(doc_type="PDF"), self._result(doc_type="HTML"), self._result(doc_type="PDF")])
+
+        table = batch.to_arrow()
+        self.assertEqual(table.column_names, list(FIELD_NAMES))
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("doc_type").type))
+        self.assertEqual(table.column("doc_type").to_pylist(), ["PDF", "HTML", "PDF"])
+
+        plain = batch.to_arrow(pa.schema([(name, pa.string()) for name in FIELD_NAMES]))
+        self.assertEqual(plain.schema.field("doc_type").type, pa.string())
+        self.assertEqual(plain.to_pylist()[1], self._result(doc_type="HTML").to_dict())
+
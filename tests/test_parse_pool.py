@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import time
+from multiprocessing import shared_memory
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.parse_pool import ParsePool, default_workers, extract_fields
+
+DOC = (
+    '<html><head><meta name="citation_author" content="Ada Lovelace">'
+    '<meta name="description" content="Notes on the analytical engine.">'
+    '<meta name="citation_publication_date" content="2019/10/01"></head>'
+    '<body><p>{padding}</p></body></html>'
+)
+
+def _loaded(module: str) -> bool:
+    return module in sys.modules
+
+class TestParsePool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ParsePool(workers=1, queue_size=2, shm_threshold=4096, backend="html.parser")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_small_document_is_sent_inline(self):
+        content = DOC.format(padding="x").encode("utf-8")
+        with patch('softscrape.parse_pool.shared_memory.SharedMemory') as mock_shm:
+            author, abstract, year = self.pool.extract(content, "utf-8", "http://example.com/a")
+        mock_shm.assert_not_called()
+        self.assertEqual((author, abstract, year), ("Ada Lovelace", "Notes on the analytical engine.", "2019"))
+
+    def test_large_document_goes_through_shared_memory(self):
+        content = DOC.format(padding="y" * 20000).encode("utf-8")
+        created = []
+        original = shared_memory.SharedMemory
+
+        def tracking(*args, **kwargs):
+            segment = original(*args, **kwargs)
+            created.append(segment.name)
+            return segment
+
+        with patch('softscrape.parse_pool.shared_memory.SharedMemory', side_effect=tracking):
+            result = self.pool.extract(content, "utf-8", "http://example.com/b")
+        self.assertEqual(result, ("Ada Lovelace", "Notes on the analytical engine.", "2019"))
+        self.assertEqual(len(created), 1)
+        # O segmento é liberado pelo callback de conclusão, logo após o parse
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            try:
+                shared_memory.SharedMemory(name=created[0]).close()
+            except FileNotFoundError:
+                break
+            time.sleep(0.01)
+        else:
+            self.fail("segmento de memória compartilhada não foi liberado")
+
+    def test_queue_slots_are_released(self):
+        content = DOC.format(padding="z").encode("utf-8")
+        futures = [self.pool.submit(content, "utf-8", f"http://example.com/{i}") for i in range(5)]
+        self.assertTrue(all(f.result()[0] == "Ada Lovelace" for f in futures))
+        for _ in range(self.pool.queue_size):
+            self.assertTrue(self.pool._slots.acquire(timeout=1))
+        for _ in range(self.pool.queue_size):
+            self.pool._slots.release()
+
+    def test_workers_preload_date_extractor(self):
+        try:
+            import htmldate  # noqa: F401
+        except ImportError:
+            self.skipTest("htmldate não instalado")
+        self.assertTrue(self.pool._executor.submit(_loaded, "htmldate").result(timeout=30))
+
+    def test_extract_fields_in_process(self):
+        content = DOC.format(padding="").encode("utf-8")
+        self.assertEqual(extract_fields(content, None, "http://example.com", "html.parser")[0], "Ada Lovelace")
+
+    def test_default_workers_uses_core_count(self):
+        with patch('softscrape.parse_pool.os.cpu_count', return_value=8):
+            self.assertEqual(default_workers(), 7)
+        with patch('softscrape.parse_pool.os.cpu_count', return_value=None):
+            self.assertEqual(default_workers(), 1)
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.parsers import parse_html, available_backends, PARSER_BACKENDS
+from softscrape.extractors import extract_author, extract_abstract, extract_page_year
+
+# Documentos usados nos testes dos extratores, mais alguns casos de borda para os backends
+FIXTURES = [
+    '<html><head><meta name="author" content="John Doe"></head></html>',
+    '<html><head><meta property="article:author" content="Jane Smith"></head></html>',
+    '<html><body><span class="author-name">Alice Wonderland</span></body></html>',
+    '<html><body><div class="byline">By Robert Frost</div></body></html>',
+    '<html><head><title>No Author Here</title></head></html>',
+    '<html><head><meta property="article:author_name" content="CSS Meta Author"></head></html>',
+    '<html><head><meta name="description" content="This is a test abstract."></head></html>',
+    '<html><head><meta property="og:description" content="Another test abstract."></head></html>',
+    '<html><body><div class="abstract"><p>Abstract from CSS.</p></div></body></html>',
+    '<html><body><div class="abstract"><p>First part.</p><p>Second part.</p></div></body></html>',
+    '<html><head><title>No Abstract Here</title></head></html>',
+    '<html><body><div property="schema:abstract"><meta content="Abstract via CSS Meta."></div></body></html>',
+    '''<html><head>
+    <meta name="author" content="">
+    <meta name="author" content="Shadowed Author">
+    <meta name="citation_author" content="Citation Author">
+    <meta property="og:description" content="OG description">
+    </head><body>
+    <div class="byline">By <span class="author">Inner Author</span></div>
+    <div itemprop="author"><span itemprop="name">Item Name</span><span class="name">Item Class</span></div>
+    <div class="abstract"><p>First part.</p><p>Second part.</p></div>
+    </body></html>''',
+    '<html><head><meta name="author" content="http://example.com/me"></head><body><a rel="author"> Link  <b>Author</b> </a></body></html>',
+    '<html><body><div class="paper-abstract-box"><p>Nested <i>abstract</i> text.<script>var x = 1;</script></p><p> </p><p>More.</p></div></body></html>',
+    '<html><body><article><div class="entry-content"><p>' + 'word ' * 500 + '</p></div></article></body></html>',
+    '<html><body><div id="abstract"><p>Id abstract &amp; entities &eacute;.</p></div><div class="byline"><span class="author"></span></div></body></html>',
+    '<html><head><meta name="citation_publication_date" content="2021/03/04"></head></html>',
+    '<html><head><script type="application/ld+json">[{"@type": "Article", "datePublished": "2020-01-02"}]</script></head></html>',
+]
+
+class TestParserParity(unittest.TestCase):
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            parse_html("<html></html>", backend="html5lib")
+
+    def test_html_parser_always_available(self):
+        self.assertIn("html.parser", available_backends())
+
+    def test_backends_give_identical_results(self):
+        reference = [
+            (extract_author(parse_html(doc, "html.parser")), extract_abstract(parse_html(doc, "html.parser")))
+            for doc in FIXTURES
+        ]
+        for backend in PARSER_BACKENDS:
+            if backend not in available_backends():
+                continue
+            with self.subTest(backend=backend):
+                for doc, expected in zip(FIXTURES, reference):
+                    index = parse_html(doc, backend)
+                    self.assertEqual((extract_author(index), extract_abstract(index)), expected, doc[:80])
+
+    def test_backends_agree_on_page_year(self):
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(extract_page_year(parse_html(FIXTURES[-2], backend)), "2021")
+                self.assertEqual(extract_page_year(parse_html(FIXTURES[-1], backend)), "2020")
+
+    def test_backends_agree_on_json_ld_type_with_parameters(self):
+        doc = ('<html><head><script type="Application/LD+JSON; charset=utf-8">'
+               '{"datePublished": "2019-01-01"}</script></head></html>')
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(extract_page_year(parse_html(doc, backend)), "2019")
+
+    @unittest.skipUnless("selectolax" in available_backends(), "selectolax não instalado")
+    def test_selectolax_adapter(self):
+        index = parse_html(FIXTURES[12], "selectolax")
+        self.assertEqual(extract_author(index), "Citation Author")
+        self.assertEqual(extract_abstract(index), "OG description")
@@ -0,0 +1,256 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import zlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.pdf_metadata import (
+    ByteBudgetExceeded, Name, Ref, RangeReader, decode_text, extract_page_text, extract_pdf_metadata, parse_value
+)
+
+ABSTRACT = (
+    "We study how generative models change the productivity of software development teams "
+    "across several companies and report the results."
+)
+PAGE_TEXT = b"BT /F1 18 Tf 72 720 Td (A Study of Productivity) Tj 0 -24 Td [(Abs) -20 (tract) ] TJ 0 -14 Td (" + ABSTRACT.encode("latin-1") + b") Tj ET"
+XMP = (
+    b'<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF><rdf:Description>'
+    b'<dc:creator><rdf:Seq><rdf:li>Ana Souza</rdf:li><rdf:li>Bruno Lima</rdf:li></rdf:Seq></dc:creator>'
+    b'<prism:publicationDate>2021-05-03</prism:publicationDate>'
+    b'</rdf:Description></rdf:RDF></x:xmpmeta>'
+)
+
+
+def _stream(body: bytes, extra: bytes = b"", compress: bool = True) -> bytes:
+    if compress:
+        body = zlib.compress(body)
+        extra += b" /Filter /FlateDecode"
+    return b"<< /Length %d%s >>\nstream\n%s\nendstream" % (len(body), extra, body)
+
+
+def build_pdf(info: bytes, catalog_extra: bytes = b"", padding: int = 0) -> bytes:
+    """
+    PDF mínimo com tabela xref clássica: catálogo, árvore de páginas, uma página com
+    texto, o dicionário Info e, opcionalmente, XMP.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R" + catalog_extra + b" >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /Contents 4 0 R >>",
+        _stream(PAGE_TEXT),
+        info,
+        _stream(XMP, b" /Type /Metadata /Subtype /XML", compress=False),
+    ]
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+        if num == 4:
+            # Conteúdo que não interessa (imagens, fontes) entre os objetos
+            out += b"% " + b"x" * padding + b"\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def build_pdf_with_xref_stream() -> bytes:
+    """
+    PDF 1.5: catálogo, páginas e Info dentro de um object stream e xref stream
+    comprimido com preditor PNG (Up).
+    """
+    in_stream = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>"),
+        (3, b"<< /Type /Page /Parent 2 0 R /Contents 4 0 R >>"),
+        (5, b"<< /Title (Streams \\(and\\) objects) /Author <FEFF004A006F00E3006F> /CreationDate (D:20190102) >>"),
+    ]
+    header, body = [], b""
+    for num, obj in in_stream:
+        header.append(b"%d %d" % (num, len(body)))
+        body += obj + b" "
+    header_bytes = b" ".join(header) + b" "
+    objstm = _stream(header_bytes + body, b" /Type /ObjStm /N %d /First %d" % (len(in_stream), len(header_bytes)))
+
+    out = bytearray(b"%PDF-1.5\n")
+    offsets = {}
+    offsets[4] = len(out)
+    out += b"4 0 obj\n%s\nendobj\n" % _stream(PAGE_TEXT)
+    offsets[6] = len(out)
+    out += b"6 0 obj\n%s\nendobj\n" % objstm
+    offsets[7] = len(out)
+
+    rows = [(0, 0, 65535)]
+    index_in_stream = {num: i for i, (num, _) in enumerate(in_stream)}
+    for num in range(1, 8):
+        if num in index_in_stream:
+            rows.append((2, 6, index_in_stream[num]))
+        else:
+            rows.append((1, offsets[num], 0))
+    raw_rows = [bytes([kind]) + value.to_bytes(4, "big") + gen.to_bytes(2, "big") for kind, value, gen in rows]
+    predicted, previous = b"", bytes(7)
+    for row in raw_rows:
+        predicted += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous))
+        previous = row
+    xref = _stream(
+        predicted,
+        b" /Type /XRef /Size 8 /W [1 4 2] /Root 1 0 R /Info 5 0 R /DecodeParms << /Predictor 12 /Columns 7 >>"
+    )
+    out += b"7 0 obj\n%s\nendobj\nstartxref\n%d\n%%%%EOF\n" % (xref, offsets[7])
+    return bytes(out)
+
+
+class RangeServer:
+    """
+    Sessão falsa que atende `Range` sobre um arquivo em memória e registra os trechos pedidos.
+    """
+
+    def __init__(self, data: bytes, honour_range: bool = True):
+        self.data = data
+        self.honour_range = honour_range
+        self.requests = []
+
+    def get(self, url, timeout=None, allow_redirects=True, headers=None, stream=False):
+        spec = (headers or {}).get("Range", "")
+        self.requests.append(spec)
+        resp = MagicMock()
+        resp.raise_for_status.return_value = None
+        size = len(self.data)
+        if not self.honour_range or not spec:
+            body = self.data
+            resp.status_code = 200
+            resp.headers = {"Content-Type": "application/pdf", "Content-Length": str(size)}
+        else:
+            first, _, last = spec[len("bytes="):].partition("-")
+            if not first:
+                start, end = max(size - int(last), 0), size - 1
+            else:
+                start, end = int(first), min(int(last), size - 1) if last else size - 1
+            body = self.data[start:end + 1]
+            resp.status_code = 206
+            resp.headers = {"Content-Type": "application/pdf", "Content-Range": f"bytes {start}-{end}/{size}"}
+        resp.iter_content.side_effect = lambda chunk_size: iter([body[i:i + chunk_size] for i in range(0, len(body), chunk_size)])
+        return resp
+
+
+class TestParseValue(unittest.TestCase):
+
+    def test_nested_objects(self):
+        value, _ = parse_value(b"<< /Kids [3 0 R 4 0 R] /Count 2 /Title (a \\(b\\) \\101) /Id <4142> /Ok true >>")
+        self.assertEqual(value, {"Kids": [Ref(3, 0), Ref(4, 0)], "Count": 2, "Title": b"a (b) A", "Id": b"AB", "Ok": True})
+        self.assertIsInstance(value["Kids"], list)
+        self.assertIsInstance(next(iter(value)), Name)
+
+    def test_decode_text(self):
+        self.assertEqual(decode_text(b"\xfe\xff\x00J\x00o\x00\xe3\x00o"), "João")
+        self.assertEqual(decode_text(b"Jos\xe9  Silva"), "José Silva")
+        self.assertEqual(decode_text(Name("x")), "")
+
+    def test_extract_page_text(self):
+        text = extract_page_text(PAGE_TEXT, 10000)
+        self.assertTrue(text.startswith("A Study of Productivity Abstract We study"))
+
+
+class TestRangeReader(unittest.TestCase):
+
+    @patch('softscrape.fetcher.get_session')
+    def test_reads_reuse_downloaded_blocks(self, mock_get_session):
+        server = mock_get_session.return_value = RangeServer(bytes(range(256)) * 64)
+        reader = RangeReader("http://example.com/a.pdf", budget=4096, block_size=1024)
+
+        self.assertEqual(reader.tail(16), (16384 - 16, server.data[-16:]))
+        self.assertEqual(reader.read(10, 5), server.data[10:15])
+        self.assertEqual(reader.read(100, 50), server.data[100:150])
+
+        self.assertEqual(server.requests, ["bytes=-16", "bytes=0-1023"])
+        self.assertEqual(reader.used, 16 + 1024)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_budget_is_enforced(self, mock_get_session):
+        mock_get_session.return_value = RangeServer(b"x" * 10000)
+        reader = RangeReader("http://example.com/a.pdf", budget=1500, block_size=1024)
+        reader.read(0, 10)
+        with self.assertRaises(ByteBudgetExceeded):
+            reader.read(5000, 10)
+
+
+class TestExtractPdfMetadata(unittest.TestCase):
+
+    @patch('softscrape.fetcher.get_session')
+    def test_info_xmp_and_first_page_with_classic_xref(self, mock_get_session):
+        pdf = build_pdf(
+            b"<< /Title (A Study of Productivity) /Author (Fallback Author) /CreationDate (D:20200101120000Z) >>",
+            catalog_extra=b" /Metadata 6 0 R",
+            padding=200000
+        )
+        server = mock_get_session.return_value = RangeServer(pdf)
+
+        metadata = extract_pdf_metadata("http://example.com/paper.pdf", budget=128 * 1024)
+
+        self.assertEqual(metadata.title, "A Study of Productivity")
+        # O XMP não substitui o autor do Info; a data de criação fica à parte da de publicação
+        self.assertEqual(metadata.author, "Fallback Author")
+        self.assertEqual(metadata.year, "2021")
+        self.assertEqual(metadata.creation_year, "2020")
+        self.assertEqual(metadata.abstract, ABSTRACT)
+        # Só trechos: a cauda e os blocos do início, nunca o arquivo inteiro
+        self.assertTrue(all(spec.startswith("bytes=") for spec in server.requests))
+        self.assertLess(len(server.requests), 6)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_xmp_fills_missing_info_fields(self, mock_get_session):
+        mock_get_session.return_value = RangeServer(build_pdf(b"<< /Producer (LaTeX) >>", catalog_extra=b" /Metadata 6 0 R"))
+
+        metadata = extract_pdf_metadata("http://example.com/paper.pdf")
+
+        self.assertEqual(metadata.author, "Ana Souza, Bruno Lima")
+        self.assertEqual(metadata.year, "2021")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_xref_stream_and_object_stream(self, mock_get_session):
+        mock_get_session.return_value = RangeServer(build_pdf_with_xref_stream())
+
+        metadata = extract_pdf_metadata("http://example.com/paper.pdf")
+
+        self.assertEqual(metadata.title, "Streams (and) objects")
+        self.assertEqual(metadata.author, "João")
+        # Só a data de criação: não vira o ano de publicação
+        self.assertEqual(metadata.year, "")
+        self.assertEqual(metadata.creation_year, "2019")
+        self.assertEqual(metadata.abstract, ABSTRACT)
+
+    @patch('softscrape.fetcher.get_session')
+    def test_budget_returns_partial_metadata(self, mock_get_session):
+        pdf = build_pdf(b"<< /Author (Only Author) >>", padding=200000)
+        server = mock_get_session.return_value = RangeServer(pdf)
+
+        # A cauda (16 KiB) traz o Info; o bloco do início do arquivo já não cabe
+        metadata = extract_pdf_metadata("http://example.com/paper.pdf", budget=20 * 1024)
+
+        self.assertEqual(metadata.author, "Only Author")
+        self.assertEqual(metadata.abstract, "")
+        self.assertEqual(server.requests, ["bytes=-16384"])
+
+    @patch('softscrape.fetcher.get_session')
+    def test_server_without_range_support(self, mock_get_session):
+        small = build_pdf(b"<< /Author (Small File) >>")
+        mock_get_session.return_value = RangeServer(small, honour_range=False)
+        self.assertEqual(extract_pdf_metadata("http://example.com/small.pdf").author, "Small File")
+
+        large = build_pdf(b"<< /Author (Large File) >>", padding=400000)
+        mock_get_session.return_value = RangeServer(large, honour_range=False)
+        self.assertEqual(extract_pdf_metadata("http://example.com/large.pdf").author, "")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_garbage_yields_empty_metadata(self, mock_get_session):
+        mock_get_session.return_value = RangeServer(b"<html>not a pdf</html>")
+        metadata = extract_pdf_metadata("http://example.com/fake.pdf")
+        self.assertEqual((metadata.title, metadata.author, metadata.year, metadata.abstract), ("", "", "", ""))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,297 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import threading
+import time
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.pipeline import LinkMemo, PageMetadata, PipelineContext, PriorResults, process_result, process_results
+from softscrape.models import SearchResult
+from softscrape.pdf_metadata import PdfMetadata
+from softscrape.store import StoredResult
+from softscrape.urls import canonicalize_url
+
+def _mock_response(content_type="text/html; charset=utf-8", text=""):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"Content-Type": content_type}
+    resp.content = text.encode("utf-8")
+    resp.iter_content.side_effect = lambda chunk_size: iter([resp.content])
+    resp.encoding = "utf-8"
+    resp.raise_for_status = MagicMock()
+    return resp
+
+class TestPipeline(unittest.TestCase):
+
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_html(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = _mock_response(text='<html><head><meta name="author" content="John Doe"><meta name="description" content="Full abstract."></head></html>')
+        item = {"title": "Paper", "link": "http://example.com/2023/paper.html", "snippet": "Snippet", "displayed_link": "example.com"}
+        result = process_result(item, "google")
+        self.assertEqual(result, SearchResult(
+            title="Paper", author="John Doe", abstract="Full abstract.", source="example.com",
+            year="2023", doc_type="HTML", base="example.com", link="http://example.com/2023/paper.html"
+        ))
+
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_scholar_fallbacks(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = _mock_response(content_type="application/pdf")
+        item = {
+            "title": "Paper",
+            "link": "http://example.com/paper.pdf",
+            "snippet": "Some text from 2021",
+            "publication_info": {"authors": [{"name": "A Serna"}, {"name": "JM Viviescas"}]}
+        }
+        result = process_result(item, "google_scholar")
+        self.assertEqual(result.doc_type, "PDF")
+        self.assertEqual(result.author, "A Serna, JM Viviescas")
+        self.assertEqual(result.year, "2021")
+        self.assertEqual(result.abstract, "Some text from 2021")
+
+    @patch('softscrape.pipeline.extract_pdf_metadata')
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_pdf_metadata(self, mock_get_session, mock_extract_pdf):
+        mock_get_session.return_value.get.return_value = _mock_response(content_type="application/pdf")
+        mock_extract_pdf.return_value = PdfMetadata(title="Título do PDF", author="Ana Souza", year="2019", abstract="Resumo do PDF")
+        item = {"title": "", "link": "http://example.com/paper.pdf", "snippet": "Snippet de 2021"}
+
+        result = process_result(item, "google_scholar")
+
+        self.assertEqual((result.title, result.author, result.year, result.abstract),
+                         ("Título do PDF", "Ana Souza", "2019", "Resumo do PDF"))
+        mock_extract_pdf.assert_called_once_with("http://example.com/paper.pdf", scheduler=None, timeout=15)
+
+        # O título da busca e o ano da URL têm prioridade sobre os do documento
+        item = {"title": "Título da busca", "link": "http://example.com/2023/other.pdf"}
+        result = process_result(item, "google")
+        self.assertEqual((result.title, result.year), ("Título da busca", "2023"))
+
+        with patch('softscrape.pipeline.settings.PDF_METADATA_ENABLED', False):
+            result = process_result({"title": "P", "link": "http://example.com/third.pdf"}, "google")
+        self.assertEqual(mock_extract_pdf.call_count, 2)
+        self.assertEqual(result.author, "")
+
+    @patch('softscrape.pipeline.extract_pdf_metadata')
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_pdf_creation_year_is_last_resort(self, mock_get_session, mock_extract_pdf):
+        mock_get_session.return_value.get.return_value = _mock_response(content_type="application/pdf")
+        mock_extract_pdf.return_value = PdfMetadata(title="Título do PDF", creation_year="2019")
+
+        # O ano do snippet do Scholar prevalece sobre o de criação do arquivo
+        item = {"title": "Paper", "link": "http://example.com/paper.pdf", "snippet": "A Serna - 2021 - example.com"}
+        self.assertEqual(process_result(item, "google_scholar").year, "2021")
+
+        # Sem outra fonte, o ano de criação ainda preenche o campo
+        item = {"title": "Paper", "link": "http://example.com/other.pdf", "snippet": "Sem ano"}
+        self.assertEqual(process_result(item, "google").year, "2019")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_errors(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        item = {"title": "Paper", "link": "http://example.com/x"}
+
+        mock_get.side_effect = requests.exceptions.Timeout()
+        self.assertEqual(process_result(item, "google").doc_type, "TIMEOUT")
+
+        error_response = MagicMock(status_code=404)
+        mock_get.side_effect = requests.exceptions.HTTPError(response=error_response)
+        self.assertEqual(process_result(item, "google").doc_type, "HTTP_ERROR_404")
+
+        mock_get.side_effect = requests.exceptions.ConnectionError("down")
+        self.assertEqual(process_result(item, "google").doc_type, "REQUEST_ERROR")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_head_only_matches_full_page(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        html = ('<html><head><meta name="author" content="John Doe"><meta name="description" content="Full abstract."></head>'
+                '<body>' + '<p>filler</p>' * 500 + '</body></html>')
+        response = _mock_response(text=html)
+        response.iter_content.side_effect = lambda chunk_size: iter([response.content[i:i + 256] for i in range(0, len(response.content), 256)])
+        mock_get.return_value = response
+        item = {"title": "Paper", "link": "http://example.com/paper.html"}
+        with patch('softscrape.pipeline.settings.STREAM_HEAD_ONLY', True):
+            head_only = process_result(item, "google")
+        with patch('softscrape.pipeline.settings.STREAM_HEAD_ONLY', False):
+            full = process_result(item, "google")
+        self.assertEqual(head_only, full)
+        self.assertEqual(head_only.author, "John Doe")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_head_only_defers_to_higher_priority_body_selectors(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        # `article:author_name` é o último seletor de autor: o `.author-name` do <body> vem antes
+        html = ('<html><head><meta property="article:author_name" content="Head Author">'
+                '<meta name="description" content="Full abstract."></head>'
+                '<body>' + '<p>filler</p>' * 200 + '<span class="author-name">Body Author</span></body></html>')
+        response = _mock_response(text=html)
+        response.iter_content.side_effect = lambda chunk_size: iter([response.content[i:i + 256] for i in range(0, len(response.content), 256)])
+        mock_get.return_value = response
+        item = {"title": "Paper", "link": "http://example.com/paper.html"}
+        with patch('softscrape.pipeline.settings.STREAM_HEAD_ONLY', True):
+            head_only = process_result(item, "google")
+        with patch('softscrape.pipeline.settings.STREAM_HEAD_ONLY', False):
+            full = process_result(item, "google")
+        self.assertEqual(full.author, "Body Author")
+        self.assertEqual(head_only, full)
+
+    @patch('softscrape.extractors.get_session')
+    @patch('softscrape.fetcher.get_session')
+    def test_process_result_without_content_type_skips_head(self, mock_get_session, mock_extractors_session):
+        mock_get_session.return_value.get.return_value = _mock_response(content_type="", text="%PDF-1.5 binary")
+        result = process_result({"title": "Paper", "link": "http://example.com/download?id=1"}, "google")
+        self.assertEqual(result.doc_type, "PDF")
+        mock_extractors_session.return_value.head.assert_not_called()
+
+    def test_process_result_no_link(self):
+        result = process_result({"title": "No link"}, "google")
+        self.assertEqual(result.doc_type, "NO_LINK")
+        self.assertEqual(result.base, "")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_process_results_keeps_order_and_runs_concurrently(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def slow_get(link, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            # Links com índice menor demoram mais, forçando término fora de ordem
+            time.sleep(0.05 * (5 - int(link.rsplit("/", 1)[1])))
+            with lock:
+                active["now"] -= 1
+            return _mock_response(content_type="application/pdf")
+
+        mock_get.side_effect = slow_get
+        items = [{"title": f"T{i}", "link": f"http://example.com/{i}"} for i in range(5)]
+        results = list(process_results(items, "google"))
+        self.assertEqual([r.title for r in results], [f"T{i}" for i in range(5)])
+        self.assertGreater(active["max"], 1)
+
+    def test_process_results_empty(self):
+        self.assertEqual(list(process_results([], "google")), [])
+
+    @patch('softscrape.fetcher.get_session')
+    def test_link_memo_fetches_repeated_links_once(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = lambda *args, **kwargs: _mock_response(text='<html><head><meta name="author" content="Jane"></head></html>')
+        context = PipelineContext(link_memo=LinkMemo())
+        items = [
+            {"title": "A", "link": "http://example.com/x"},
+            {"title": "B", "link": "http://example.com/x"},
+            {"title": "C", "link": "http://example.com/y"}
+        ]
+        results = list(process_results(items, "google", context=context))
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual([r.title for r in results], ["A", "B", "C"])
+        self.assertEqual([r.author for r in results], ["Jane", "Jane", "Jane"])
+        self.assertEqual((len(context.link_memo), context.link_memo.hits), (2, 1))
+
+    @patch('softscrape.fetcher.get_session')
+    def test_link_memo_fetches_each_view_of_the_same_work(self, mock_get_session):
+        html = _mock_response(text='<html><head><meta name="author" content="Jane"></head></html>')
+        pdf = _mock_response(content_type="application/pdf")
+        mock_get_session.return_value.get.side_effect = lambda link, **kwargs: pdf if "/pdf/" in link else html
+        context = PipelineContext(link_memo=LinkMemo())
+        items = [
+            {"title": "Abs", "link": "https://arxiv.org/abs/2301.00001"},
+            {"title": "Pdf", "link": "https://arxiv.org/pdf/2301.00001"},
+            {"title": "Abs again", "link": "http://www.arxiv.org/abs/2301.00001?utm_source=x"},
+        ]
+        with patch('softscrape.pipeline.settings.PDF_METADATA_ENABLED', False):
+            results = list(process_results(items, "google", context=context))
+        self.assertEqual([r.doc_type for r in results], ["HTML", "PDF", "HTML"])
+        self.assertEqual((len(context.link_memo), context.link_memo.hits), (2, 1))
+
+    def test_link_memo_evicts_least_recently_used_settled_links(self):
+        memo = LinkMemo(max_entries=2)
+        calls = []
+
+        def compute(link):
+            calls.append(link)
+            return PageMetadata(author=link)
+
+        for link in ("http://example.com/a", "http://example.com/b", "http://example.com/a", "http://example.com/c"):
+            memo.get_or_compute(link, lambda link=link: compute(link))
+        self.assertEqual(len(memo), 2)
+
+        # "a" foi usado depois de "b": "b" saiu e precisa ser baixado de novo
+        memo.get_or_compute("http://example.com/a", lambda: compute("http://example.com/a"))
+        memo.get_or_compute("http://example.com/b", lambda: compute("http://example.com/b"))
+        self.assertEqual(calls, ["http://example.com/a", "http://example.com/b", "http://example.com/c", "http://example.com/b"])
+
+    def test_link_memo_never_evicts_downloads_in_progress(self):
+        memo = LinkMemo(max_entries=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return PageMetadata(author="slow")
+
+        worker = threading.Thread(target=memo.get_or_compute, args=("http://example.com/slow", slow))
+        worker.start()
+        started.wait(5)
+        memo.get_or_compute("http://example.com/fast", lambda: PageMetadata(author="fast"))
+        # O download em andamento continua no memo: outra thread aguarda o mesmo resultado
+        waiter = []
+        second = threading.Thread(target=lambda: waiter.append(memo.get_or_compute("http://example.com/slow", lambda: PageMetadata(author="other"))))
+        second.start()
+        release.set()
+        worker.join(5)
+        second.join(5)
+        self.assertEqual(waiter[0].author, "slow")
+
+    @patch('softscrape.fetcher.get_session')
+    def test_link_memo_keeps_item_specific_fallbacks(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = lambda *args, **kwargs: _mock_response(content_type="application/pdf")
+        context = PipelineContext(link_memo=LinkMemo())
+        item = {"title": "P", "link": "http://example.com/p.pdf", "snippet": "A Author - 2021 - x",
+                "publication_info": {"authors": [{"name": "A Author"}]}}
+        google = process_result(item, "google", context=context)
+        scholar = process_result(item, "google_scholar", context=context)
+        self.assertEqual((google.author, google.year), ("", ""))
+        self.assertEqual((scholar.author, scholar.year, scholar.doc_type), ("A Author", "2021", "PDF"))
+
+    @patch('softscrape.pipeline._extract_page')
+    def test_prior_results_reuse_only_fresh_successful_links(self, mock_extract):
+        mock_extract.return_value = PageMetadata(author="Novo", doc_type="HTML")
+        stored = {
+            canonicalize_url(link): StoredResult(
+                SearchResult(title="Antigo", author="Gravado", abstract="Resumo gravado", source="", year="2020",
+                             doc_type=doc_type, base="", link=link),
+                fetched_at
+            )
+            for link, doc_type, fetched_at in [
+                ("http://a.com/fresh", "PDF", 990.0),
+                ("http://a.com/failed", "HTTP_ERROR_503", 990.0),
+                ("http://a.com/stale", "HTML", 100.0),
+            ]
+        }
+        context = PipelineContext(prior=PriorResults(stored, max_age_sec=500, now=1000.0))
+
+        fresh = process_result({"title": "Da busca", "link": "https://www.a.com/fresh", "snippet": "S"}, "google", context=context)
+        self.assertEqual((fresh.title, fresh.author, fresh.abstract, fresh.year, fresh.doc_type, fresh.base),
+                         ("Da busca", "Gravado", "Resumo gravado", "2020", "PDF", "www.a.com"))
+        mock_extract.assert_not_called()
+
+        for link in ("http://a.com/failed", "http://a.com/stale", "http://a.com/new"):
+            self.assertEqual(process_result({"title": "T", "link": link}, "google", context=context).author, "Novo")
+        self.assertEqual([c.args[0] for c in mock_extract.call_args_list], ["http://a.com/failed", "http://a.com/stale", "http://a.com/new"])
+
+    @patch('softscrape.fetcher.get_session')
+    def test_full_document_parse_goes_to_parse_pool(self, mock_get_session):
+        html = '<html><head><title>x</title></head><body><div class="abstract">Body abstract.</div></body></html>'
+        mock_get_session.return_value.get.return_value = _mock_response(text=html)
+        parse_pool = MagicMock()
+        parse_pool.extract.return_value = ("Pool Author", "Pool abstract.", "2020")
+        result = process_result({"title": "T", "link": "http://example.com/x"}, "google", context=PipelineContext(parse_pool=parse_pool))
+        parse_pool.extract.assert_called_once_with(html.encode("utf-8"), "utf-8", "http://example.com/x")
+        self.assertEqual((result.author, result.abstract, result.year), ("Pool Author", "Pool abstract.", "2020"))
+
@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.retry import (
+    CircuitBreaker, CircuitOpenError, DeferredRetryQueue, RetryBudget, RetryPolicy,
+    is_retryable_doc_type, is_retryable_exception
+)
+
+def _http_error(status, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    return requests.exceptions.HTTPError(response=response)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestClassification(unittest.TestCase):
+
+    def test_exceptions(self):
+        self.assertTrue(is_retryable_exception(requests.exceptions.Timeout()))
+        self.assertTrue(is_retryable_exception(requests.exceptions.ConnectionError()))
+        self.assertTrue(is_retryable_exception(_http_error(503)))
+        self.assertTrue(is_retryable_exception(_http_error(429)))
+        self.assertTrue(is_retryable_exception(CircuitOpenError()))
+        self.assertFalse(is_retryable_exception(_http_error(404)))
+        self.assertFalse(is_retryable_exception(ValueError()))
+
+    def test_doc_type_markers(self):
+        for marker in ("TIMEOUT", "REQUEST_ERROR", "HTTP_ERROR_502", "HTTP_ERROR_429"):
+            self.assertTrue(is_retryable_doc_type(marker), marker)
+        for marker in ("HTTP_ERROR_404", "PROCESSING_ERROR", "NO_LINK", "HTML", "PDF"):
+            self.assertFalse(is_retryable_doc_type(marker), marker)
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def _policy(self, budget=10, **kwargs):
+        self.sleeps = []
+        return RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=4.0, budget=RetryBudget(budget),
+                           sleep=self.sleeps.append, rng=lambda: 1.0, **kwargs)
+
+    def test_retries_transient_errors_then_succeeds(self):
+        policy = self._policy()
+        fn = MagicMock(side_effect=[requests.exceptions.Timeout(), _http_error(502), "ok"])
+        self.assertEqual(policy.call(fn), "ok")
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(self.sleeps, [1.0, 2.0])
+        self.assertEqual(policy.budget.used, 2)
+
+    def test_does_not_retry_permanent_errors(self):
+        policy = self._policy()
+        fn = MagicMock(side_effect=_http_error(404))
+        with self.assertRaises(requests.exceptions.HTTPError):
+            policy.call(fn)
+        self.assertEqual(fn.call_count, 1)
+
+    def test_gives_up_after_max_attempts(self):
+        policy = self._policy()
+        fn = MagicMock(side_effect=requests.exceptions.ConnectionError())
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            policy.call(fn)
+        self.assertEqual(fn.call_count, 3)
+
+    def test_budget_limits_retries(self):
+        policy = self._policy(budget=1)
+        fn = MagicMock(side_effect=requests.exceptions.Timeout())
+        with self.assertRaises(requests.exceptions.Timeout):
+            policy.call(fn)
+        self.assertEqual(fn.call_count, 2)
+        self.assertEqual(policy.budget.remaining, 0)
+
+    def test_backoff_is_capped_jittered_and_honours_retry_after(self):
+        policy = self._policy()
+        self.assertEqual(policy.backoff(10), 4.0)
+        half = RetryPolicy(base_delay=1.0, max_delay=4.0, rng=lambda: 0.5)
+        self.assertEqual(half.backoff(1), 1.0)
+        self.assertEqual(half.backoff(0, retry_after=7), 7)
+        fn = MagicMock(side_effect=[_http_error(429, {"Retry-After": "3"}), "ok"])
+        policy.call(fn)
+        self.assertEqual(self.sleeps, [3.0])
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold_and_half_opens_after_timeout(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure("a.com")
+        self.assertTrue(breaker.allow("a.com"))
+        breaker.record_failure("a.com")
+        self.assertFalse(breaker.allow("a.com"))
+        self.assertTrue(breaker.allow("b.com"))
+
+        clock.now = 10
+        self.assertTrue(breaker.allow("a.com"))  # requisição de teste
+        self.assertFalse(breaker.allow("a.com"))  # só uma por vez
+        breaker.record_failure("a.com")
+        self.assertFalse(breaker.allow("a.com"))
+
+        clock.now = 20
+        self.assertTrue(breaker.allow("a.com"))
+        breaker.record_success("a.com")
+        self.assertFalse(breaker.is_open("a.com"))
+        self.assertTrue(breaker.allow("a.com"))
+
+class TestDeferredRetryQueue(unittest.TestCase):
+
+    def test_drain_empties_queue(self):
+        queue = DeferredRetryQueue()
+        queue.add(0, 1, {"link": "x"})
+        self.assertEqual(len(queue), 1)
+        drained = queue.drain()
+        self.assertEqual((drained[0].page, drained[0].position), (0, 1))
+        self.assertEqual(len(queue), 0)
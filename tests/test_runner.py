@@ -0,0 +1,246 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pandas as pd
+
+from softscrape.pipeline import PageMetadata
+from softscrape.runner import export_store, load_queries, plan_pagination, run_batch, _slug
+from softscrape.store import ResultStore
+from softscrape.urls import dedupe_key
+
+RESULTS_BY_QUERY = {
+    "alpha": [{"title": "A1", "link": "http://a.com/1"}, {"title": "Shared", "link": "http://shared.com/x"}],
+    "beta": [{"title": "Shared", "link": "http://shared.com/x"}, {"title": "B1", "link": "http://b.com/1"}]
+}
+
+class TestRunBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.fetched = []
+        self.lock = threading.Lock()
+
+        def fake_extract(link, context):
+            with self.lock:
+                self.fetched.append(link)
+            return PageMetadata(author="Autor", abstract="Resumo", doc_type="HTML")
+
+        patches = [
+            patch('softscrape.journal.RUNS_DIR', os.path.join(self.tmpdir.name, "runs")),
+            patch('softscrape.exporters.OUTPUT_DIR', self.tmpdir.name),
+            patch('softscrape.runner.ResponseCache'),
+            patch('softscrape.runner.PageCache'),
+            patch('softscrape.runner.settings.PAUSE_SEC', 0),
+            patch('softscrape.runner.settings.PAGES', 1),
+            patch('softscrape.runner.settings.EXPORT_FORMAT', "csv"),
+            patch('softscrape.runner.settings.EXPORT_COMPRESSION', ""),
+            patch('softscrape.pipeline._extract_page', side_effect=fake_extract),
+            patch('softscrape.store.STORE_PATH', os.path.join(self.tmpdir.name, "results.sqlite3")),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _mock_client(self, mock_client_cls):
+        mock_client_cls.return_value.search.side_effect = (
+            lambda query, start, num, engine: {"organic_results": RESULTS_BY_QUERY[query]}
+        )
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_batch_writes_one_file_per_job_and_fetches_shared_links_once(self, mock_client_cls):
+        self._mock_client(mock_client_cls)
+        paths = run_batch(["alpha", "beta"], ["google", "scholar"])
+
+        self.assertEqual(len(paths), 4)
+        self.assertEqual(len(set(paths)), 4)
+        self.assertEqual(mock_client_cls.return_value.search.call_count, 4)
+        self.assertEqual(sorted(self.fetched), ["http://a.com/1", "http://b.com/1", "http://shared.com/x"])
+        self.assertEqual(list(pd.read_csv(paths[0])["title"]), ["A1", "Shared"])
+        self.assertIn("google_scholar", os.path.basename(paths[1]))
+        self.assertEqual(list(pd.read_csv(paths[2])["title"]), ["Shared", "B1"])
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_runs_are_recorded_in_store_and_export_reproduces_csv(self, mock_client_cls):
+        self._mock_client(mock_client_cls)
+        paths = run_batch(["alpha", "beta"], ["google", "scholar"])
+
+        store = ResultStore()
+        self.addCleanup(store.close)
+        self.assertEqual(len(store), 8)
+        self.assertEqual(len(store.run_ids(query="beta", engine="google_scholar")), 1)
+
+        run_id = store.run_ids(query="beta", engine="google")[0]
+        exported = export_store(run_ids=[run_id], store=store)
+        with open(paths[2], encoding="utf-8") as original, open(exported.path, encoding="utf-8") as reproduced:
+            self.assertEqual(reproduced.read(), original.read())
+        # Sem deduplicação, a exportação vai em lotes colunares, com o mesmo conteúdo
+        with patch('softscrape.runner.settings.DEDUPE_RESULTS', False):
+            exported = export_store(run_ids=[run_id], store=store)
+        with open(paths[2], encoding="utf-8") as original, open(exported.path, encoding="utf-8") as reproduced:
+            self.assertEqual(reproduced.read(), original.read())
+
+        # Filtro por buscador: as duas consultas do Scholar, com o link repetido unido
+        exported = export_store(engines=["scholar"], store=store)
+        self.assertEqual(list(pd.read_csv(exported.path)["title"]), ["A1", "Shared", "B1"])
+        self.assertIn("google_scholar", os.path.basename(exported.path))
+
+        with self.assertRaises(LookupError):
+            export_store(query="gamma", store=store)
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_incremental_run_fetches_only_new_failed_and_stale_links(self, mock_client_cls):
+        results = {"alpha": list(RESULTS_BY_QUERY["alpha"])}
+        mock_client_cls.return_value.search.side_effect = (
+            lambda query, start, num, engine: {"organic_results": results[query]}
+        )
+
+        def extract(link, context):
+            with self.lock:
+                self.fetched.append(link)
+            if link == "http://a.com/1":
+                return PageMetadata(doc_type="HTTP_ERROR_404", failed=True)
+            return PageMetadata(author=f"Autor {len(self.fetched)}", abstract="Resumo", doc_type="HTML")
+
+        with patch('softscrape.pipeline._extract_page', side_effect=extract):
+            run_batch(["alpha"], ["google"])
+            first_fetch = self.fetched[:]
+            self.fetched.clear()
+
+            results["alpha"].append({"title": "New", "link": "http://new.com/1"})
+            paths = run_batch(["alpha"], ["google"], incremental=True)
+
+        # O link com erro e o novo são baixados; o outro vem da base, com os campos gravados
+        self.assertEqual(sorted(self.fetched), ["http://a.com/1", "http://new.com/1"])
+        df = pd.read_csv(paths[0])
+        self.assertEqual(list(df["title"]), ["A1", "Shared", "New"])
+        shared_author = df["author"][1]
+        self.assertEqual(shared_author, f"Autor {first_fetch.index('http://shared.com/x') + 1}")
+
+        store = ResultStore()
+        self.addCleanup(store.close)
+        key = dedupe_key("http://shared.com/x")
+        self.assertEqual(store.latest_by_links(["http://shared.com/x"])[key].result.author, shared_author)
+        # O instante do download original é mantido: a janela de validade não recomeça
+        conn = sqlite3.connect(store.path)
+        self.addCleanup(conn.close)
+        fetched_at = [row[0] for row in conn.execute("SELECT fetched_at FROM results WHERE link_key = ?", (key,))]
+        self.assertEqual(len(fetched_at), 2)
+        self.assertEqual(fetched_at[0], fetched_at[1])
+
+        self.fetched.clear()
+        with patch('softscrape.pipeline._extract_page', side_effect=extract), \
+                patch('softscrape.runner.settings.RECRAWL_MAX_AGE_SEC', -1):
+            run_batch(["alpha"], ["google"], incremental=True)
+        self.assertEqual(sorted(self.fetched), ["http://a.com/1", "http://new.com/1", "http://shared.com/x"])
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_batch_merge_writes_single_deduplicated_file(self, mock_client_cls):
+        self._mock_client(mock_client_cls)
+        paths = run_batch(["alpha", "beta"], ["google"], merge=True)
+
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(list(pd.read_csv(paths[0])["link"]), ["http://a.com/1", "http://shared.com/x", "http://b.com/1"])
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_batch_merge_writes_metrics_summary_next_to_output(self, mock_client_cls):
+        self._mock_client(mock_client_cls)
+        paths = run_batch(["alpha", "beta"], ["google"], merge=True)
+
+        summary_path = paths[0].replace(".csv", ".metrics.json")
+        with open(summary_path, encoding="utf-8") as f:
+            summary = json.load(f)
+        self.assertEqual(summary["output"], paths[0])
+        self.assertEqual(summary["jobs"], 2)
+        self.assertEqual(summary["rows"], 3)
+        self.assertEqual(summary["stages"]["export"]["count"], 3)
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_batch_merges_canonical_duplicates_across_engines(self, mock_client_cls):
+        def search(query, start, num, engine):
+            if engine == "google":
+                return {"organic_results": [{"title": "Paper", "link": "http://doi.org/10.1000/x?utm_source=g"}]}
+            return {"organic_results": [{
+                "title": "Paper", "link": "https://publisher.com/doi/pdf/10.1000/X",
+                "snippet": "A Author - 2022 - publisher.com",
+                "publication_info": {"authors": [{"name": "A Author"}]}
+            }]}
+        mock_client_cls.return_value.search.side_effect = search
+        with patch('softscrape.pipeline._extract_page', side_effect=lambda link, context: self.fetched.append(link) or PageMetadata(doc_type="PDF")):
+            paths = run_batch(["alpha"], ["google", "scholar"], merge=True)
+
+        # Cada visão do DOI (landing e PDF) é baixada; as linhas se unem na deduplicação
+        self.assertEqual(sorted(self.fetched), ["http://doi.org/10.1000/x?utm_source=g", "https://publisher.com/doi/pdf/10.1000/X"])
+        df = pd.read_csv(paths[0])
+        self.assertEqual(len(df), 1)
+        self.assertEqual((df.loc[0, "link"], df.loc[0, "author"], str(df.loc[0, "year"])),
+                         ("http://doi.org/10.1000/x?utm_source=g", "A Author", "2022"))
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_pagination_stops_when_results_run_out(self, mock_client_cls):
+        def search(query, start, num, engine):
+            if start == 0:
+                return {"organic_results": [{"title": "A", "link": "http://a.com/1"}], "serpapi_pagination": {"next": "..."}}
+            return {"organic_results": [{"title": "B", "link": "http://a.com/2"}], "serpapi_pagination": {}}
+        mock_client_cls.return_value.search.side_effect = search
+        with patch('softscrape.runner.settings.PAGES', 5), patch('softscrape.runner.settings.MAXIMIZE_PAGE_SIZE', False):
+            paths = run_batch(["alpha"], ["google"])
+
+        calls = mock_client_cls.return_value.search.call_args_list
+        self.assertEqual([c.kwargs["start"] for c in calls], [0, 10])
+        self.assertEqual(list(pd.read_csv(paths[0])["title"]), ["A", "B"])
+
+    @patch('softscrape.runner.SerpApiClient')
+    def test_failed_links_are_retried_at_the_end(self, mock_client_cls):
+        self._mock_client(mock_client_cls)
+        attempts = {}
+
+        def flaky_extract(link, context):
+            with self.lock:
+                attempts[link] = attempts.get(link, 0) + 1
+                self.fetched.append(link)
+            if link == "http://shared.com/x" and attempts[link] == 1:
+                return PageMetadata(doc_type="TIMEOUT", failed=True)
+            if link == "http://a.com/1":
+                return PageMetadata(doc_type="HTTP_ERROR_404", failed=True)
+            return PageMetadata(author="Autor", doc_type="HTML")
+
+        with patch('softscrape.pipeline._extract_page', side_effect=flaky_extract), \
+                patch('softscrape.runner.time.sleep') as mock_sleep:
+            paths = run_batch(["alpha"], ["google"])
+
+        df = pd.read_csv(paths[0])
+        self.assertEqual(list(df["doc_type"]), ["HTTP_ERROR_404", "HTML"])
+        self.assertEqual(attempts, {"http://a.com/1": 1, "http://shared.com/x": 2})
+        mock_sleep.assert_called_once()
+
+    def test_plan_pagination_uses_largest_num(self):
+        with patch('softscrape.runner.settings.MAXIMIZE_PAGE_SIZE', True):
+            self.assertEqual(plan_pagination("google", pages=10, results_per_page=10), (1, 100))
+            self.assertEqual(plan_pagination("google_scholar", pages=10, results_per_page=10), (5, 20))
+            self.assertEqual(plan_pagination("google_scholar", pages=1, results_per_page=10), (1, 10))
+            self.assertEqual(plan_pagination("google", pages=3, results_per_page=50), (2, 100))
+        with patch('softscrape.runner.settings.MAXIMIZE_PAGE_SIZE', False):
+            self.assertEqual(plan_pagination("google", pages=10, results_per_page=10), (10, 10))
+
+    def test_batch_rejects_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            run_batch(["alpha"], ["bing"])
+
+    def test_load_queries_skips_blank_lines_and_comments(self):
+        path = os.path.join(self.tmpdir.name, "queries.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# consultas\nalpha\n\n  beta  \n")
+        self.assertEqual(load_queries(path), ["alpha", "beta"])
+
+    def test_slug(self):
+        self.assertEqual(_slug('"Generative AI" AND productivity'), "generative-ai-and-productivity")
+        self.assertEqual(_slug("***"), "consulta")
@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.scheduler import TokenBucket, HostScheduler, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(clock.now, 0.5)
+
+    def test_pause(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, capacity=5, clock=clock, sleep=clock.sleep)
+        bucket.pause(3.0)
+        waited = bucket.acquire()
+        self.assertGreaterEqual(waited, 3.0)
+        self.assertGreaterEqual(clock.now, 3.0)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+class TestRetryAfter(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("30"), 30.0)
+
+    def test_http_date(self):
+        moment = datetime.now(timezone.utc) + timedelta(seconds=60)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(moment, usegmt=True)), 60, delta=2)
+
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+class TestHostScheduler(unittest.TestCase):
+
+    def test_limits_concurrency_per_host(self):
+        scheduler = HostScheduler(max_per_host=2, rate_per_host=1000, burst=1000)
+        active = {"dl.acm.org": 0, "arxiv.org": 0}
+        peak = {"dl.acm.org": 0, "arxiv.org": 0}
+        lock = threading.Lock()
+
+        def work(host):
+            with scheduler.slot(host):
+                with lock:
+                    active[host] += 1
+                    peak[host] = max(peak[host], active[host])
+                time.sleep(0.02)
+                with lock:
+                    active[host] -= 1
+
+        threads = [threading.Thread(target=work, args=(host,)) for host in ["dl.acm.org"] * 6 + ["arxiv.org"] * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak["dl.acm.org"], 2)
+        self.assertEqual(peak["arxiv.org"], 2)
+
+    def test_penalize_caps_retry_after(self):
+        scheduler = HostScheduler(max_per_host=1, rate_per_host=1000, burst=1, max_retry_after=0.05)
+        scheduler.penalize("researchgate.net", 3600)
+        started = time.monotonic()
+        with scheduler.slot("researchgate.net"):
+            pass
+        elapsed = time.monotonic() - started
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertLess(elapsed, 1.0)
+        # Outros hosts não são afetados
+        started = time.monotonic()
+        with scheduler.slot("arxiv.org"):
+            pass
+        self.assertLess(time.monotonic() - started, 0.04)
@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import tempfile
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.cache import CacheMissError, ResponseCache
+from softscrape.clients.serpapi_client import SerpApiClient, has_more_results
+from softscrape.retry import RetryBudget, RetryPolicy
+
+class TestSerpApiClient(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmpdir.name, "serpapi.sqlite3"), ttl_sec=60, max_entries=10)
+        self.session = MagicMock()
+        response = MagicMock()
+        response.json.return_value = {"organic_results": [{"title": "A", "link": "http://example.com"}]}
+        self.session.get.return_value = response
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_requires_api_key(self):
+        with self.assertRaises(ValueError):
+            SerpApiClient(api_key="", session=self.session)
+
+    def test_search_uses_session(self):
+        client = SerpApiClient(api_key="key", session=self.session)
+        data = client.search("query", start=10, engine="google_scholar")
+        self.assertEqual(data["organic_results"][0]["title"], "A")
+        _, kwargs = self.session.get.call_args
+        self.assertEqual(kwargs["params"]["engine"], "google_scholar")
+        self.assertEqual(kwargs["params"]["start"], 10)
+
+    def test_warm_cache_makes_no_api_calls(self):
+        client = SerpApiClient(api_key="key", session=self.session, cache=self.cache)
+        first = client.search("query", start=0)
+        self.assertFalse(client.last_from_cache)
+        second = client.search("query", start=0)
+        self.assertTrue(client.last_from_cache)
+        self.assertEqual(first, second)
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_offline_mode(self):
+        SerpApiClient(api_key="key", session=self.session, cache=self.cache).search("query", start=0)
+        offline = SerpApiClient(api_key="", session=self.session, cache=self.cache, offline=True)
+        self.assertEqual(offline.search("query", start=0)["organic_results"][0]["title"], "A")
+        with self.assertRaises(CacheMissError):
+            offline.search("query", start=10)
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_rate_limiter_only_for_api_calls(self):
+        limiter = MagicMock()
+        client = SerpApiClient(api_key="key", session=self.session, cache=self.cache, rate_limiter=limiter)
+        client.search("query", start=0)
+        client.search("query", start=0)
+        self.assertEqual(limiter.acquire.call_count, 1)
+
+    def test_retries_transient_api_errors(self):
+        failing = MagicMock()
+        failing.status_code = 503
+        failing.headers = {}
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError(response=failing)
+        ok = self.session.get.return_value
+        self.session.get.side_effect = [requests.exceptions.Timeout(), failing, ok]
+        limiter = MagicMock()
+        policy = RetryPolicy(max_attempts=3, budget=RetryBudget(5), sleep=lambda seconds: None)
+        client = SerpApiClient(api_key="key", session=self.session, rate_limiter=limiter, retry_policy=policy)
+        self.assertEqual(client.search("query", start=0)["organic_results"][0]["title"], "A")
+        self.assertEqual(self.session.get.call_count, 3)
+        # Cada tentativa real respeita o limite de taxa da API
+        self.assertEqual(limiter.acquire.call_count, 3)
+
+    def test_offline_requires_cache(self):
+        with self.assertRaises(ValueError):
+            SerpApiClient(api_key="", session=self.session, offline=True)
+
+class TestHasMoreResults(unittest.TestCase):
+
+    def test_stops_on_empty_page(self):
+        self.assertFalse(has_more_results({"organic_results": []}, start=0, num=10))
+        self.assertFalse(has_more_results({"error": "Google hasn't returned any results"}, start=0, num=10))
+
+    def test_follows_serpapi_pagination(self):
+        page = {"organic_results": [{"title": "A"}], "serpapi_pagination": {"current": 1, "next": "https://serpapi.com/..."}}
+        self.assertTrue(has_more_results(page, start=0, num=10))
+        page["serpapi_pagination"].pop("next")
+        self.assertFalse(has_more_results(page, start=0, num=10))
+
+    def test_stops_at_total_results(self):
+        page = {"organic_results": [{"title": "A"}], "search_information": {"total_results": 25}}
+        self.assertTrue(has_more_results(page, start=10, num=10))
+        self.assertFalse(has_more_results(page, start=20, num=10))
+
@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import softscrape.session as session_module
+from softscrape.session import build_session, get_session, close_session, default_headers
+from softscrape.config import settings
+
+class TestSession(unittest.TestCase):
+
+    def tearDown(self):
+        close_session()
+
+    def test_get_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_close_session_resets_shared_session(self):
+        first = get_session()
+        close_session()
+        self.assertIsNone(session_module._session)
+        self.assertIsNot(get_session(), first)
+
+    def test_default_headers_applied(self):
+        session = get_session()
+        self.assertEqual(session.headers["User-Agent"], settings.USER_AGENT)
+        self.assertEqual(default_headers(), {"User-Agent": settings.USER_AGENT})
+
+    def test_pool_sizing(self):
+        session = build_session(pool_connections=3, pool_maxsize=5)
+        adapter = session.get_adapter("https://serpapi.com/search")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertIs(adapter, session.get_adapter("http://arxiv.org/abs/1"))
+        session.close()
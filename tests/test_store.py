@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.journal import RunJournal
+from softscrape.models import SearchResult
+from softscrape.store import ResultStore, title_hash
+
+def _result(title, link, year="2023", doc_type="HTML", base="a.com"):
+    return SearchResult(title=title, author="Autor", abstract="Resumo", source="a.com", year=year,
+                        doc_type=doc_type, base=base, link=link)
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "results.sqlite3")
+        self.store = ResultStore(self.path, batch_size=3)
+        self.addCleanup(self.store.close)
+        self.store.record_run("r1", "llm productivity", "google", "google", "2024-01-01T10:00:00")
+
+    def _count_on_disk(self):
+        reader = sqlite3.connect(self.path)
+        try:
+            return reader.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        finally:
+            reader.close()
+
+    def test_wal_mode_and_indexes(self):
+        reader = sqlite3.connect(self.path)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indexes = {row[1] for row in reader.execute("PRAGMA index_list(results)")}
+        self.assertTrue({"idx_results_link_key", "idx_results_base", "idx_results_year", "idx_results_title_hash"} <= indexes)
+
+    def test_inserts_are_batched(self):
+        for position in range(2):
+            self.store.add("r1", 0, position, _result(f"T{position}", f"http://a.com/{position}"))
+        # Ainda na fila: nada gravado para os leitores
+        self.assertEqual(self._count_on_disk(), 0)
+
+        self.store.add("r1", 0, 2, _result("T2", "http://a.com/2"))
+        self.assertEqual(self._count_on_disk(), 3)
+
+        self.store.add("r1", 0, 3, _result("T3", "http://a.com/3"))
+        self.store.flush()
+        self.assertEqual(self._count_on_disk(), 4)
+
+    def test_same_position_is_replaced(self):
+        self.store.add("r1", 0, 0, _result("Paper", "http://a.com/x", doc_type="TIMEOUT"))
+        self.store.add("r1", 0, 0, _result("Paper", "http://a.com/x", doc_type="PDF"))
+        self.store.flush()
+
+        self.assertEqual([r.doc_type for r in self.store.iter_results()], ["PDF"])
+
+    def test_lookup_columns(self):
+        self.store.add("r1", 0, 0, _result("Generative AI: A Study!", "http://www.a.com/p?utm_source=x"))
+        self.store.flush()
+        reader = sqlite3.connect(self.path)
+        self.addCleanup(reader.close)
+        row = reader.execute("SELECT link_key, title_hash FROM results").fetchone()
+
+        self.assertEqual(row[0], "https://a.com/p")
+        self.assertEqual(row[1], title_hash("generative ai a study"))
+
+    def test_iter_results_filters_and_order(self):
+        self.store.record_run("r2", "other", "google_scholar", "google_scholar", "2024-01-02T10:00:00")
+        self.store.add("r2", 0, 0, _result("S0", "http://s.com/0"))
+        self.store.add("r1", 1, 0, _result("G10", "http://a.com/10"))
+        self.store.add("r1", 0, 1, _result("G01", "http://a.com/01"))
+        self.store.add("r1", 0, 0, _result("G00", "http://a.com/00"))
+
+        self.assertEqual([r.title for r in self.store.iter_results()], ["G00", "G01", "G10", "S0"])
+        self.assertEqual([r.title for r in self.store.iter_results(engine="google_scholar")], ["S0"])
+        self.assertEqual([r.title for r in self.store.iter_results(run_ids=["r1"], query="llm productivity")], ["G00", "G01", "G10"])
+        self.assertEqual(self.store.run_ids(engine="google"), ["r1"])
+
+    def test_iter_batches_matches_iter_results(self):
+        for position in range(5):
+            self.store.add("r1", 0, position, _result(f"T{position}", f"http://a.com/{position}", doc_type="PDF" if position % 2 else "HTML"))
+
+        with patch('softscrape.store.READ_CHUNK_SIZE', 2):
+            batches = list(self.store.iter_batches())
+            results = list(self.store.iter_results())
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([result for batch in batches for result in batch], results)
+
+    def test_record_journal(self):
+        journal = RunJournal.create("google", "google", "llm", pages=2, results_per_page=2,
+                                    directory=os.path.join(self.tmpdir.name, "runs"))
+        journal.append(0, 1, _result("B", "http://a.com/b"))
+        journal.append(0, 0, _result("A", "http://a.com/a"))
+        journal.append(1, 0, _result("C", "http://a.com/c"))
+        journal.close()
+
+        self.assertEqual(self.store.record_journal(journal), 3)
+        self.assertEqual(self.store.record_journal(journal), 3)
+
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual([r.title for r in self.store.iter_results(run_ids=[journal.run_id])], ["A", "B", "C"])
+
+    def test_latest_by_links(self):
+        self.store.add("r1", 0, 0, _result("Old", "http://a.com/p", doc_type="HTML"), fetched_at=100.0)
+        self.store.add("r1", 0, 1, _result("Newer", "https://www.a.com/p", doc_type="TIMEOUT"), fetched_at=200.0)
+        self.store.add("r1", 0, 2, _result("Other", "http://b.com/q"), fetched_at=150.0)
+        # Mesma chave de deduplicação que o resumo, mas outro endereço: não vale para ele
+        self.store.add("r1", 0, 3, _result("Abs", "https://arxiv.org/abs/2301.00001", doc_type="HTML"), fetched_at=100.0)
+        self.store.add("r1", 0, 4, _result("Pdf", "https://arxiv.org/pdf/2301.00001", doc_type="PDF"), fetched_at=300.0)
+
+        latest = self.store.latest_by_links(["http://a.com/p?utm_source=x", "http://b.com/q", "https://c.com/none", "",
+                                             "http://arxiv.org/abs/2301.00001"])
+
+        self.assertEqual(set(latest), {"https://a.com/p", "https://b.com/q", "https://arxiv.org/abs/2301.00001"})
+        self.assertEqual((latest["https://a.com/p"].result.title, latest["https://a.com/p"].fetched_at), ("Newer", 200.0))
+        self.assertEqual(latest["https://b.com/q"].result.doc_type, "HTML")
+        self.assertEqual(latest["https://arxiv.org/abs/2301.00001"].result.doc_type, "HTML")
+
+    def test_reads_from_path_with_uri_special_characters(self):
+        directory = os.path.join(self.tmpdir.name, "a#b?c%20d")
+        os.makedirs(directory)
+        store = ResultStore(os.path.join(directory, "x#y.sqlite3"))
+        self.addCleanup(store.close)
+        store.record_run("r1", "llm", "google", "google", "2024-01-01T10:00:00")
+        store.add("r1", 0, 0, _result("T", "http://a.com/t"))
+
+        self.assertEqual([r.title for r in store.iter_results()], ["T"])
+
+    def test_title_hash_normalization(self):
+        self.assertEqual(title_hash("Produtividade  em Equipes"), title_hash("produtividade em equipes."))
+        self.assertEqual(title_hash("Ação"), title_hash("acao"))
+        self.assertEqual(title_hash(""), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from softscrape.urls import canonicalize_url, extract_doi, dedupe_key
+
+class TestUrls(unittest.TestCase):
+
+    def test_canonicalize_scheme_host_and_port(self):
+        self.assertEqual(canonicalize_url("HTTP://WWW.Example.COM:80/Paper/"), "https://example.com/Paper")
+        self.assertEqual(canonicalize_url("https://example.com:8443/a"), "https://example.com:8443/a")
+        self.assertEqual(canonicalize_url("https://example.com"), "https://example.com/")
+
+    def test_canonicalize_strips_tracking_params_and_fragment(self):
+        url = "https://example.com/p?utm_source=x&b=2&gclid=abc&a=1&fbclid=z#section"
+        self.assertEqual(canonicalize_url(url), "https://example.com/p?a=1&b=2")
+
+    def test_canonicalize_keeps_generic_params(self):
+        # Nomes genéricos podem identificar o documento: URLs que só diferem neles não se unem
+        for name in ("source", "ref", "sid", "share", "via", "campaign"):
+            first = canonicalize_url(f"https://example.com/view?{name}=1")
+            self.assertEqual(first, f"https://example.com/view?{name}=1")
+            self.assertNotEqual(first, canonicalize_url(f"https://example.com/view?{name}=2"))
+
+    def test_canonicalize_variants_collapse(self):
+        variants = [
+            "http://example.com/article?id=7",
+            "https://www.example.com/article/?id=7&utm_campaign=mail",
+            "https://example.com//article?id=7#top",
+        ]
+        self.assertEqual(len({canonicalize_url(v) for v in variants}), 1)
+
+    def test_canonicalize_keeps_invalid_or_non_http(self):
+        self.assertEqual(canonicalize_url(""), "")
+        self.assertEqual(canonicalize_url("mailto:a@b.com"), "mailto:a@b.com")
+        self.assertEqual(canonicalize_url("not a url"), "not a url")
+
+    def test_extract_doi(self):
+        self.assertEqual(extract_doi("https://doi.org/10.1145/3597503.3639187"), "10.1145/3597503.3639187")
+        self.assertEqual(extract_doi("https://dl.acm.org/doi/pdf/10.1145/3597503.3639187"), "10.1145/3597503.3639187")
+        self.assertEqual(extract_doi("https://www.frontiersin.org/articles/10.3389/FPSYG.2023.1/full"), "10.3389/fpsyg.2023.1")
+        self.assertEqual(extract_doi("https://example.com/paper.pdf"), "")
+
+    def test_dedupe_key_prefers_doi_then_arxiv(self):
+        self.assertEqual(
+            dedupe_key("https://onlinelibrary.wiley.com/doi/abs/10.1002/smr.2345"),
+            dedupe_key("https://doi.org/10.1002/SMR.2345")
+        )
+        self.assertEqual(dedupe_key("https://arxiv.org/pdf/2301.01234v2"), dedupe_key("http://arxiv.org/abs/2301.01234"))
+        self.assertEqual(dedupe_key("http://example.com/a?utm_medium=x"), "https://example.com/a")